@@ -8,6 +8,10 @@ setup(
         "click>=8.0.0",
         "rich>=13.0.0",
     ],
+    extras_require={
+        "columnar": ["numpy>=1.17"],
+        "parquet": ["pyarrow>=6.0"],
+    },
     entry_points={
         "console_scripts": [
             "timetrack=time_cli.main:cli",
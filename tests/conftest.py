@@ -0,0 +1,60 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from time_cli.data.database import Database
+from time_cli.data.repositories.time_entries import TimeEntryRepository
+
+def make_database(path) -> Database:
+    """Open (and create) a database file outside the user's app directory."""
+    db = Database(path)
+    db.init_db()
+    return db
+
+def insert_entries(time_repo: TimeEntryRepository, rows):
+    """Insert completed (project, sub_project, tags, start, minutes) entries."""
+    with time_repo.db.transaction() as conn:
+        first_id = time_repo.next_id(conn)
+        next_id = time_repo.insert_completed_batch(conn, first_id, [
+            (project, sub_project, tags, start, start + timedelta(minutes=minutes), minutes * 60, '/work', 0)
+            for project, sub_project, tags, start, minutes in rows
+        ])
+        time_repo.rollups.add_entry_range(first_id, next_id - 1)
+
+def create_legacy_database(path, rows=()):
+    """Create a database as timetrack wrote it before versioned migrations.
+
+    rows are completed (project, sub_project, tags, start, minutes) entries,
+    stored the old way: ISO timestamps and tags as a JSON list.
+    """
+    conn = sqlite3.connect(str(path))
+    conn.execute('''
+        CREATE TABLE time_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, project TEXT NOT NULL, sub_project TEXT,
+            tags TEXT, start_time TIMESTAMP NOT NULL, end_time TIMESTAMP, duration INTEGER,
+            directory TEXT NOT NULL, status TEXT DEFAULT 'active', paused_duration INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.executemany('''
+        INSERT INTO time_entries (project, sub_project, tags, start_time, end_time, duration, directory, status)
+        VALUES (?, ?, ?, ?, ?, ?, '/work', 'completed')
+    ''', [
+        (project, sub_project, json.dumps(tags) if tags else None, start.isoformat(),
+         (start + timedelta(minutes=minutes)).isoformat(), minutes * 60)
+        for project, sub_project, tags, start, minutes in rows
+    ])
+    conn.commit()
+    conn.close()
+
+@pytest.fixture
+def time_repo(tmp_path):
+    db = make_database(tmp_path / 'timetrack.db')
+    yield TimeEntryRepository(db)
+    db.close()
+
+@pytest.fixture
+def start():
+    return datetime(2026, 3, 2, 9, 0)
@@ -0,0 +1,40 @@
+from datetime import timedelta
+from unittest import mock
+
+from time_cli.core.aggregation import SummaryEngine
+
+from conftest import insert_entries
+
+# A where filter keeps the query off the rollup, on the raw entries
+RAW_FILTERS = {'where': 'duration>1s'}
+
+def _two_years(time_repo, start):
+    insert_entries(time_repo, [
+        ('api' if day % 3 else 'web', 'auth' if day % 2 else None, [], start + timedelta(days=day), 30 + day % 7)
+        for day in range(0, 730, 5)
+    ])
+
+def test_single_core_never_partitions(time_repo, start, monkeypatch):
+    _two_years(time_repo, start)
+    monkeypatch.setenv('TIMETRACK_REPORT_WORKERS', '4')
+    with mock.patch('os.cpu_count', return_value=1), \
+            mock.patch.object(SummaryEngine, '_aggregate_partition') as partition:
+        SummaryEngine(time_repo).summarize(RAW_FILTERS)
+    partition.assert_not_called()
+
+def test_short_range_is_not_partitioned(time_repo, start):
+    _two_years(time_repo, start)
+    filters = dict(RAW_FILTERS, from_date='2026-03-01', to_date='2026-08-31')
+    assert SummaryEngine(time_repo)._partition(filters, 4) == [filters]
+
+def test_partitioned_summary_matches_serial(time_repo, start, monkeypatch):
+    _two_years(time_repo, start)
+    serial = SummaryEngine(time_repo).summarize(RAW_FILTERS)
+
+    monkeypatch.setenv('TIMETRACK_REPORT_WORKERS', '4')
+    engine = SummaryEngine(time_repo)
+    with mock.patch('os.cpu_count', return_value=4):
+        assert len(engine._partition(RAW_FILTERS, 4)) == 4
+        partitioned = engine.summarize(RAW_FILTERS)
+
+    assert partitioned == serial
@@ -0,0 +1,37 @@
+import sqlite3
+
+import pytest
+
+from time_cli.data.repositories.attached import AttachedDatabaseRepository
+from time_cli.data.repositories.time_entries import TimeEntryRepository
+
+from conftest import create_legacy_database, insert_entries, make_database
+
+def _aggregate(path):
+    return AttachedDatabaseRepository().aggregate_with_filters([(0, path)], {})
+
+def test_legacy_unversioned_database_asks_for_migration(tmp_path):
+    path = tmp_path / 'legacy.db'
+    create_legacy_database(path)
+
+    with pytest.raises(ValueError, match='legacy unversioned timetrack schema'):
+        _aggregate(path)
+
+def test_unrelated_database_is_rejected(tmp_path):
+    path = tmp_path / 'other.db'
+    conn = sqlite3.connect(str(path))
+    conn.execute('CREATE TABLE notes (body TEXT)')
+    conn.close()
+
+    with pytest.raises(ValueError, match='is not a timetrack database'):
+        _aggregate(path)
+
+def test_legacy_database_attaches_once_migrated(tmp_path, start):
+    path = tmp_path / 'legacy.db'
+    create_legacy_database(path)
+    db = make_database(path)
+    insert_entries(TimeEntryRepository(db), [('api', None, [], start, 30)])
+    db.close()
+
+    rows = _aggregate(path)
+    assert [(project, duration) for _, _, project, _, _, duration in rows] == [('api', 1800)]
@@ -0,0 +1,28 @@
+import sqlite3
+import time
+
+from time_cli.data.repositories.time_entries import TimeEntryRepository
+
+from conftest import insert_entries, make_database
+
+def test_checkpoint_does_not_wait_for_readers(tmp_path, start, monkeypatch):
+    monkeypatch.setenv('TIMETRACK_DB_PROFILE', 'fast')  # TRUNCATE checkpoints
+    path = tmp_path / 'timetrack.db'
+    db = make_database(path)
+    time_repo = TimeEntryRepository(db)
+    insert_entries(time_repo, [('api', None, [], start, 30)])
+
+    # Another process reading a snapshot pins the WAL
+    reader = sqlite3.connect(str(path), isolation_level=None)
+    reader.execute('BEGIN')
+    reader.execute('SELECT COUNT(*) FROM time_entries').fetchone()
+    insert_entries(time_repo, [('api', None, [], start, 45)])
+
+    began = time.monotonic()
+    busy, _, _ = db.checkpoint()
+    assert busy == 1
+    assert time.monotonic() - began < 1
+
+    reader.close()
+    assert db.checkpoint()[0] == 0
+    db.close()
@@ -0,0 +1,54 @@
+import pytest
+
+from time_cli.core.exporter import EntryExporter
+from time_cli.core.importer import EntryImporter
+from time_cli.data.repositories.time_entries import TimeEntryRepository
+
+from conftest import insert_entries, make_database
+
+TAGS = ['a"b,c', 'plain']
+
+@pytest.mark.parametrize('name, file_format, compress', [
+    ('entries.csv', 'csv', False),
+    ('entries.csv.gz', 'csv', True),
+    ('entries.ndjson.gz', 'ndjson', True),
+])
+def test_export_round_trips_through_import(time_repo, start, tmp_path, name, file_format, compress):
+    insert_entries(time_repo, [('api', 'db', TAGS, start, 30), ('web', None, [], start, 45)])
+    path = tmp_path / name
+    with open(path, 'wb') as output:
+        assert EntryExporter(time_repo).export(None, file_format, output, compress) == 2
+
+    assert EntryImporter.detect_format(path) == file_format
+    target_db = make_database(tmp_path / 'target.db')
+    target = TimeEntryRepository(target_db)
+    result = EntryImporter(target_db, target).import_file(path)
+    assert result.imported == 2
+
+    imported = sorted((row.project, row.sub_project, row.tags, row.duration) for row in target.iter_with_filters())
+    assert imported == [('api', 'db', TAGS, 1800), ('web', None, [], 2700)]
+    target_db.close()
+
+def test_comma_separated_tags_still_import(tmp_path):
+    path = tmp_path / 'hand.csv'
+    path.write_text('start,end,project,tags\n2026-03-02 09:00,2026-03-02 10:00,api,"x, y"\n')
+    db = make_database(tmp_path / 'target.db')
+    repo = TimeEntryRepository(db)
+    EntryImporter(db, repo).import_file(path)
+    assert [row.tags for row in repo.iter_with_filters()] == [['x', 'y']]
+    db.close()
+
+@pytest.mark.parametrize('cell, tags', [
+    ('[wip]', ['[wip]']),
+    ('"[a], b"', ['[a]', 'b']),
+    ('"[1, 2]"', ['[1', '2]']),
+    ('"[""x, y"", ""z""]"', ['x, y', 'z']),
+])
+def test_bracketed_tags_that_are_not_a_json_list_split_on_commas(tmp_path, cell, tags):
+    path = tmp_path / 'hand.csv'
+    path.write_text(f'start,end,project,tags\n2026-03-02 09:00,2026-03-02 10:00,api,{cell}\n')
+    db = make_database(tmp_path / 'target.db')
+    repo = TimeEntryRepository(db)
+    assert EntryImporter(db, repo).import_file(path).imported == 1
+    assert [row.tags for row in repo.iter_with_filters()] == [tags]
+    db.close()
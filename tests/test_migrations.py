@@ -0,0 +1,42 @@
+import sqlite3
+
+import pytest
+
+from time_cli.data.repositories.time_entries import TimeEntryRepository
+
+from conftest import create_legacy_database, insert_entries, make_database
+
+def test_baseline_duplicate_tags_are_stored_once(tmp_path, start):
+    path = tmp_path / 'timetrack.db'
+    create_legacy_database(path, [('foo', None, ['in-work', 'in-work', 'review'], start, 1)])
+    time_repo = TimeEntryRepository(make_database(path))
+
+    assert time_repo.get_by_id(1).tags == ['in-work', 'review']
+    assert sorted(time_repo.group_with_filters({}, ['tag'])) == [('in-work', 1, 60), ('review', 1, 60)]
+    assert time_repo.compare_with_filters(
+        {}, ('2026-03-02', '2026-03-02'), ('2026-03-01', '2026-03-01')
+    ) == [(0, 1, 'in-work', 1, 60, 1, 60), (0, 1, 'review', 1, 60, 0, 0)]
+    time_repo.db.close()
+
+def test_duplicates_from_earlier_migrations_are_removed(tmp_path, start):
+    path = tmp_path / 'timetrack.db'
+    db = make_database(path)
+    insert_entries(TimeEntryRepository(db), [('foo', None, ['in-work'], start, 1)])
+    db.close()
+
+    # A version 9 database as the old backfill left it
+    conn = sqlite3.connect(str(path))
+    conn.execute('DROP INDEX idx_entry_tags_tag')
+    conn.execute('CREATE INDEX idx_entry_tags_tag ON entry_tags (tag, entry_id)')
+    conn.execute("INSERT INTO entry_tags (entry_id, position, tag) VALUES (1, 1, 'in-work')")
+    conn.execute('PRAGMA user_version = 9')
+    conn.commit()
+    conn.close()
+
+    time_repo = TimeEntryRepository(make_database(path))
+    assert time_repo.get_by_id(1).tags == ['in-work']
+    assert time_repo.group_with_filters({}, ['tag']) == [('in-work', 1, 60)]
+
+    with time_repo.db.get_connection() as conn, pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO entry_tags (entry_id, position, tag) VALUES (1, 5, 'in-work')")
+    time_repo.db.close()
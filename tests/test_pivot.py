@@ -0,0 +1,61 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from time_cli.core.pivot import PivotEngine
+
+from conftest import insert_entries
+
+# Days around year ends, where ISO weeks and calendar years disagree
+BOUNDARY_DAYS = [date(year, 12, 28) + timedelta(days=offset)
+                 for year in (2020, 2024, 2025, 2026) for offset in range(8)]
+
+def _labels(table):
+    return {labels: (entries, duration) for labels, entries, duration in table.rows}
+
+def test_week_labels_follow_iso_8601(time_repo):
+    insert_entries(time_repo, [
+        ('api', None, [], datetime.combine(day, datetime.min.time()) + timedelta(hours=12), 10)
+        for day in BOUNDARY_DAYS
+    ])
+    table = PivotEngine(time_repo).pivot({}, ['day', 'week'])
+
+    expected = {
+        (day.isoformat(), '{}-W{:02d}'.format(*day.isocalendar()[:2])): (1, 600)
+        for day in BOUNDARY_DAYS
+    }
+    assert _labels(table) == expected
+
+def test_time_bucket_labels_and_order(time_repo, start):
+    insert_entries(time_repo, [
+        ('api', None, [], start + timedelta(days=6, hours=5), 10),  # Sunday 14:00
+        ('api', None, [], start, 20),                               # Monday 09:00
+        ('api', None, [], datetime(2026, 11, 3, 23, 30), 30),       # Tuesday 23:30
+    ])
+    engine = PivotEngine(time_repo)
+
+    assert engine.pivot({}, ['weekday']).values == [['Mon', 'Tue', 'Sun']]
+    assert engine.pivot({}, ['hour']).values == [['09:00', '14:00', '23:00']]
+    assert _labels(engine.pivot({}, ['quarter'])) == {('2026-Q1',): (2, 1800), ('2026-Q4',): (1, 1800)}
+    assert _labels(engine.pivot({}, ['month'])) == {('2026-03',): (2, 1800), ('2026-11',): (1, 1800)}
+
+def test_tag_pivot_counts_each_tag_and_untagged_entries(time_repo, start):
+    insert_entries(time_repo, [
+        ('api', None, ['x', 'y'], start, 30),
+        ('api', None, [], start, 15),
+        ('web', None, ['x'], start, 60),
+    ])
+    table = PivotEngine(time_repo).pivot({}, ['project', 'tag'])
+
+    assert _labels(table) == {
+        ('api', 'x'): (1, 1800), ('api', 'y'): (1, 1800), ('api', '(untagged)'): (1, 900),
+        ('web', 'x'): (1, 3600),
+    }
+    assert table.values == [['api', 'web'], ['x', 'y', '(untagged)']]
+
+def test_unknown_and_repeated_dimensions_are_rejected():
+    with pytest.raises(ValueError, match="Unknown group-by dimension 'color'"):
+        PivotEngine.parse_dimensions(['project,color'])
+    with pytest.raises(ValueError, match="given more than once"):
+        PivotEngine.parse_dimensions(['week', 'Week'])
+    assert PivotEngine.parse_dimensions(['sub-project, week', 'tag']) == ['sub_project', 'week', 'tag']
@@ -0,0 +1,94 @@
+import pytest
+
+from time_cli.core.filters import FilterService
+from time_cli.data.query_language import QueryError, compile_where
+
+from conftest import insert_entries
+
+@pytest.fixture
+def entries(time_repo, start):
+    insert_entries(time_repo, [
+        ('api', 'db', [], start, 30),
+        ('api', 'db', [], start, 30),
+        ('api', None, [], start, 30),
+        ('api', None, [], start, 30),
+        ('api', None, [], start, 30),
+        ('web', 'ui', [], start, 30),
+    ])
+    return time_repo
+
+def count(time_repo, where):
+    return sum(1 for _ in time_repo.iter_with_filters(FilterService.build_filters(where=where)))
+
+@pytest.mark.parametrize('where', ['sub_project!=db', 'not sub_project:db', 'sub_project not in (db)'])
+def test_negated_sub_project_keeps_entries_without_sub_project(entries, where):
+    assert count(entries, where) == 4
+
+@pytest.mark.parametrize('where', ['project!=web', 'not project:web', 'project not in (web)'])
+def test_negated_project(entries, where):
+    assert count(entries, where) == 5
+
+def test_negated_sub_project_wildcard(entries):
+    assert count(entries, 'not sub_project:d*') == 4
+
+def test_positive_sub_project_excludes_entries_without_sub_project(entries):
+    assert count(entries, 'sub_project:db') == 2
+    assert count(entries, 'sub_project in (db, ui)') == 3
+
+@pytest.fixture
+def tagged(time_repo, start):
+    insert_entries(time_repo, [
+        ('api', None, ['x'], start, 30),
+        ('api', None, [], start, 30),
+        ('web', None, ['x'], start, 30),
+        ('web', None, [], start, 30),
+        ('ops', None, ['x'], start, 30),
+    ])
+    return time_repo
+
+@pytest.mark.parametrize('where, expected', [
+    # and binds tighter than or
+    ('project:api or project:web and tag:x', 3),
+    ('project:api OR project:web AND tag:x', 3),
+    ('(project:api or project:web) and tag:x', 2),
+    # not binds tighter than and
+    ('not project:api and tag:x', 2),
+    ('not (project:api and tag:x)', 4),
+    ('not not project:api', 2),
+    ('tag:x and not project in (api, web) or project:web and not tag:x', 2),
+])
+def test_operator_precedence(tagged, where, expected):
+    assert count(tagged, where) == expected
+
+@pytest.mark.parametrize('where, expected', [
+    ('weekday:mon', 5),
+    ('weekday in (sat, sun)', 0),
+    ('date:2026-03-02', 5),
+    ('date>2026-03-02', 0),
+    ('date<=2026-03-02', 5),
+    ('hour:9 and duration>=30m', 5),
+    ('duration>30m', 0),
+])
+def test_time_fields(tagged, where, expected):
+    assert count(tagged, where) == expected
+
+@pytest.mark.parametrize('where, message', [
+    ('', 'Empty --where expression'),
+    ('foo:1', "Unknown field 'foo'"),
+    ('project', "Expected an operator after 'project' at end of expression"),
+    ('project:', 'Expected a value at end of expression'),
+    ('project<a', "'project' only supports"),
+    ('duration>abc', "Invalid duration 'abc'"),
+    ('date=2026-13-01', "Invalid date '2026-13-01'"),
+    ('weekday:xyz', "Invalid weekday 'xyz'"),
+    ('hour:24', "Invalid hour '24'"),
+    ('(project:a', "Expected '\\)' at end of expression"),
+    ('project:a)', "Unexpected '\\)'"),
+    ('project not x', "Expected 'in' after 'project not'"),
+    ('project:a and', 'Expected a field name at end of expression'),
+    ('project in ()', "Expected a value but found '\\)'"),
+    ('tag:"x', 'Unexpected character at position 5'),
+])
+def test_invalid_expressions(where, message):
+    with pytest.raises(QueryError, match=message):
+        compile_where(where)
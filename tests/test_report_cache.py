@@ -0,0 +1,51 @@
+from time_cli.core.aggregation import SummaryEngine
+from time_cli.core.report_cache import ReportCache
+
+from conftest import insert_entries
+
+def test_cache_is_invalidated_by_every_write(time_repo, start, tmp_path):
+    insert_entries(time_repo, [('api', None, [], start, 30)])
+    cache = ReportCache(time_repo.db, cache_path=tmp_path / 'cache.json')
+    engine = SummaryEngine(time_repo, cache)
+
+    assert engine.summarize({}).total_duration == 1800
+    assert cache.get('summary', {}) is not None
+
+    # Same-size in-place edit: file metadata may not change, the token must
+    time_repo.update(1, {'duration': 3600})
+    assert cache.get('summary', {}) is None
+    assert engine.summarize({}).total_duration == 3600
+
+def test_rollup_rebuild_invalidates_cache(time_repo, start, tmp_path):
+    insert_entries(time_repo, [('api', None, [], start, 30)])
+    cache = ReportCache(time_repo.db, cache_path=tmp_path / 'cache.json')
+    SummaryEngine(time_repo, cache).summarize({})
+
+    time_repo.rollups.rebuild()
+    assert cache.get('summary', {}) is None
+
+def test_hits_do_not_rewrite_the_cache_file(time_repo, start, tmp_path):
+    insert_entries(time_repo, [('api', None, [], start, 30)])
+    cache_path = tmp_path / 'cache.json'
+    SummaryEngine(time_repo, ReportCache(time_repo.db, cache_path=cache_path)).summarize({})
+    written = cache_path.read_bytes()
+    mtime = cache_path.stat().st_mtime_ns
+
+    cache = ReportCache(time_repo.db, cache_path=cache_path)
+    assert cache.get('summary', {}) is not None
+    assert cache_path.stat().st_mtime_ns == mtime
+    assert cache_path.read_bytes() == written
+
+def test_recency_from_hits_is_kept_on_put(time_repo, start, tmp_path):
+    insert_entries(time_repo, [('api', None, [], start, 30)])
+    cache_path = tmp_path / 'cache.json'
+    engine = SummaryEngine(time_repo, ReportCache(time_repo.db, cache_path=cache_path, max_entries=2))
+    engine.summarize({'projects': ['a']})
+    engine.summarize({'projects': ['b']})
+
+    # Hitting 'a' makes 'b' the least recently used entry, evicted by 'c'
+    cache = ReportCache(time_repo.db, cache_path=cache_path, max_entries=2)
+    SummaryEngine(time_repo, cache).summarize({'projects': ['a']})
+    SummaryEngine(time_repo, cache).summarize({'projects': ['c']})
+    assert cache.get('summary', {'projects': ['a']}) is not None
+    assert cache.get('summary', {'projects': ['b']}) is None
@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+
+from time_cli.core.aggregation import SummaryEngine
+from time_cli.core.importer import EntryImporter
+from time_cli.core.sync import SyncService
+from time_cli.data.repositories.time_entries import TimeEntryRepository
+
+from conftest import insert_entries, make_database
+
+@pytest.fixture
+def entries(time_repo, start):
+    insert_entries(time_repo, [
+        ('api', 'db', ['x', 'y'], start, 30),
+        ('api', None, ['x'], start + timedelta(hours=2), 45),
+        ('web', None, [], start + timedelta(days=1), 60),
+    ])
+    assert time_repo.rollups.verify() == []
+    return time_repo
+
+def assert_consistent(time_repo):
+    """The rollup matches a fresh computation, and rollup-served reports match raw ones."""
+    assert time_repo.rollups.verify() == []
+    engine = SummaryEngine(time_repo)
+    for filters in ({}, {'tags': ['x']}, {'projects': ['api']}):
+        assert time_repo.rollups.can_serve(filters)
+        assert engine.summarize(filters) == SummaryEngine.build_summary(
+            time_repo.aggregate_with_filters(filters), time_repo.projects.get_name
+        ), filters
+
+@pytest.mark.parametrize('updates', [
+    {'duration': 5400},
+    {'project': 'web', 'sub_project': 'ui'},
+    {'tags': ['y', 'z']},
+    {'tags': []},
+])
+def test_update_keeps_rollup_consistent(entries, updates):
+    assert entries.update(1, updates)
+    assert_consistent(entries)
+
+def test_moving_an_entry_to_another_day(entries, start):
+    entries.update(1, {'start_time': start - timedelta(days=3), 'end_time': start - timedelta(days=3, minutes=-30)})
+    assert_consistent(entries)
+    assert '2026-02-27' in SummaryEngine(entries).summarize({}).daily_totals
+
+def test_delete_keeps_rollup_consistent(entries):
+    assert entries.delete(1)
+    assert entries.delete(3)
+    assert_consistent(entries)
+
+def test_import_keeps_rollup_consistent(entries, tmp_path):
+    path = tmp_path / 'import.csv'
+    path.write_text(
+        'start,end,project,tags\n'
+        '2026-03-02 14:00,2026-03-02 15:00,api,x\n'
+        '2026-03-05 09:00,2026-03-05 09:20,ops,\n'
+    )
+    assert EntryImporter(entries.db, entries).import_file(path).imported == 2
+    assert_consistent(entries)
+
+def test_timer_stop_adds_to_rollup(entries):
+    entries.create(project='api', sub_project=None, tags=['x'], directory='/work')
+    assert entries.stop_active() is not None
+    assert_consistent(entries)
+
+def test_sync_keeps_both_rollups_consistent(entries, tmp_path, start):
+    remote_db = make_database(tmp_path / 'remote.db')
+    remote = TimeEntryRepository(remote_db)
+    insert_entries(remote, [('ops', None, ['x'], start, 15)])
+    SyncService(entries.db, remote_db).sync()
+    # Synced edits and deletions go through the rollup on the receiving side
+    entries.delete(2)
+    web = next(remote.iter_with_filters({'projects': ['web']}))
+    remote.update(web.id, {'duration': 600})
+    SyncService(entries.db, remote_db).sync()
+
+    assert_consistent(entries)
+    assert_consistent(remote)
+    assert SummaryEngine(entries).summarize({}) == SummaryEngine(remote).summarize({})
+    remote_db.close()
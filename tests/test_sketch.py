@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from time_cli.core.sketch import DurationSketch
+
+QUANTILES = [0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 1]
+
+def _durations(count, seed=7):
+    """Log-uniform durations from 1s to about 12 days, plus some zeros."""
+    rng = random.Random(seed)
+    return [0] * (count // 50) + [int(10 ** rng.uniform(0, 6)) for _ in range(count)]
+
+def _exact(values, q):
+    """The sample the sketch estimates: the one at rank q * (n - 1), rounded down."""
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+@pytest.mark.parametrize('accuracy', [0.01, 0.05])
+def test_quantiles_are_within_relative_accuracy(accuracy):
+    values = _durations(20000)
+    sketch = DurationSketch(accuracy)
+    for value in values:
+        sketch.add(value)
+
+    for q in QUANTILES:
+        exact = _exact(values, q)
+        # Estimates are rounded to whole seconds
+        assert abs(sketch.quantile(q) - exact) <= accuracy * exact + 0.5, q
+
+def test_merged_partitions_equal_one_sketch():
+    values = _durations(5000)
+    whole = DurationSketch()
+    parts = [DurationSketch() for _ in range(3)]
+    for i, value in enumerate(values):
+        whole.add(value)
+        parts[i % 3].add(value)
+
+    merged = DurationSketch()
+    for part in parts:
+        merged.merge(part)
+
+    assert merged.quantiles(QUANTILES) == whole.quantiles(QUANTILES)
+    assert (merged.count, merged.total, merged.min, merged.max, merged.histogram) == \
+           (whole.count, whole.total, whole.min, whole.max, whole.histogram)
+
+def test_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        DurationSketch(0.01).merge(DurationSketch(0.02))
+
+def test_empty_and_extremes():
+    sketch = DurationSketch()
+    assert sketch.quantile(0.5) is None
+    for value in (7, 7200):
+        sketch.add(value)
+    assert (sketch.quantile(0), sketch.quantile(1)) == (7, 7200)
+    assert sketch.histogram == [1, 0, 0, 0, 0, 1, 0, 0]
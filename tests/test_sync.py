@@ -0,0 +1,107 @@
+import shutil
+import sqlite3
+
+import pytest
+
+from time_cli.core.sync import SyncError, SyncService
+from time_cli.data.repositories.time_entries import TimeEntryRepository
+
+from conftest import insert_entries, make_database
+
+@pytest.fixture
+def sides(tmp_path, start):
+    local_db = make_database(tmp_path / 'local.db')
+    remote_db = make_database(tmp_path / 'remote.db')
+    local, remote = TimeEntryRepository(local_db), TimeEntryRepository(remote_db)
+    insert_entries(local, [('zeta', None, ['x'], start, 30), ('beta', 'db', [], start, 60)])
+    SyncService(local_db, remote_db).sync()
+    yield local, remote
+    local_db.close()
+    remote_db.close()
+
+def sync(local, remote):
+    return SyncService(local.db, remote.db).sync()
+
+def rows(time_repo):
+    with sqlite3.connect(time_repo.db.db_path) as conn:
+        return sorted(conn.execute('''
+            SELECT e.uid, e.updated_at, p.name, e.directory, e.duration,
+                   (SELECT group_concat(tag) FROM entry_tags WHERE entry_id = e.id)
+            FROM time_entries e JOIN projects p ON p.id = e.project_id
+        '''))
+
+def entry_id(time_repo, project):
+    with sqlite3.connect(time_repo.db.db_path) as conn:
+        return conn.execute(
+            'SELECT e.id FROM time_entries e JOIN projects p ON p.id = e.project_id WHERE p.name = ?', (project,)
+        ).fetchone()[0]
+
+def set_updated_at(time_repo, entry, updated_at):
+    with time_repo.db.transaction() as conn:
+        conn.execute('UPDATE time_entries SET updated_at = ? WHERE id = ?', (updated_at, entry))
+
+def assert_converged(local, remote):
+    assert rows(local) == rows(remote)
+    result = sync(local, remote)
+    assert result.pulled.total == result.pushed.total == 0
+
+def test_edit_right_after_sync_reaches_peer(sides):
+    local, remote = sides
+    # A successor whose content sorts lower must still beat its predecessor
+    local.update(entry_id(local, 'zeta'), {'project': 'alpha'})
+    sync(local, remote)
+    assert_converged(local, remote)
+    assert sorted(row[2] for row in rows(remote)) == ['alpha', 'beta']
+
+def test_edits_in_same_millisecond_on_both_sides_converge(sides):
+    local, remote = sides
+    local_entry, remote_entry = entry_id(local, 'zeta'), entry_id(remote, 'zeta')
+    local.update(local_entry, {'directory': '/local'})
+    remote.update(remote_entry, {'directory': '/remote'})
+    set_updated_at(local, local_entry, 10 ** 13)
+    set_updated_at(remote, remote_entry, 10 ** 13)
+    sync(local, remote)
+    assert_converged(local, remote)
+
+def test_edit_after_peer_with_clock_ahead_wins(sides):
+    local, remote = sides
+    remote_entry = entry_id(remote, 'zeta')
+    remote.update(remote_entry, {'directory': '/remote'})
+    set_updated_at(remote, remote_entry, 10 ** 14)  # far in the future
+    sync(local, remote)
+    local.update(entry_id(local, 'zeta'), {'directory': '/local'})
+    sync(local, remote)
+    assert_converged(local, remote)
+    assert '/local' in [row[3] for row in rows(remote)]
+
+def test_delete_right_after_sync_reaches_peer(sides):
+    local, remote = sides
+    local.delete(entry_id(local, 'beta'))
+    sync(local, remote)
+    assert_converged(local, remote)
+    assert [row[2] for row in rows(remote)] == ['zeta']
+
+def test_copied_database_syncs_after_reset_id(tmp_path, start):
+    original_db = make_database(tmp_path / 'timetrack.db')
+    original = TimeEntryRepository(original_db)
+    insert_entries(original, [('api', None, ['x'], start, 30)])
+    original_db.close()
+    shutil.copy(tmp_path / 'timetrack.db', tmp_path / 'other.db')
+
+    original_db = make_database(tmp_path / 'timetrack.db')
+    copy_db = make_database(tmp_path / 'other.db')
+    original, copy = TimeEntryRepository(original_db), TimeEntryRepository(copy_db)
+    with pytest.raises(SyncError, match='--reset-id'):
+        sync(original, copy)
+
+    service = SyncService(original_db, copy_db)
+    service.reset_remote_id()
+    # The shared rows carry identical versions, so nothing needs applying
+    result = service.sync()
+    assert (result.pulled.total, result.pushed.total) == (0, 0)
+
+    insert_entries(copy, [('web', None, [], start, 15)])
+    assert sync(original, copy).pulled.entries == 1
+    assert rows(original) == rows(copy)
+    original_db.close()
+    copy_db.close()
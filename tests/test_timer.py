@@ -0,0 +1,21 @@
+from time_cli.core import timer
+from time_cli.core.timer import TimerService
+from time_cli.data.repositories.directory_mappings import DirectoryMappingRepository
+
+def test_project_detection_runs_outside_the_write_transaction(time_repo, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(timer, 'stop_alert_daemon', lambda entry_id: None)
+    seen = []
+
+    def detect(directory_repo):
+        with time_repo.db.get_connection() as conn:
+            seen.append(conn.in_transaction)
+        return 'api', 'git_repo'
+
+    monkeypatch.setattr(timer, 'detect_project_from_directory', detect)
+    directory_repo = DirectoryMappingRepository(time_repo.db)
+    entry_id = TimerService(time_repo, directory_repo).start_timer()
+
+    assert seen == [False]
+    assert time_repo.get_by_id(entry_id).project == 'api'
+    assert directory_repo.get_by_path(tmp_path).project_name == 'api'
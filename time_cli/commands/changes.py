@@ -0,0 +1,44 @@
+import os
+import sys
+import click
+from pathlib import Path
+from rich.console import Console
+from rich.markup import escape
+
+from ..data.database import Database
+from ..data.repositories.time_entries import TimeEntryRepository
+from ..core.changefeed import ChangeFeed
+from ..ui.formatters import Formatters
+
+@click.command()
+@click.option('--since', 'token', help='Token printed by the previous run (default: from the beginning)')
+@click.option('--watermark-file', type=click.Path(dir_okay=False, path_type=Path),
+              help='Read the token from this file and store the new one there after a successful run')
+def changes(token, watermark_file):
+    """Stream entries changed since a token as NDJSON, then print the new token."""
+    # Status messages and the token go to stderr so stdout carries only changes
+    console = Console(stderr=True)
+    
+    # Initialize services
+    db = Database()
+    time_repo = TimeEntryRepository(db)
+    feed = ChangeFeed(time_repo)
+    
+    try:
+        if token is None and watermark_file is not None and watermark_file.exists():
+            token = watermark_file.read_text()
+        since = ChangeFeed.parse_token(token)
+        
+        output = sys.stdout
+        count, new_token = feed.write_changes(since, output)
+        output.flush()
+        
+        if watermark_file is not None:
+            tmp_path = watermark_file.with_name(f"{watermark_file.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(f"{new_token}\n")
+            os.replace(tmp_path, watermark_file)
+        
+        console.print(f"{count} changes, next token: [bold]{new_token}[/bold]")
+        
+    except Exception as e:
+        console.print(Formatters.format_error(f"Failed to read changes: {escape(str(e))}"))
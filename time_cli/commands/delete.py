@@ -33,12 +33,7 @@ def delete(entry_id: int, force: bool):
             return
     
     # Delete the entry
-    with db.get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM time_entries WHERE id = ?", (entry_id,))
-        conn.commit()
-        
-        if cursor.rowcount > 0:
-            click.echo(f"Successfully deleted time entry {entry_id}.")
-        else:
-            click.echo(f"Error: Failed to delete time entry {entry_id}.")
\ No newline at end of file
+    if time_repo.delete(entry_id):
+        click.echo(f"Successfully deleted time entry {entry_id}.")
+    else:
+        click.echo(f"Error: Failed to delete time entry {entry_id}.")
\ No newline at end of file
@@ -0,0 +1,65 @@
+import sys
+import click
+from rich.console import Console
+from rich.markup import escape
+
+from ..data.database import Database
+from ..data.repositories.time_entries import TimeEntryRepository
+from ..core.filters import FilterService
+from ..core.exporter import EntryExporter, EXPORT_FORMATS
+from ..ui.formatters import Formatters
+
+@click.command()
+@click.option('--today', is_flag=True, help='Export today\'s entries')
+@click.option('--week', is_flag=True, help='Export this week\'s entries')
+@click.option('--month', is_flag=True, help='Export this month\'s entries')
+@click.option('--from', 'from_date', help='Start date (YYYY-MM-DD)')
+@click.option('--to', 'to_date', help='End date (YYYY-MM-DD)')
+@click.option('--project', multiple=True, help='Filter by project(s)')
+@click.option('--tag', multiple=True, help='Filter by tag/label(s)')
+@click.option('--label', multiple=True, help='Alias for --tag')
+@click.option('--where', 'where', help='Filter expression, as for report --where')
+@click.option('--format', 'file_format', type=click.Choice(EXPORT_FORMATS),
+              help='Output format (default: from the output file extension, otherwise csv)')
+@click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True),
+              help='Write to a file instead of stdout')
+@click.option('--gzip', 'compress', is_flag=True, help='Compress the output (implied by a .gz output file)')
+def export(today, week, month, from_date, to_date, project, tag, label, where, file_format, output, compress):
+    """Export completed entries as CSV, NDJSON or Parquet."""
+    # Status messages go to stderr so stdout carries only the data
+    console = Console(stderr=True)
+    
+    # Initialize services
+    db = Database()
+    time_repo = TimeEntryRepository(db)
+    exporter = EntryExporter(time_repo)
+    
+    try:
+        all_tags = list(tag) + list(label)
+        filters = FilterService.build_filters(
+            today=today, week=week, month=month,
+            from_date=from_date, to_date=to_date,
+            projects=list(project) if project else None,
+            tags=all_tags if all_tags else None,
+            where=where
+        )
+        
+        name = (output or '').lower()
+        if name.endswith('.gz'):
+            compress = True
+            name = name[:-3]
+        if not file_format:
+            file_format = next((fmt for fmt in EXPORT_FORMATS if name.endswith(f'.{fmt}')), 'csv')
+            if name.endswith('.jsonl'):
+                file_format = 'ndjson'
+        
+        if output:
+            with open(output, 'wb') as stream:
+                count = exporter.export(filters, file_format, stream, compress)
+            console.print(Formatters.format_success(f"Exported {count} entries to {output}"))
+        else:
+            exporter.export(filters, file_format, sys.stdout.buffer, compress)
+            sys.stdout.buffer.flush()
+        
+    except Exception as e:
+        console.print(Formatters.format_error(f"Export failed: {escape(str(e))}"))
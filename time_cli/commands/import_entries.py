@@ -0,0 +1,49 @@
+import click
+from pathlib import Path
+from rich.console import Console
+from rich.progress import Progress, BarColumn, DownloadColumn, TimeElapsedColumn
+
+from ..data.database import Database
+from ..data.repositories.time_entries import TimeEntryRepository
+from ..core.importer import EntryImporter, IMPORT_FORMATS
+from ..ui.formatters import Formatters
+
+@click.command('import')
+@click.argument('file', type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option('--format', 'file_format', type=click.Choice(IMPORT_FORMATS),
+              help='File format (default: from the extension, .csv or NDJSON; .gz files are decompressed)')
+@click.option('--skip-invalid', is_flag=True, help='Skip invalid records instead of aborting the import')
+def import_entries(file, file_format, skip_invalid):
+    """Import completed entries from a CSV or NDJSON file."""
+    console = Console()
+    
+    # Initialize services
+    db = Database()
+    time_repo = TimeEntryRepository(db)
+    importer = EntryImporter(db, time_repo)
+    
+    try:
+        with Progress(
+            "[progress.description]{task.description}", BarColumn(), DownloadColumn(), TimeElapsedColumn(),
+            console=console, transient=True
+        ) as progress:
+            task = progress.add_task(f"Importing {file.name}", total=file.stat().st_size)
+            result = importer.import_file(
+                file, file_format, skip_invalid,
+                progress=lambda position: progress.update(task, completed=position)
+            )
+        
+        if result.skipped:
+            console.print(Formatters.format_error(f"Skipped {len(result.skipped)} invalid records"))
+            for line_number, reason in result.skipped[:20]:
+                console.print(f"  line {line_number}: {reason}", style="dim")
+        
+        if not result.imported:
+            console.print("No entries imported.")
+            return
+        console.print(Formatters.format_success(
+            f"Imported {result.imported} entries (IDs {result.first_id}-{result.last_id})"
+        ))
+        
+    except Exception as e:
+        console.print(Formatters.format_error(f"Import failed, no entries were imported: {e}"))
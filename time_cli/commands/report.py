@@ -3,6 +3,14 @@ import click
 from ..data.database import Database
 from ..data.repositories.time_entries import TimeEntryRepository
 from ..core.filters import FilterService
+from ..core.aggregation import SummaryEngine
+from ..core.report_cache import ReportCache
+from ..core.pivot import PivotEngine
+from ..core.directory_tree import DirectoryTreeBuilder
+from ..core.duration import parse_duration_input
+from ..core.session_stats import SessionStatsBuilder
+from ..core.comparison import ComparisonEngine, COMPARE_MODES
+from ..core.multi_database import MultiDatabaseSummaryEngine, expand_database_paths
 from ..ui.reports import ReportRenderer
 
 @click.command()
@@ -14,8 +22,24 @@ from ..ui.reports import ReportRenderer
 @click.option('--project', multiple=True, help='Filter by project(s)')
 @click.option('--tag', multiple=True, help='Filter by tag/label(s)')
 @click.option('--label', multiple=True, help='Alias for --tag')
+@click.option('--where', 'where', help='Filter expression, e.g. "project:api and (tag:review or tag:oncall) and duration>45m"')
 @click.option('--summary', is_flag=True, help='Show only summary without detailed entries')
-def report(today, week, month, from_date, to_date, project, tag, label, summary):
+@click.option('--no-cache', is_flag=True, help='Recompute the summary instead of using cached results')
+@click.option('--group-by', multiple=True,
+              help='Group totals by dimension(s): project, sub_project, tag, directory, '
+                   'weekday, hour, day, week, month, quarter, year (comma-separated or repeated)')
+@click.option('--by-directory', is_flag=True, help='Show time per directory as a tree of subtree totals')
+@click.option('--depth', type=click.IntRange(min=1), help='Limit the directory tree depth')
+@click.option('--min-duration', help='Hide directories with less total time (e.g. 30m, 2h)')
+@click.option('--heatmap', is_flag=True, help='Show daily time as a calendar heatmap')
+@click.option('--stats', is_flag=True, help='Show session-length distributions per project and tag')
+@click.option('--compare', type=click.Choice(COMPARE_MODES),
+              help='Compare the date range with the previous period or the same dates last year')
+@click.option('--db', 'databases', multiple=True,
+              help='Report across these database files instead of your own, with a per-database '
+                   'breakdown (repeatable; globs like "team/*.db" allowed)')
+def report(today, week, month, from_date, to_date, project, tag, label, where, summary, no_cache, group_by,
+           by_directory, depth, min_duration, heatmap, stats, compare, databases):
     """Generate time reports with flexible filtering."""
     # Initialize services
     db = Database()
@@ -29,20 +53,76 @@ def report(today, week, month, from_date, to_date, project, tag, label, summary)
             today=today, week=week, month=month,
             from_date=from_date, to_date=to_date,
             projects=list(project) if project else None,
-            tags=all_tags if all_tags else None
+            tags=all_tags if all_tags else None,
+            where=where
         )
         
-        # Get entries
-        entries = time_repo.find_with_filters(filters)
+        if databases:
+            if by_directory or compare or stats or group_by:
+                raise ValueError("--db supports summary and --heatmap reports only")
+            engine = MultiDatabaseSummaryEngine(expand_database_paths(databases))
+            report_summary = engine.summarize(filters)
+            if not report_summary.total_entries:
+                renderer.render_no_entries_message()
+                return
+            if heatmap:
+                renderer.render_heatmap(report_summary, filters.get('from_date'), filters.get('to_date'))
+            else:
+                renderer.render_report([], report_summary, show_details=False)
+            return
+        
+        if by_directory:
+            builder = DirectoryTreeBuilder(time_repo)
+            root = builder.build(filters)
+            if not root.entries:
+                renderer.render_no_entries_message()
+                return
+            threshold = parse_duration_input(min_duration) if min_duration else 0
+            renderer.render_directory_tree(DirectoryTreeBuilder.prune(root, depth, threshold))
+            return
+        
+        if compare:
+            period_type = 'today' if today else 'week' if week else 'month' if month else None
+            comparison = ComparisonEngine(time_repo).compare(filters, compare, period_type)
+            if not comparison.totals['current_entries'] and not comparison.totals['previous_entries']:
+                renderer.render_no_entries_message()
+                return
+            renderer.render_comparison(comparison)
+            return
+        
+        if stats:
+            session_stats = SessionStatsBuilder.from_entries(time_repo.iter_with_filters(filters))
+            if not session_stats.overall.count:
+                renderer.render_no_entries_message()
+                return
+            renderer.render_session_stats(session_stats)
+            return
+        
+        if group_by:
+            engine = PivotEngine(time_repo)
+            pivot = engine.pivot(filters, PivotEngine.parse_dimensions(group_by))
+            if not pivot.rows:
+                renderer.render_no_entries_message()
+                return
+            renderer.render_pivot(pivot)
+            return
         
-        if not entries:
-            renderer.render_no_entries_message()
+        if summary or heatmap:
+            # Totals come from the cache or grouped SQL, no entries are loaded
+            cache = None if no_cache else ReportCache(db)
+            report_summary = SummaryEngine(time_repo, cache).summarize(filters)
+            if not report_summary.total_entries:
+                renderer.render_no_entries_message()
+                return
+            if heatmap:
+                renderer.render_heatmap(report_summary, filters.get('from_date'), filters.get('to_date'))
+            else:
+                renderer.render_report([], report_summary, show_details=False)
             return
         
-        # Generate summary and render report
-        report_summary = FilterService.generate_summary(entries)
-        show_details = not summary
-        renderer.render_report(entries, report_summary, show_details)
+        # Stream entries through summary and rendering in a single pass
+        entries = time_repo.iter_with_filters(filters)
+        renderer.render_report_stream(entries)
         
     except Exception as e:
         from ..ui.formatters import Formatters
@@ -0,0 +1,39 @@
+import click
+from rich.console import Console
+
+from ..data.database import Database
+from ..data.repositories.rollups import RollupRepository
+from ..ui.formatters import Formatters
+
+@click.command()
+@click.option('--rebuild', is_flag=True, help='Recompute the rollup from all entries')
+def rollup(rebuild):
+    """Verify (or rebuild) the daily rollup used by reports."""
+    console = Console()
+    
+    # Initialize services
+    db = Database()
+    rollup_repo = RollupRepository(db)
+    
+    try:
+        if rebuild:
+            rows = rollup_repo.rebuild()
+            console.print(Formatters.format_success(f"Rebuilt daily rollup ({rows} rows)"))
+            return
+        
+        differences = rollup_repo.verify()
+        if not differences:
+            console.print(Formatters.format_success("Daily rollup is consistent with time entries"))
+            return
+        
+        console.print(Formatters.format_error(f"Daily rollup has {len(differences)} mismatched rows"))
+        for source, day, project_id, sub_project_id, tag, entries, duration in differences[:20]:
+            console.print(
+                f"  {source:<8} {day} project={project_id} sub_project={sub_project_id} "
+                f"tag={tag or '*'} entries={entries} duration={duration}",
+                style="dim"
+            )
+        console.print("Run [bold]timetrack rollup --rebuild[/bold] to repair it.")
+            
+    except Exception as e:
+        console.print(Formatters.format_error(f"Failed to check rollup: {e}"))
@@ -0,0 +1,47 @@
+import click
+from pathlib import Path
+from rich.console import Console
+from rich.markup import escape
+
+from ..config.paths import Paths
+from ..data.database import Database
+from ..core.sync import SyncService
+from ..ui.formatters import Formatters
+
+@click.command()
+@click.argument('other_db', type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option('--reset-id', is_flag=True,
+              help='Give OTHER_DB a new identity first; needed once when it is a copy of this database')
+def sync(other_db, reset_id):
+    """Merge entries and directory mappings with another timetrack database, both ways.
+
+    A copied database file shares its original's identity and cannot sync
+    with it until one of them is re-keyed: run the first sync with
+    --reset-id to re-key OTHER_DB.
+    """
+    console = Console()
+    
+    try:
+        if other_db.resolve() == Paths.get_db_path().resolve():
+            raise ValueError("Cannot sync a database with itself")
+        
+        # Initialize services
+        local_db = Database()
+        remote_db = Database(other_db)
+        service = SyncService(local_db, remote_db)
+        if reset_id:
+            service.reset_remote_id()
+        
+        result = service.sync()
+        
+        if result.pulled.total == 0 and result.pushed.total == 0:
+            console.print(Formatters.format_success("Already in sync"))
+            return
+        
+        for label, counts in (("Received", result.pulled), ("Sent", result.pushed)):
+            console.print(Formatters.format_success(
+                f"{label} {counts.entries} entries, {counts.deletions} deletions, {counts.mappings} directory mappings"
+            ))
+        
+    except Exception as e:
+        console.print(Formatters.format_error(f"Failed to sync: {escape(str(e))}"))
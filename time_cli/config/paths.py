@@ -15,6 +15,11 @@ class Paths:
         """Get the database file path."""
         return Paths.get_app_dir() / 'timetrack.db'
     
+    @staticmethod
+    def get_report_cache_path() -> Path:
+        """Get the report result cache file path."""
+        return Paths.get_app_dir() / 'report_cache.json'
+    
     @staticmethod
     def get_config_file_path() -> Path:
         """Get the path for .timetrack config file in current directory."""
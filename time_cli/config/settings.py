@@ -1,5 +1,7 @@
 """Application settings and defaults."""
 
+import os
+
 class Settings:
     """Application-wide settings and defaults."""
 
@@ -9,6 +11,58 @@ class Settings:
 
     # Database settings
     DB_TIMEOUT = 30.0  # seconds
+    DB_STATEMENT_CACHE_SIZE = 256  # prepared statements kept per connection
+
+    # Storage profiles: pragmas applied to every connection. The active
+    # profile is DB_STORAGE_PROFILE unless overridden by DB_STORAGE_PROFILE_ENV.
+    # checkpoint_mode is the WAL checkpoint run after a timer stops, skipped
+    # rather than waited for while the database is busy (None to leave
+    # checkpointing to SQLite's wal_autocheckpoint).
+    DB_STORAGE_PROFILE = "balanced"
+    DB_STORAGE_PROFILE_ENV = "TIMETRACK_DB_PROFILE"
+    DB_STORAGE_PROFILES = {
+        # Rollback journal with full fsyncs, the historical behaviour
+        "compat": {
+            "journal_mode": "DELETE",
+            "synchronous": "FULL",
+            "mmap_size": 0,
+            "cache_size": -2000,
+            "temp_store": "DEFAULT",
+            "wal_autocheckpoint": 1000,
+            "checkpoint_mode": None,
+        },
+        # WAL, but still fsync on every commit
+        "safe": {
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "mmap_size": 0,
+            "cache_size": -8000,
+            "temp_store": "MEMORY",
+            "wal_autocheckpoint": 1000,
+            "checkpoint_mode": "PASSIVE",
+        },
+        # WAL with fsync only at checkpoints; durable against application
+        # crashes, may lose the last commits on power loss
+        "balanced": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 64 * 1024 * 1024,
+            "cache_size": -16000,
+            "temp_store": "MEMORY",
+            "wal_autocheckpoint": 1000,
+            "checkpoint_mode": "PASSIVE",
+        },
+        # Large caches and no fsyncs, for bulk imports and throwaway copies
+        "fast": {
+            "journal_mode": "WAL",
+            "synchronous": "OFF",
+            "mmap_size": 256 * 1024 * 1024,
+            "cache_size": -64000,
+            "temp_store": "MEMORY",
+            "wal_autocheckpoint": 4000,
+            "checkpoint_mode": "TRUNCATE",
+        },
+    }
 
     # UI settings
     MAX_PROJECT_NAME_LENGTH = 50
@@ -16,6 +70,18 @@ class Settings:
 
     # Report settings
     MAX_DAILY_ENTRIES_FOR_BREAKDOWN = 31
+    REPORT_FETCH_BATCH_SIZE = 500  # rows fetched and rendered per batch when streaming
+    REPORT_CACHE_MAX_ENTRIES = 64  # cached report results kept (least recently used evicted)
+    COLUMNAR_ENV = "TIMETRACK_COLUMNAR"  # set to 1 to group raw entries with NumPy (if installed) instead of SQL
+    COLUMNAR_BATCH_SIZE = 65536  # rows per column batch fed to the NumPy engine
+    REPORT_WORKERS = min(8, os.cpu_count() or 1)  # threads aggregating month partitions in parallel
+    REPORT_WORKERS_ENV = "TIMETRACK_REPORT_WORKERS"
+    REPORT_PARTITION_MIN_MONTHS = 12  # only split raw aggregations spanning at least this many months
+    REPORT_ATTACH_LIMIT = 10  # databases attached per connection for report --db (SQLite's default maximum)
+
+    # Import settings
+    IMPORT_BATCH_SIZE = 5000  # rows per executemany batch when importing
+    EXPORT_BATCH_SIZE = 10000  # rows fetched from the cursor per batch when exporting
 
     # Duration formats
     SUPPORTED_DURATION_FORMATS = [
@@ -0,0 +1,154 @@
+import os
+from typing import Callable, Dict, Any, List, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from ..data.models import ReportSummary
+from ..data.repositories.time_entries import TimeEntryRepository
+from ..config.settings import Settings
+from ..utils.date_utils import month_partitions
+from .report_cache import ReportCache
+from . import columnar
+
+def get_report_workers() -> int:
+    """Get the number of aggregation threads, honouring the environment override."""
+    value = os.environ.get(Settings.REPORT_WORKERS_ENV)
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            pass
+    return Settings.REPORT_WORKERS
+
+class SummaryEngine:
+    """Computes report summaries from grouped SQL queries.
+
+    Produces the same ReportSummary as FilterService.generate_summary with
+    the same filter semantics, but never creates per-entry objects: the
+    database returns one row per day and project/sub-project pair. Filters
+    the daily rollup can answer are read from it, costing O(days) rather
+    than O(entries); anything else is grouped from the raw entries in SQL
+    (or by the optional NumPy columnar engine, when opted in). Raw aggregations
+    spanning at least a year on a multi-core machine are split into runs
+    of calendar months grouped concurrently, each thread on its own
+    lightweight read-only connection.
+
+    With a ReportCache, a repeated summary over an unchanged database is
+    answered from the cache without querying SQLite at all.
+    """
+
+    def __init__(self, time_repo: TimeEntryRepository, cache: Optional[ReportCache] = None):
+        self.time_repo = time_repo
+        self.cache = cache
+
+    def summarize(self, filters: Optional[Dict[str, Any]] = None) -> ReportSummary:
+        """Summarize all completed entries matching the filters."""
+        filters = filters or {}
+        if self.cache is None:
+            return self._summarize(filters)
+
+        cached = self.cache.get('summary', filters)
+        if cached is not None:
+            return cached
+
+        # Capture the token before querying so a concurrent write can only
+        # make the stored result look stale, never fresh
+        token = self.cache.change_token()
+        summary = self._summarize(filters)
+        self.cache.put('summary', filters, summary, token)
+        return summary
+
+    def _summarize(self, filters: Dict[str, Any]) -> ReportSummary:
+        """Compute a summary from the database."""
+        if self.time_repo.rollups.can_serve(filters):
+            rows = self.time_repo.rollups.aggregate_with_filters(filters)
+        else:
+            rows = self._aggregate_raw(filters)
+        return self.build_summary(rows, self.time_repo.projects.get_name)
+
+    def _aggregate_raw(self, filters: Dict[str, Any]):
+        """Group raw entries, in parallel month partitions when that pays off."""
+        if self._use_columnar(filters):
+            return columnar.ColumnarAggregator(self.time_repo).aggregate(filters)
+
+        partitions = self._partition(filters, min(get_report_workers(), os.cpu_count() or 1))
+        if len(partitions) <= 1:
+            return self.time_repo.aggregate_with_filters(filters)
+
+        # Partitions cover disjoint days, so their (day, ...) groups never
+        # overlap; map() keeps partition order, making the merge deterministic
+        with ThreadPoolExecutor(max_workers=len(partitions)) as pool:
+            return [row for rows in pool.map(self._aggregate_partition, partitions) for row in rows]
+
+    def _aggregate_partition(self, filters: Dict[str, Any]):
+        """Group one partition on a short-lived read-only connection."""
+        # The thread-local connection would run the full pragma setup and
+        # migrate() per worker, costing more than the partition saves
+        with self.time_repo.db.read_connection() as conn:
+            return conn.execute(*TimeEntryRepository.aggregate_query(filters)).fetchall()
+
+    def _partition(self, filters: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+        """Split the filter's date range into up to count runs of whole calendar months.
+
+        Ranges shorter than REPORT_PARTITION_MIN_MONTHS stay whole: below
+        that, starting the threads costs more than they save.
+        """
+        bounds = self.time_repo.get_date_bounds() if count > 1 else None
+        if bounds is None:
+            return [filters]
+
+        from_date = max(filters.get('from_date') or bounds[0], bounds[0])
+        to_date = min(filters.get('to_date') or bounds[1], bounds[1])
+        if from_date > to_date:
+            return [filters]
+
+        # Each partition re-evaluates the non-date filters, so use a few
+        # large month runs rather than one query per month
+        months = month_partitions(from_date, to_date)
+        if len(months) < Settings.REPORT_PARTITION_MIN_MONTHS:
+            return [filters]
+        size = -(-len(months) // count)
+        return [
+            dict(filters, from_date=months[i][0], to_date=months[min(i + size, len(months)) - 1][1])
+            for i in range(0, len(months), size)
+        ]
+
+    def _use_columnar(self, filters: Dict[str, Any]) -> bool:
+        """Use the NumPy engine only when opted in through the environment and installed.
+
+        Fetching the rows into Python alone costs about as much as SQLite's
+        GROUP BY (200k rows: 0.30s columnar vs 0.30s SQL with a where
+        filter, 0.49s vs 0.36s over a date range), so SQL stays the default.
+        """
+        if os.environ.get(Settings.COLUMNAR_ENV, '').strip().lower() not in ('1', 'true', 'yes'):
+            return False
+        return columnar.is_available()
+
+    @staticmethod
+    def build_summary(rows, project_name: Callable[[Any], Optional[str]]) -> ReportSummary:
+        """Fold (day, project key, sub-project key, entries, duration) rows into a summary."""
+        total_entries = 0
+        total_duration = 0
+        projects = defaultdict(lambda: {'duration': 0, 'entries': 0, 'sub_projects': defaultdict(int)})
+        daily_totals = defaultdict(int)
+
+        for day, project_id, sub_project_id, entries, duration in rows:
+            total_entries += entries
+            total_duration += duration
+
+            project_totals = projects[project_name(project_id)]
+            project_totals['duration'] += duration
+            project_totals['entries'] += entries
+
+            sub_project = project_name(sub_project_id)
+            if sub_project:
+                project_totals['sub_projects'][sub_project] += duration
+
+            daily_totals[day] += duration
+
+        return ReportSummary(
+            total_entries=total_entries,
+            total_duration=total_duration,
+            projects=dict(projects),
+            daily_totals=dict(daily_totals)
+        )
@@ -60,11 +60,13 @@ class AlertDaemon:
         start_time = datetime.now()
         alert_sent = False
         
+        # One connection for the daemon's lifetime instead of one per poll
+        db = Database()
+        repo = TimeEntryRepository(db)
+        
         while self.running:
             try:
                 # Check if timer is still active
-                db = Database()
-                repo = TimeEntryRepository(db)
                 entry = repo.get_by_id(self.entry_id)
                 
                 if not entry or not entry.is_active:
@@ -92,6 +94,7 @@ class AlertDaemon:
                 time.sleep(60)  # Wait longer on error
         
         # Clean up
+        db.close()
         self._cleanup()
     
     def _format_duration(self, seconds: int) -> str:
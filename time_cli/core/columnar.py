@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, see the 'columnar' extra
+    np = None
+
+from ..data.repositories.time_entries import TimeEntryRepository
+
+_EPOCH_DAY = date(1970, 1, 1)
+
+# Group keys pack (day, project_id, sub_project_id) into one int64, with
+# 21 bits for each ID and the rest for the day number
+_ID_RADIX = 1 << 21
+
+def is_available() -> bool:
+    """Check whether the NumPy columnar engine can be used."""
+    return np is not None
+
+class ColumnarAggregator:
+    """Vectorized aggregation over integer-coded entry columns.
+
+    Fetches (day, project, sub-project, duration) columns in fixed-size
+    batches and packs each row's group into a single int64 key, keeping
+    only the key and duration arrays (16 bytes per row). All rows are then
+    grouped at once with a 1-D unique plus bincount. Produces the same
+    (day, project_id, sub_project_id, entries, duration) rows as the SQL
+    GROUP BY path, so summaries built from either are identical. Tag
+    filters are resolved in SQL against entry_tags before rows are fetched.
+    """
+
+    def __init__(self, time_repo: TimeEntryRepository):
+        if np is None:
+            raise RuntimeError("The columnar engine requires NumPy (pip install 'time-cli[columnar]')")
+        self.time_repo = time_repo
+
+    def aggregate(self, filters: Optional[Dict[str, Any]] = None) -> List[Tuple[str, int, Optional[int], int, int]]:
+        """Aggregate matching entries per day and project/sub-project pair."""
+        radix = _ID_RADIX
+        keys = []
+        durations = []
+        for batch in self.time_repo.iter_column_batches(filters):
+            columns = np.array(batch, dtype=np.int64)
+            if columns[:, 1:3].max() >= radix:
+                raise RuntimeError("Too many projects for the columnar engine; use the SQL engine")
+            keys.append((columns[:, 0] * radix + columns[:, 1]) * radix + columns[:, 2])
+            durations.append(columns[:, 3])
+        if not keys:
+            return []
+
+        groups, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(groups))
+        totals = np.rint(np.bincount(inverse, weights=np.concatenate(durations), minlength=len(groups)))
+
+        days, rest = np.divmod(groups, radix * radix)
+        project_ids, sub_project_ids = np.divmod(rest, radix)
+        return [
+            ((_EPOCH_DAY + timedelta(days=day)).isoformat(), project_id, sub_project_id or None, count, duration)
+            for day, project_id, sub_project_id, count, duration in zip(
+                days.tolist(), project_ids.tolist(), sub_project_ids.tolist(),
+                counts.tolist(), totals.astype(np.int64).tolist())
+        ]
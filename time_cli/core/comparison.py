@@ -0,0 +1,65 @@
+from datetime import date
+from typing import Dict, Any, Optional
+
+from ..data.models import ComparisonReport
+from ..data.repositories.time_entries import TimeEntryRepository
+from ..utils.date_utils import get_comparison_range
+
+COMPARE_MODES = ['previous', 'same-last-year']
+
+class ComparisonEngine:
+    """Compares a report range with an earlier range in a single query.
+
+    Both ranges are grouped together by window, project and tag, so the
+    comparison costs one indexed pass over the entries in the two ranges
+    rather than two separate report runs.
+    """
+
+    def __init__(self, time_repo: TimeEntryRepository):
+        self.time_repo = time_repo
+
+    def compare(self, filters: Dict[str, Any], mode: str, period_type: Optional[str] = None) -> ComparisonReport:
+        """Compare the filter's date range with the range selected by mode."""
+        if not filters.get('from_date'):
+            raise ValueError("--compare needs a date range: use --today, --week, --month or --from/--to")
+
+        current = (filters['from_date'], filters.get('to_date') or date.today().isoformat())
+        if current[0] > current[1]:
+            raise ValueError("--from must not be after --to")
+        previous = get_comparison_range(current[0], current[1], mode, period_type)
+        if previous[1] >= current[0]:
+            raise ValueError("The comparison range overlaps the report range; use a shorter range")
+
+        totals = self._new_totals()
+        projects: Dict[str, dict] = {}
+        tags: Dict[str, dict] = {}
+        project_name = self.time_repo.projects.get_name
+
+        for window, project_id, tag, tagged_entries, tagged_duration, entries, duration in \
+                self.time_repo.compare_with_filters(filters, current, previous):
+            prefix = 'current' if window == 0 else 'previous'
+
+            totals[f'{prefix}_entries'] += entries
+            totals[f'{prefix}_duration'] += duration
+
+            project_totals = projects.setdefault(project_name(project_id), self._new_totals())
+            project_totals[f'{prefix}_entries'] += entries
+            project_totals[f'{prefix}_duration'] += duration
+
+            if tag is not None:
+                tag_totals = tags.setdefault(tag, self._new_totals())
+                tag_totals[f'{prefix}_entries'] += tagged_entries
+                tag_totals[f'{prefix}_duration'] += tagged_duration
+
+        return ComparisonReport(
+            current_range=current,
+            previous_range=previous,
+            totals=totals,
+            projects=projects,
+            tags=tags
+        )
+
+    @staticmethod
+    def _new_totals() -> dict:
+        """Create an empty side-by-side totals dict."""
+        return {'current_entries': 0, 'current_duration': 0, 'previous_entries': 0, 'previous_duration': 0}
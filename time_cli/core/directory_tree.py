@@ -0,0 +1,84 @@
+from pathlib import PurePath
+from typing import Dict, Any, List, Optional
+
+from ..data.repositories.time_entries import TimeEntryRepository
+
+class DirectoryNode:
+    """A path component in the directory trie with its subtree totals."""
+
+    __slots__ = ('name', 'children', 'duration', 'entries', 'own_duration')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.children: Dict[str, "DirectoryNode"] = {}
+        self.duration = 0  # whole subtree
+        self.entries = 0  # whole subtree
+        self.own_duration = 0  # entries started in exactly this directory
+
+    def sorted_children(self) -> List["DirectoryNode"]:
+        """Children ordered by subtree duration, largest first."""
+        return sorted(self.children.values(), key=lambda node: (-node.duration, node.name))
+
+class DirectoryTreeBuilder:
+    """Builds a path-prefix trie of time spent per directory.
+
+    Durations are grouped per distinct directory in SQL, so the trie is
+    built from one row per path rather than per entry. Each row is added
+    to every node on its path, so every ancestor holds the total of its
+    subtree after the single pass.
+    """
+
+    def __init__(self, time_repo: TimeEntryRepository):
+        self.time_repo = time_repo
+
+    def build(self, filters: Optional[Dict[str, Any]] = None) -> DirectoryNode:
+        """Build the trie for completed entries matching the filters."""
+        root = DirectoryNode('')
+
+        for directory, entries, duration in self.time_repo.group_with_filters(filters or {}, ['directory']):
+            parts = PurePath(directory).parts if directory else ('(unknown)',)
+            node = root
+            node.duration += duration
+            node.entries += entries
+            for part in parts:
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = DirectoryNode(part)
+                node = child
+                node.duration += duration
+                node.entries += entries
+            node.own_duration += duration
+
+        return root
+
+    @staticmethod
+    def prune(node: DirectoryNode, max_depth: Optional[int] = None, min_duration: int = 0,
+              depth: int = 0) -> DirectoryNode:
+        """Copy a trie, cutting it below max_depth and dropping subtrees under min_duration.
+
+        Totals are unchanged: a cut or dropped subtree still counts towards
+        its ancestors. Chains of single-child directories are merged into
+        one node so deep paths stay readable.
+        """
+        pruned = DirectoryNode(node.name)
+        pruned.duration = node.duration
+        pruned.entries = node.entries
+        pruned.own_duration = node.own_duration
+
+        if max_depth is not None and depth >= max_depth:
+            return pruned
+
+        for child in node.children.values():
+            if child.duration < min_duration:
+                continue
+            pruned_child = DirectoryTreeBuilder.prune(child, max_depth, min_duration, depth + 1)
+            # Merge a directory into its only child when all its time is in that child
+            while len(pruned_child.children) == 1:
+                (grandchild,) = pruned_child.children.values()
+                if grandchild.duration != pruned_child.duration:
+                    break
+                grandchild.name = str(PurePath(pruned_child.name, grandchild.name))
+                pruned_child = grandchild
+            pruned.children[pruned_child.name] = pruned_child
+
+        return pruned
@@ -16,6 +16,20 @@ def format_duration(seconds: int) -> str:
     else:
         return f"{seconds}s"
 
+def format_duration_short(seconds: int) -> str:
+    """Format duration like format_duration, leaving out seconds once over an hour."""
+    if seconds is None:
+        return "N/A"
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {(seconds % 3600) // 60}m"
+    return format_duration(seconds)
+
+def format_hours(seconds: int) -> str:
+    """Format duration in seconds as decimal hours, for compact table cells."""
+    if seconds is None:
+        return "N/A"
+    return f"{seconds / 3600:.1f}h"
+
 def parse_duration_input(duration_str: str) -> int:
     """Parse duration input in various formats (1h30m, 90m, 5400s) to seconds."""
     duration_str = duration_str.strip().lower()
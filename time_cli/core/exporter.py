@@ -0,0 +1,113 @@
+import csv
+import gzip
+import io
+import json
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, see the 'parquet' extra
+    pa = None
+    pq = None
+
+from ..data.queries import split_tags
+from ..data.repositories.time_entries import TimeEntryRepository
+
+EXPORT_FORMATS = ['csv', 'ndjson', 'parquet']
+
+# Field names match what `timetrack import` reads back
+EXPORT_FIELDS = ['id', 'start', 'end', 'project', 'sub_project', 'tags', 'directory', 'duration', 'paused_duration']
+
+class EntryExporter:
+    """Streams completed entries to CSV, NDJSON or Parquet.
+
+    Rows go straight from the cursor, one batch at a time, into the output
+    stream, so memory is bounded by the batch size whatever the history
+    length. CSV and NDJSON can be gzip-compressed; Parquet (which needs
+    the optional pyarrow dependency) is written one row group per batch
+    and compresses internally.
+    """
+
+    def __init__(self, time_repo: TimeEntryRepository):
+        self.time_repo = time_repo
+
+    def export(self, filters: Optional[Dict[str, Any]], file_format: str, output: BinaryIO,
+               compress: bool = False) -> int:
+        """Write matching entries to a binary stream and return how many were written."""
+        batches = self._batches(filters)
+
+        if file_format == 'parquet':
+            return self._write_parquet(batches, output, compress)
+
+        stream = gzip.GzipFile(fileobj=output, mode='wb') if compress else output
+        text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        try:
+            if file_format == 'csv':
+                return self._write_csv(batches, text)
+            return self._write_ndjson(batches, text)
+        finally:
+            text.flush()
+            text.detach()
+            if compress:
+                stream.close()
+
+    def _batches(self, filters: Optional[Dict[str, Any]]) -> Iterator[List[Tuple]]:
+        """Yield batches of rows in EXPORT_FIELDS order with names resolved."""
+        project_name = self.time_repo.projects.get_name
+        for rows in self.time_repo.iter_export_batches(filters):
+            yield [
+                (entry_id, start, end, project_name(project_id), project_name(sub_project_id),
+                 split_tags(tags), directory, duration, paused_duration or 0)
+                for entry_id, project_id, sub_project_id, tags, start, end, directory, duration, paused_duration
+                in rows
+            ]
+
+    @staticmethod
+    def _write_csv(batches: Iterator[List[Tuple]], text: io.TextIOWrapper) -> int:
+        """Write a header row and one CSV row per entry, tags as a JSON array."""
+        writer = csv.writer(text)
+        writer.writerow(EXPORT_FIELDS)
+        count = 0
+        tags_index = EXPORT_FIELDS.index('tags')
+        # Tags may contain commas, so a comma-joined cell would not round-trip
+        encode_tags = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        for batch in batches:
+            writer.writerows(
+                row[:tags_index] + (encode_tags(row[tags_index]) if row[tags_index] else '',) + row[tags_index + 1:]
+                for row in batch
+            )
+            count += len(batch)
+        return count
+
+    @staticmethod
+    def _write_ndjson(batches: Iterator[List[Tuple]], text: io.TextIOWrapper) -> int:
+        """Write one JSON object per line."""
+        count = 0
+        dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        for batch in batches:
+            text.write(''.join(dumps(dict(zip(EXPORT_FIELDS, row))) + '\n' for row in batch))
+            count += len(batch)
+        return count
+
+    @staticmethod
+    def _write_parquet(batches: Iterator[List[Tuple]], output: BinaryIO, compress: bool) -> int:
+        """Write one Parquet row group per batch."""
+        if pa is None:
+            raise RuntimeError("Parquet export requires pyarrow (pip install 'time-cli[parquet]')")
+
+        schema = pa.schema([
+            ('id', pa.int64()), ('start', pa.string()), ('end', pa.string()),
+            ('project', pa.string()), ('sub_project', pa.string()), ('tags', pa.list_(pa.string())),
+            ('directory', pa.string()), ('duration', pa.int64()), ('paused_duration', pa.int64()),
+        ])
+        count = 0
+        with pq.ParquetWriter(output, schema, compression='gzip' if compress else 'snappy') as writer:
+            for batch in batches:
+                columns = list(zip(*batch))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                    schema=schema
+                ))
+                count += len(batch)
+        return count
@@ -1,7 +1,8 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable
 from collections import defaultdict
 
 from ..data.models import TimeEntry, ReportSummary
+from ..data.query_language import compile_where
 from ..utils.date_utils import get_date_range
 
 class FilterService:
@@ -10,7 +11,8 @@ class FilterService:
     @staticmethod
     def build_filters(today: bool = False, week: bool = False, month: bool = False,
                      from_date: Optional[str] = None, to_date: Optional[str] = None,
-                     projects: Optional[List[str]] = None, tags: Optional[List[str]] = None) -> Dict[str, Any]:
+                     projects: Optional[List[str]] = None, tags: Optional[List[str]] = None,
+                     where: Optional[str] = None) -> Dict[str, Any]:
         """Build filters dictionary from command options."""
         filters = {}
         
@@ -35,42 +37,56 @@ class FilterService:
         if tags:
             filters['tags'] = tags
         
+        # Expression filtering, compiled to SQL with the other filters
+        if where:
+            compile_where(where)  # fail early on syntax errors
+            filters['where'] = where
+        
         return filters
     
     @staticmethod
-    def generate_summary(entries: List[TimeEntry]) -> ReportSummary:
+    def generate_summary(entries: Iterable[TimeEntry]) -> ReportSummary:
         """Generate summary statistics from time entries."""
-        if not entries:
-            return ReportSummary(
-                total_entries=0,
-                total_duration=0,
-                projects={},
-                daily_totals={}
-            )
+        builder = SummaryBuilder()
+        for entry in entries:
+            builder.add(entry)
+        return builder.build()
+
+class SummaryBuilder:
+    """Accumulates report totals one entry at a time, for single-pass reports."""
+    
+    def __init__(self):
+        self.total_entries = 0
+        self.total_duration = 0
+        self.projects = defaultdict(lambda: {'duration': 0, 'entries': 0, 'sub_projects': defaultdict(int)})
+        self.daily_totals = defaultdict(int)
+    
+    def add(self, entry: TimeEntry):
+        """Add one entry to the running totals."""
+        project = entry.project
+        sub_project = entry.sub_project
+        duration = entry.duration or 0
+        date_key = entry.start_time.date().isoformat()
         
-        total_duration = sum(entry.duration or 0 for entry in entries)
-        projects = defaultdict(lambda: {'duration': 0, 'entries': 0, 'sub_projects': defaultdict(int)})
-        daily_totals = defaultdict(int)
+        self.total_entries += 1
+        self.total_duration += duration
         
-        for entry in entries:
-            project = entry.project
-            sub_project = entry.sub_project
-            duration = entry.duration or 0
-            date_key = entry.start_time.date().isoformat()
-            
-            # Project totals
-            projects[project]['duration'] += duration
-            projects[project]['entries'] += 1
-            
-            if sub_project:
-                projects[project]['sub_projects'][sub_project] += duration
-            
-            # Daily totals
-            daily_totals[date_key] += duration
+        # Project totals
+        project_totals = self.projects[project]
+        project_totals['duration'] += duration
+        project_totals['entries'] += 1
         
+        if sub_project:
+            project_totals['sub_projects'][sub_project] += duration
+        
+        # Daily totals
+        self.daily_totals[date_key] += duration
+    
+    def build(self) -> ReportSummary:
+        """Build the summary from the totals accumulated so far."""
         return ReportSummary(
-            total_entries=len(entries),
-            total_duration=total_duration,
-            projects=dict(projects),
-            daily_totals=dict(daily_totals)
-        )
\ No newline at end of file
+            total_entries=self.total_entries,
+            total_duration=self.total_duration,
+            projects=dict(self.projects),
+            daily_totals=dict(self.daily_totals)
+        )
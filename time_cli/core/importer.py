@@ -0,0 +1,185 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..config.settings import Settings
+from ..data.database import Database
+from ..data.repositories.time_entries import TimeEntryRepository
+from ..utils.validation import validate_project_name, validate_tags, sanitize_project_name, sanitize_tags
+from .duration import parse_duration_input
+
+IMPORT_FORMATS = ['csv', 'ndjson']
+
+class EntryImportError(ValueError):
+    """Raised when an import file contains an invalid record."""
+
+class ImportResult:
+    """Outcome of an import run."""
+
+    def __init__(self):
+        self.imported = 0
+        self.skipped: List[Tuple[int, str]] = []  # (line number, reason)
+        self.first_id: Optional[int] = None
+        self.last_id: Optional[int] = None
+
+class EntryImporter:
+    """Bulk-imports completed entries from CSV or NDJSON files.
+
+    Records are streamed from the file, validated, and written in batches
+    with executemany, all inside one transaction: an import either lands
+    completely or not at all. Entry IDs are assigned up front so entries
+    and their tags are inserted without per-row round trips, and the daily
+    rollup is updated once for the whole imported ID range.
+
+    Each record has start and end (ISO 8601 local times), project, and
+    optionally sub_project, tags (a list, a JSON array string as written
+    by `timetrack export`, or a comma-separated string),
+    directory, duration (overrides end - start; e.g. 5400 or 1h30m) and
+    paused_duration. Gzip-compressed files are decompressed on the fly.
+    """
+
+    def __init__(self, db: Database, time_repo: TimeEntryRepository):
+        self.db = db
+        self.time_repo = time_repo
+
+    @staticmethod
+    def detect_format(path: Path) -> str:
+        """Guess the file format from its extension, looking inside .gz."""
+        name = path.name.lower()
+        if name.endswith('.gz'):
+            name = name[:-3]
+        return 'csv' if name.endswith('.csv') else 'ndjson'
+
+    def import_file(self, path: Path, file_format: Optional[str] = None, skip_invalid: bool = False,
+                    progress: Optional[Callable[[int], None]] = None,
+                    batch_size: int = Settings.IMPORT_BATCH_SIZE) -> ImportResult:
+        """Import a file, reporting bytes read to progress after each batch."""
+        file_format = file_format or self.detect_format(path)
+        result = ImportResult()
+
+        try:
+            with open(path, 'rb') as raw, self.db.transaction() as conn:
+                # Progress is reported in compressed bytes read from raw
+                source = gzip.GzipFile(fileobj=raw, mode='rb') if raw.peek(2)[:2] == b'\x1f\x8b' else raw
+                records = self._read_csv(source) if file_format == 'csv' else self._read_ndjson(source)
+                rows = self._validated_rows(records, result, skip_invalid)
+                first_id = next_id = self.time_repo.next_id(conn)
+
+                while True:
+                    batch = list(islice(rows, batch_size))
+                    if not batch:
+                        break
+                    next_id = self.time_repo.insert_completed_batch(conn, next_id, batch)
+                    result.imported += len(batch)
+                    if progress:
+                        progress(raw.tell())
+
+                if result.imported:
+                    result.first_id, result.last_id = first_id, next_id - 1
+                    self.time_repo.rollups.add_entry_range(first_id, next_id - 1)
+        except Exception:
+            # Names interned during the rolled-back transaction no longer exist
+            self.time_repo.projects.invalidate()
+            raise
+
+        return result
+
+    def _read_csv(self, raw) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (line number, record) pairs from a CSV file with a header row."""
+        text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+        text.detach()
+
+    def _read_ndjson(self, raw) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (line number, record) pairs from a file with one JSON object per line."""
+        for line_number, line in enumerate(raw, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line.decode('utf-8'))
+            except ValueError as e:  # includes UnicodeDecodeError
+                yield line_number, {'_error': f"invalid JSON: {e}"}
+                continue
+            yield line_number, record if isinstance(record, dict) else {'_error': "expected a JSON object"}
+
+    def _validated_rows(self, records: Iterator[Tuple[int, Dict[str, Any]]], result: ImportResult,
+                        skip_invalid: bool) -> Iterator[Tuple]:
+        """Turn records into insert rows, skipping or rejecting invalid ones."""
+        for line_number, record in records:
+            try:
+                yield self._parse_record(record)
+            except (ValueError, TypeError, AttributeError) as e:
+                if not skip_invalid:
+                    raise EntryImportError(f"Line {line_number}: {e}")
+                result.skipped.append((line_number, str(e)))
+
+    @staticmethod
+    def _parse_tags_cell(text: str) -> List[str]:
+        """Split a CSV tags cell: a JSON array as exported, else comma-separated."""
+        if text.lstrip().startswith('['):
+            try:
+                tags = json.loads(text)
+            except json.JSONDecodeError:
+                tags = None
+            # Hand-written cells such as "[wip]" or "[a], b" are plain tags
+            if isinstance(tags, list) and all(isinstance(tag, str) for tag in tags):
+                return tags
+        return text.split(',')
+
+    @staticmethod
+    def _parse_record(record: Dict[str, Any]) -> Tuple:
+        """Validate one record and convert it to an insert row."""
+        if '_error' in record:
+            raise EntryImportError(record['_error'])
+
+        project = record.get('project') or ''
+        if not validate_project_name(project):
+            raise EntryImportError(f"invalid project name {project!r}")
+        project = sanitize_project_name(project)
+
+        sub_project = record.get('sub_project') or None
+        if sub_project is not None:
+            if not validate_project_name(sub_project):
+                raise EntryImportError(f"invalid sub-project name {sub_project!r}")
+            sub_project = sanitize_project_name(sub_project)
+
+        tags = record.get('tags') or []
+        if isinstance(tags, str):
+            tags = EntryImporter._parse_tags_cell(tags)
+        tags = sanitize_tags(tags)
+        if not validate_tags(tags):
+            raise EntryImportError(f"invalid tags {tags!r}")
+
+        start_time = EntryImporter._parse_time(record.get('start'), 'start')
+        end_time = EntryImporter._parse_time(record.get('end'), 'end')
+        if end_time < start_time:
+            raise EntryImportError("end is before start")
+
+        duration = record.get('duration')
+        if duration in (None, ''):
+            duration = int((end_time - start_time).total_seconds())
+        else:
+            duration = parse_duration_input(str(duration))
+
+        paused_duration = record.get('paused_duration') or 0
+
+        return (project, sub_project, tags, start_time, end_time, duration,
+                record.get('directory') or '', int(paused_duration))
+
+    @staticmethod
+    def _parse_time(value: Any, field: str) -> datetime:
+        """Parse an ISO 8601 local date-time."""
+        if not value:
+            raise EntryImportError(f"missing {field}")
+        try:
+            return datetime.fromisoformat(str(value).strip())
+        except ValueError:
+            raise EntryImportError(f"invalid {field} time {value!r} (use YYYY-MM-DD HH:MM[:SS])")
@@ -0,0 +1,84 @@
+import glob
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..config.settings import Settings
+from ..data.models import ReportSummary
+from ..data.repositories.attached import AttachedDatabaseRepository
+from .aggregation import SummaryEngine, get_report_workers
+
+def expand_database_paths(patterns: Sequence[str]) -> List[Path]:
+    """Expand --db arguments, which may be glob patterns, into distinct database files."""
+    paths: List[Path] = []
+    seen = set()
+    for pattern in patterns:
+        pattern = str(Path(pattern).expanduser())
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise ValueError(f"No databases match '{pattern}'")
+        else:
+            matches = [pattern]
+
+        for match in matches:
+            path = Path(match)
+            if not path.is_file():
+                raise ValueError(f"Database not found: {match}")
+            key = path.resolve()
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+class MultiDatabaseSummaryEngine:
+    """Computes one report summary across several timetrack databases.
+
+    Up to REPORT_ATTACH_LIMIT databases are attached to a single connection
+    and aggregated in one statement. Beyond that limit the databases are
+    split into groups queried concurrently, each on its own connection.
+    The result is an ordinary ReportSummary whose sources field holds the
+    totals of each database, labelled by its path.
+    """
+
+    def __init__(self, paths: Sequence[Path], repository: Optional[AttachedDatabaseRepository] = None):
+        self.paths = list(paths)
+        self.repository = repository or AttachedDatabaseRepository()
+
+    def summarize(self, filters: Optional[Dict[str, Any]] = None) -> ReportSummary:
+        """Summarize all completed entries matching the filters in every database."""
+        filters = filters or {}
+        groups = self._groups(get_report_workers())
+
+        if len(groups) == 1:
+            rows = self.repository.aggregate_with_filters(groups[0], filters)
+        else:
+            # map() keeps group order, so the merged rows are deterministic
+            with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+                results = pool.map(lambda group: self.repository.aggregate_with_filters(group, filters), groups)
+                rows = [row for group_rows in results for row in group_rows]
+
+        sources = {str(path): {'duration': 0, 'entries': 0} for path in self.paths}
+        summary_rows = []
+        for source, day, project, sub_project, entries, duration in rows:
+            totals = sources[str(self.paths[source])]
+            totals['entries'] += entries
+            totals['duration'] += duration
+            summary_rows.append((day, project, sub_project, entries, duration))
+
+        summary = SummaryEngine.build_summary(summary_rows, lambda name: name)
+        summary.sources = sources
+        return summary
+
+    def _groups(self, workers: int) -> List[List[Tuple[int, Path]]]:
+        """Split the (source index, path) list into attachable groups, one per query."""
+        sources = list(enumerate(self.paths))
+        limit = Settings.REPORT_ATTACH_LIMIT
+        if len(sources) <= limit:
+            return [sources]
+
+        # Past the attach limit the groups run in parallel anyway, so use at
+        # least one per worker
+        count = max(-(-len(sources) // limit), min(workers, len(sources)))
+        size = -(-len(sources) // count)
+        return [sources[i:i + size] for i in range(0, len(sources), size)]
@@ -0,0 +1,81 @@
+from typing import Dict, Any, List, Optional
+
+from ..data.models import PivotTable
+from ..data.queries import PIVOT_DIMENSIONS
+from ..data.repositories.time_entries import TimeEntryRepository
+
+WEEKDAY_NAMES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+class PivotEngine:
+    """Groups report totals by arbitrary combinations of dimensions.
+
+    All grouping happens in a single SQL GROUP BY over the filtered entries;
+    Python only maps keys to display labels and orders them. Time buckets
+    (weekday, hour, day, ISO week, month, quarter, year) use local start
+    time, matching the report's date filters.
+    """
+
+    def __init__(self, time_repo: TimeEntryRepository):
+        self.time_repo = time_repo
+
+    @staticmethod
+    def parse_dimensions(group_by: List[str]) -> List[str]:
+        """Parse repeated and comma-separated --group-by values."""
+        dimensions = []
+        for value in group_by:
+            for dimension in value.split(','):
+                dimension = dimension.strip().lower().replace('-', '_')
+                if not dimension:
+                    continue
+                if dimension not in PIVOT_DIMENSIONS:
+                    valid = ', '.join(PIVOT_DIMENSIONS)
+                    raise ValueError(f"Unknown group-by dimension '{dimension}' (choose from: {valid})")
+                if dimension in dimensions:
+                    raise ValueError(f"Dimension '{dimension}' given more than once")
+                dimensions.append(dimension)
+        return dimensions
+
+    def pivot(self, filters: Optional[Dict[str, Any]], dimensions: List[str]) -> PivotTable:
+        """Total entries and duration for every combination of dimension values."""
+        raw_rows = self.time_repo.group_with_filters(filters or {}, dimensions)
+        width = len(dimensions)
+
+        # Order by the raw keys (so weekdays and hours sort numerically),
+        # with missing values last
+        keyed = []
+        for row in raw_rows:
+            keys = tuple(self._sort_key(dimension, key) for dimension, key in zip(dimensions, row[:width]))
+            keyed.append((keys, row))
+        keyed.sort(key=lambda item: item[0])
+
+        rows = []
+        values: List[Dict[Any, str]] = [{} for _ in dimensions]
+        for keys, row in keyed:
+            labels = tuple(self._label(dimension, key) for dimension, key in zip(dimensions, row[:width]))
+            for i, (sort_key, label) in enumerate(zip(keys, labels)):
+                values[i][sort_key] = label
+            rows.append((labels, row[width], row[width + 1]))
+
+        return PivotTable(
+            dimensions=list(dimensions),
+            values=[[labels[key] for key in sorted(labels)] for labels in values],
+            rows=rows
+        )
+
+    def _sort_key(self, dimension: str, key: Any):
+        """Build a sort key that orders missing values after all others."""
+        if dimension in ('project', 'sub_project'):
+            key = self.time_repo.projects.get_name(key)
+        return (key is None, key if key is not None else 0)
+
+    def _label(self, dimension: str, key: Any) -> str:
+        """Format a raw group key for display."""
+        if dimension in ('project', 'sub_project'):
+            key = self.time_repo.projects.get_name(key)
+        if key is None:
+            return '(untagged)' if dimension == 'tag' else '(none)'
+        if dimension == 'weekday':
+            return WEEKDAY_NAMES[key]
+        if dimension == 'hour':
+            return f"{key:02d}:00"
+        return str(key)
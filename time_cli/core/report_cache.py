@@ -0,0 +1,101 @@
+import os
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from ..config.paths import Paths
+from ..config.settings import Settings
+from ..data.database import Database
+from ..data.models import ReportSummary
+from ..data.migrations import LATEST_VERSION
+
+class ReportCache:
+    """Size-bounded LRU cache of report results, stored under the app directory.
+
+    Results are keyed by report kind and the normalized filter dict from
+    FilterService.build_filters, and are valid only while the database's
+    change token is unchanged. The token is the database's ID and change
+    sequence high-water mark, which every committed write advances, so a
+    hit costs one small read of the meta table. Hits never write the file:
+    they update recency in memory, persisted by the next put.
+    """
+
+    def __init__(self, db: Database, cache_path: Optional[Path] = None,
+                 max_entries: int = Settings.REPORT_CACHE_MAX_ENTRIES):
+        self.db = db
+        self.cache_path = Path(cache_path or Paths.get_report_cache_path())
+        self.max_entries = max_entries
+        # Keys hit since the last put, least recent first
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+
+    def change_token(self) -> str:
+        """Get a token that changes whenever the database is written."""
+        with self.db.get_connection() as conn:
+            database_id, change_seq = conn.execute('''
+                SELECT (SELECT value FROM meta WHERE key = 'database_id'),
+                       (SELECT value FROM meta WHERE key = 'change_seq')
+            ''').fetchone()
+        return f"v{LATEST_VERSION}/{database_id}/{change_seq}"
+
+    def get(self, kind: str, filters: Dict[str, Any]) -> Optional[ReportSummary]:
+        """Get a cached summary, or None on a miss or if the database changed."""
+        token = self.change_token()
+        entries = self._load(token)
+        key = self._key(kind, filters)
+
+        if key not in entries:
+            return None
+
+        self._recent[key] = None
+        self._recent.move_to_end(key)
+        return ReportSummary(**entries[key])
+
+    def put(self, kind: str, filters: Dict[str, Any], summary: ReportSummary, token: str):
+        """Store a summary computed while the database had the given change token."""
+        entries = self._load(token)
+        for recent in self._recent:
+            if recent in entries:
+                entries.move_to_end(recent)
+        self._recent.clear()
+
+        key = self._key(kind, filters)
+        # vars() rather than asdict(): the nested defaultdicts serialize as
+        # plain JSON objects but cannot be deep-copied by asdict
+        entries[key] = dict(vars(summary))
+        entries.move_to_end(key)
+
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+        self._save(token, entries)
+
+    def _key(self, kind: str, filters: Dict[str, Any]) -> str:
+        """Build the cache key for a report kind and filter dict."""
+        return json.dumps({'kind': kind, 'filters': filters}, sort_keys=True)
+
+    def _load(self, token: str) -> "OrderedDict[str, Dict[str, Any]]":
+        """Load cached entries, discarding them all if the token is stale."""
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return OrderedDict()
+
+        if not isinstance(data, dict) or data.get('token') != token:
+            return OrderedDict()
+        return OrderedDict(data.get('entries', []))
+
+    def _save(self, token: str, entries: "OrderedDict[str, Dict[str, Any]]"):
+        """Atomically write the cache file."""
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'token': token, 'entries': list(entries.items())}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # The cache is an optimisation only; never fail a report over it
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable
+
+from ..data.models import TimeEntry
+from .sketch import DurationSketch
+
+@dataclass
+class SessionStats:
+    """Session-length distributions overall, per project and per tag."""
+    overall: DurationSketch = field(default_factory=DurationSketch)
+    projects: Dict[str, DurationSketch] = field(default_factory=dict)
+    tags: Dict[str, DurationSketch] = field(default_factory=dict)
+
+    def merge(self, other: "SessionStats"):
+        """Merge statistics gathered over another partition of the entries."""
+        self.overall.merge(other.overall)
+        for target, source in ((self.projects, other.projects), (self.tags, other.tags)):
+            for key, sketch in source.items():
+                target.setdefault(key, DurationSketch()).merge(sketch)
+
+class SessionStatsBuilder:
+    """Accumulates session-length sketches one entry at a time.
+
+    Memory is bounded by the number of projects and tags, not by the number
+    of entries, so the whole history can be streamed through it.
+    """
+
+    def __init__(self):
+        self.stats = SessionStats()
+
+    def add(self, entry: TimeEntry):
+        """Add one completed entry's duration."""
+        duration = entry.duration or 0
+        self.stats.overall.add(duration)
+
+        project_sketch = self.stats.projects.get(entry.project)
+        if project_sketch is None:
+            project_sketch = self.stats.projects[entry.project] = DurationSketch()
+        project_sketch.add(duration)
+
+        for tag in entry.tags:
+            tag_sketch = self.stats.tags.get(tag)
+            if tag_sketch is None:
+                tag_sketch = self.stats.tags[tag] = DurationSketch()
+            tag_sketch.add(duration)
+
+    def build(self) -> SessionStats:
+        """Get the statistics accumulated so far."""
+        return self.stats
+
+    @staticmethod
+    def from_entries(entries: Iterable[TimeEntry]) -> SessionStats:
+        """Compute statistics in one pass over an entry stream."""
+        builder = SessionStatsBuilder()
+        for entry in entries:
+            builder.add(entry)
+        return builder.build()
@@ -0,0 +1,92 @@
+import math
+from typing import Dict, List, Optional
+
+class DurationSketch:
+    """Mergeable quantile sketch for session durations in seconds.
+
+    Durations are counted in logarithmically sized buckets, so any quantile
+    is answered within a fixed relative error (1% by default) while memory
+    depends only on the spread of values, not on how many were added: a
+    second-to-a-year range needs under 1,000 buckets. Sketches built over
+    separate partitions of the data merge exactly by adding bucket counts.
+    A fixed histogram over HISTOGRAM_EDGES is kept alongside.
+    """
+
+    HISTOGRAM_EDGES = [5 * 60, 15 * 60, 30 * 60, 3600, 2 * 3600, 4 * 3600, 8 * 3600]
+    HISTOGRAM_LABELS = ["<5m", "5-15m", "15-30m", "30m-1h", "1-2h", "2-4h", "4-8h", "8h+"]
+
+    __slots__ = ('relative_accuracy', '_gamma_log', 'buckets', 'zero_count',
+                 'count', 'total', 'min', 'max', 'histogram')
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma_log = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+        self.histogram = [0] * len(self.HISTOGRAM_LABELS)
+
+    def add(self, seconds: int):
+        """Add one duration."""
+        seconds = max(seconds or 0, 0)
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        self.histogram[self._histogram_index(seconds)] += 1
+
+        if seconds == 0:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(seconds) / self._gamma_log)
+            self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other: "DurationSketch"):
+        """Add the contents of another sketch with the same accuracy into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> Optional[int]:
+        """Estimate the q-quantile (0 <= q <= 1) in seconds, or None if empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0
+
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(key-1), gamma^key], clamped
+                # to the exact extremes
+                value = 2 * math.exp(key * self._gamma_log) / (1 + math.exp(self._gamma_log))
+                return int(round(min(max(value, self.min), self.max)))
+        return self.max
+
+    def quantiles(self, qs: List[float]) -> List[Optional[int]]:
+        """Estimate several quantiles."""
+        return [self.quantile(q) for q in qs]
+
+    def _histogram_index(self, seconds: int) -> int:
+        """Get the fixed histogram bucket for a duration."""
+        for i, edge in enumerate(self.HISTOGRAM_EDGES):
+            if seconds < edge:
+                return i
+        return len(self.HISTOGRAM_EDGES)
@@ -0,0 +1,178 @@
+import json
+from typing import Optional, Tuple
+
+from ..config.settings import Settings
+from ..data.database import Database
+from ..data.repositories.directory_mappings import DirectoryMappingRepository
+from ..data.repositories.sync import SyncRepository
+from ..data.repositories.time_entries import TimeEntryRepository
+
+class SyncError(ValueError):
+    """Raised when two databases cannot be synced."""
+
+class SyncCounts:
+    """Changes applied in one direction of a sync."""
+
+    def __init__(self):
+        self.entries = 0
+        self.deletions = 0
+        self.mappings = 0
+
+    @property
+    def total(self) -> int:
+        return self.entries + self.deletions + self.mappings
+
+class SyncResult:
+    """Outcome of a sync run."""
+
+    def __init__(self):
+        self.pulled = SyncCounts()
+        self.pushed = SyncCounts()
+        self.first_sync = False
+
+class _Side:
+    """The repositories of one database taking part in a sync."""
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.sync = SyncRepository(db)
+        self.entries = TimeEntryRepository(db)
+        self.mappings = DirectoryMappingRepository(db)
+
+    def changes_seq(self) -> int:
+        """Get the database's last allocated change sequence number."""
+        return self.entries.changes.current_seq()
+
+def _version(updated_at: Optional[int], deleted: bool, content) -> Tuple[int, int, str]:
+    """Order the versions of a row: highest updated_at first, then deletion, then content."""
+    return (updated_at or 0, 1 if deleted else 0, '' if deleted else json.dumps(content))
+
+class SyncService:
+    """Incremental two-way sync of entries and directory mappings between databases.
+
+    Entries are matched by uid and mappings by directory path. Each side
+    remembers, per peer, the last of its own change sequence numbers it
+    sent and the last of the peer's it received, so a sync only reads rows
+    changed since the previous one. Rows applied during a sync are stamped
+    with new local sequence numbers above the watermarks stored at the end,
+    so they are not echoed back next time.
+
+    Conflicts are resolved row by row, identically on both sides: the
+    version with the higher updated_at wins, a deletion beats an edit with
+    the same updated_at, and remaining ties go to the greater content, so
+    both databases converge on the same rows whichever one runs the sync.
+    updated_at is a millisecond clock that local writes always advance
+    past the row's previous version, so an edit can never lose to the
+    version it replaced, even when that came from a peer whose clock runs
+    ahead; only concurrent edits are decided by time.
+    """
+
+    def __init__(self, local_db: Database, remote_db: Database):
+        self.local = _Side(local_db)
+        self.remote = _Side(remote_db)
+
+    def reset_remote_id(self) -> str:
+        """Re-key the remote database, e.g. a copy of the local one, and return its new ID."""
+        return self.remote.sync.reset_database_id()
+
+    def sync(self, batch_size: int = Settings.EXPORT_BATCH_SIZE) -> SyncResult:
+        """Exchange changes in both directions in one transaction per database."""
+        local_id = self.local.sync.database_id()
+        remote_id = self.remote.sync.database_id()
+        if local_id == remote_id:
+            raise SyncError(
+                "Both paths refer to the same database (or a copy of it); "
+                "if one is a copy, re-key it with --reset-id"
+            )
+
+        result = SyncResult()
+        try:
+            with self.local.db.transaction(), self.remote.db.transaction():
+                sent_seq, received_seq = self.local.sync.get_peer(remote_id)
+                result.first_sync = (sent_seq, received_seq) == (0, 0)
+                local_until = self.local.changes_seq()
+                remote_until = self.remote.changes_seq()
+                if remote_until < received_seq or local_until < sent_seq:
+                    raise SyncError("Sync state is ahead of a database; was one of them restored from a backup?")
+
+                self._transfer(self.remote, self.local, received_seq, remote_until, result.pulled, batch_size)
+                self._transfer(self.local, self.remote, sent_seq, local_until, result.pushed, batch_size)
+
+                local_seq = self.local.changes_seq()
+                remote_seq = self.remote.changes_seq()
+                self.local.sync.set_peer(remote_id, local_seq, remote_seq)
+                self.remote.sync.set_peer(local_id, remote_seq, local_seq)
+        except Exception:
+            # Names interned during the rolled-back transactions no longer exist
+            self.local.entries.projects.invalidate()
+            self.remote.entries.projects.invalidate()
+            raise
+
+        return result
+
+    def _transfer(self, source: _Side, target: _Side, since: int, until: int,
+                  counts: SyncCounts, batch_size: int):
+        """Apply source rows changed in (since, until] to target where they win."""
+        for records in source.sync.iter_entry_changes(since, until, batch_size):
+            for record in records:
+                if self._apply_entry(target, record):
+                    counts.entries += 1
+
+        for tombstones in source.sync.iter_deletion_changes(since, until, batch_size):
+            for uid, deleted_at, updated_at in tombstones:
+                if self._apply_deletion(target, uid, deleted_at, updated_at):
+                    counts.deletions += 1
+
+        for records in source.sync.iter_mapping_changes(since, until, batch_size):
+            for record in records:
+                if self._apply_mapping(target, record):
+                    counts.mappings += 1
+
+    @staticmethod
+    def _apply_entry(target: _Side, record: Tuple) -> bool:
+        """Write an entry to target unless target's version of it wins."""
+        uid, updated_at = record[0], record[1]
+        incoming = _version(updated_at, False, record[2:])
+        current = target.sync.get_entry(uid)
+        if current is not None:
+            entry_id, existing = current
+            if incoming <= _version(existing[1], False, existing[2:]):
+                return False
+        else:
+            entry_id = None
+            deleted_version = target.sync.get_deletion_version(uid)
+            if deleted_version is not None and incoming <= _version(deleted_version, True, None):
+                return False
+
+        target.entries.apply_synced(entry_id, record)
+        return True
+
+    @staticmethod
+    def _apply_deletion(target: _Side, uid: str, deleted_at: int, updated_at: int) -> bool:
+        """Delete an entry from target unless target's version of it wins."""
+        incoming = _version(updated_at, True, None)
+        current = target.sync.get_entry(uid)
+        if current is not None:
+            entry_id, existing = current
+            if incoming <= _version(existing[1], False, existing[2:]):
+                return False
+        else:
+            entry_id = None
+            deleted_version = target.sync.get_deletion_version(uid)
+            if deleted_version is not None and incoming <= _version(deleted_version, True, None):
+                return False
+
+        target.entries.apply_synced_deletion(entry_id, uid, deleted_at, updated_at)
+        return True
+
+    @staticmethod
+    def _apply_mapping(target: _Side, record: Tuple) -> bool:
+        """Write a directory mapping to target unless target's version wins."""
+        existing = target.sync.get_mapping(record[0])
+        if existing is not None:
+            incoming = _version(record[1], False, [record[2], bool(record[3]), record[4]])
+            if incoming <= _version(existing[1], False, [existing[2], bool(existing[3]), existing[4]]):
+                return False
+
+        target.mappings.apply_synced(record)
+        return True
@@ -33,29 +33,34 @@ class TimerService:
         if Settings.OUT_WORK_TAG not in tags:
             tags.append(Settings.DEFAULT_WORK_TAG)
         
-        # Auto-detect project if not specified
+        # Detect before taking the write lock: detection may run git in a
+        # subprocess, and BEGIN IMMEDIATE would block every other writer
+        # for as long as that takes
+        detection_method = None
         if not project:
             project, detection_method = detect_project_from_directory(self.directory_repo)
-            
+        else:
+            project = sanitize_project_name(project)
+
+        # Map and create in one unit of work on the shared connection
+        with self.time_repo.db.transaction():
             # Save auto-detected mapping if it's not already stored
-            if detection_method != 'stored_mapping':
+            if detection_method not in (None, 'stored_mapping'):
                 self.directory_repo.create(
                     directory_path=Path.cwd(),
                     project_name=project,
                     auto_detected=True,
                     detection_method=detection_method
                 )
-        else:
-            project = sanitize_project_name(project)
-        
-        # Create the timer entry
-        entry_id = self.time_repo.create(
-            project=project,
-            sub_project=sub_project,
-            tags=tags,
-            directory=str(Path.cwd()),
-            expected_duration=expected_duration
-        )
+
+            # Create the timer entry
+            entry_id = self.time_repo.create(
+                project=project,
+                sub_project=sub_project,
+                tags=tags,
+                directory=str(Path.cwd()),
+                expected_duration=expected_duration
+            )
         
         # Start alert daemon if expected duration is set
         if expected_duration:
@@ -70,8 +75,16 @@ class TimerService:
         if active:
             # Stop alert daemon if one exists
             stop_alert_daemon(active.id)
-        
-        return self.time_repo.stop_active()
+
+        duration = self.time_repo.stop_active()
+
+        # Fold the WAL back into the database now the session is written. This
+        # runs inline (start also stops), so checkpoint() never waits on
+        # other connections and gives up on a busy database instead
+        if duration is not None:
+            self.time_repo.db.checkpoint()
+
+        return duration
     
     def pause_timer(self) -> Optional[int]:
         """Pause current timer session and return elapsed duration."""
@@ -110,7 +123,7 @@ class TimerService:
             
             updates = {
                 'duration': new_duration,
-                'end_time': new_end_time.isoformat()
+                'end_time': new_end_time
             }
             
             return self.time_repo.update(entry_id, updates)
@@ -1,75 +1,176 @@
+import os
 import sqlite3
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, Any
 from contextlib import contextmanager
+from urllib.request import pathname2url
 
 from ..config.paths import Paths
 from ..config.settings import Settings
+from .migrations import migrate
+
+def get_storage_profile_name() -> str:
+    """Get the active storage profile name, honouring the environment override."""
+    name = os.environ.get(Settings.DB_STORAGE_PROFILE_ENV, '').strip().lower()
+    if name in Settings.DB_STORAGE_PROFILES:
+        return name
+    return Settings.DB_STORAGE_PROFILE
 
 class Database:
-    """Database connection and initialization."""
-    
-    def __init__(self):
-        self.db_path = Paths.get_db_path()
-        self.init_db()
-    
+    """Database connection and initialization.
+
+    Each thread lazily opens one connection on first use and keeps it for the
+    lifetime of the Database, so repositories created from the same instance
+    share the connection, its prepared-statement cache and any transaction
+    opened with ``transaction()``.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path or Paths.get_db_path()
+        self.storage_profile = get_storage_profile_name()
+        self._local = threading.local()
+
     def init_db(self):
-        """Initialize database with required tables."""
+        """Bring the database schema up to date.
+
+        Migrations only run when the stored schema version is behind, so an
+        up-to-date database costs a single ``PRAGMA user_version`` read.
+        """
+        migrate(self._get_thread_connection())
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a new connection configured for the active storage profile."""
+        # Autocommit mode: reads never hold a transaction open, writes are
+        # grouped explicitly through transaction().
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=Settings.DB_TIMEOUT,
+            isolation_level=None,
+            cached_statements=Settings.DB_STATEMENT_CACHE_SIZE,
+        )
+        try:
+            self._apply_storage_profile(conn)
+            migrate(conn)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _get_thread_connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        local = self._local
+        # A forked child must not share its parent's SQLite handle
+        if getattr(local, 'conn', None) is None or local.pid != os.getpid():
+            local.conn = self._open_connection()
+            local.pid = os.getpid()
+            local.depth = 0
+        return local.conn
+
+    def close(self):
+        """Close this thread's connection, if one is open."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local.conn = None
+
+    @property
+    def profile(self) -> Dict[str, Any]:
+        """Get the pragma settings of the active storage profile."""
+        return Settings.DB_STORAGE_PROFILES[self.storage_profile]
+
+    def _apply_storage_profile(self, conn: sqlite3.Connection):
+        """Apply the active storage profile's pragmas to a new connection."""
+        profile = self.profile
+        # journal_mode is persistent in the file; setting it to the current
+        # mode is a no-op, so this only takes a lock when the profile changes.
+        conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+        conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+        conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+        conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+        conn.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+        conn.execute(f"PRAGMA wal_autocheckpoint = {int(profile['wal_autocheckpoint'])}")
+
+    def checkpoint(self, mode: Optional[str] = None) -> Optional[tuple]:
+        """Run a WAL checkpoint and return SQLite's (busy, log, checkpointed) result.
+
+        Defaults to the storage profile's checkpoint mode. Does nothing when
+        the profile disables checkpointing or the database is not in WAL mode.
+        Never waits on other connections: if readers or writers are busy the
+        checkpoint does what it can (busy is 1) and the rest is left to the
+        next checkpoint or SQLite's wal_autocheckpoint.
+        """
+        mode = mode or self.profile['checkpoint_mode']
+        if not mode or self.profile['journal_mode'].upper() != 'WAL':
+            return None
+
         with self.get_connection() as conn:
-            # Time entries table
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS time_entries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    project TEXT NOT NULL,
-                    sub_project TEXT,
-                    tags TEXT,
-                    start_time TIMESTAMP NOT NULL,
-                    end_time TIMESTAMP,
-                    duration INTEGER,
-                    directory TEXT NOT NULL,
-                    status TEXT DEFAULT 'active',
-                    paused_duration INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Add status and paused_duration columns if they don't exist (for existing databases)
-            self._add_column_if_not_exists(conn, 'time_entries', 'status', 'TEXT DEFAULT "active"')
-            self._add_column_if_not_exists(conn, 'time_entries', 'paused_duration', 'INTEGER DEFAULT 0')
-            self._add_column_if_not_exists(conn, 'time_entries', 'expected_duration', 'INTEGER')
-            
-            # Directory mappings table
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS directory_mappings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    directory_path TEXT UNIQUE NOT NULL,
-                    project_name TEXT NOT NULL,
-                    auto_detected BOOLEAN DEFAULT TRUE,
-                    detection_method TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            conn.commit()
-    
-    def _add_column_if_not_exists(self, conn, table_name: str, column_name: str, column_definition: str):
-        """Add a column to a table if it doesn't already exist."""
-        cursor = conn.cursor()
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        if column_name not in columns:
+            if conn.in_transaction:
+                return None
+            # FULL, RESTART and TRUNCATE would otherwise sit in the busy
+            # handler for up to DB_TIMEOUT while another process reads
+            conn.execute("PRAGMA busy_timeout = 0")
             try:
-                conn.execute(f'ALTER TABLE {table_name} ADD COLUMN {column_name} {column_definition}')
-            except sqlite3.OperationalError as e:
-                # If still fails, print the error for debugging
-                print(f"Failed to add column {column_name}: {e}")
-    
+                return conn.execute(f"PRAGMA wal_checkpoint({mode.upper()})").fetchone()
+            finally:
+                conn.execute(f"PRAGMA busy_timeout = {int(Settings.DB_TIMEOUT * 1000)}")
+
     @contextmanager
     def get_connection(self):
-        """Get database connection with automatic cleanup."""
-        conn = sqlite3.connect(self.db_path, timeout=Settings.DB_TIMEOUT)
+        """Get this thread's shared database connection."""
+        yield self._get_thread_connection()
+
+    @contextmanager
+    def read_connection(self):
+        """Open a short-lived read-only connection, e.g. for a worker thread.
+
+        Unlike the thread's shared connection it skips migrations and the
+        write-side pragmas; the schema must already be up to date, which
+        any use of the shared connection guarantees.
+        """
+        conn = sqlite3.connect(
+            f"file:{pathname2url(str(Path(self.db_path).resolve()))}?mode=ro",
+            uri=True,
+            timeout=Settings.DB_TIMEOUT,
+            isolation_level=None,
+        )
         try:
+            profile = self.profile
+            conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+            conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+            conn.execute(f"PRAGMA temp_store = {profile['temp_store']}")
             yield conn
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Run a unit of work in a single write transaction.
+
+        Commits on success and rolls back on any exception. Nested calls join
+        the outermost transaction, so repository methods can be composed into
+        larger units of work by the caller.
+        """
+        conn = self._get_thread_connection()
+        local = self._local
+
+        if local.depth:
+            local.depth += 1
+            try:
+                yield conn
+            finally:
+                local.depth -= 1
+            return
+
+        # Take the write lock immediately so read-then-write sequences
+        # cannot be invalidated by another writer.
+        conn.execute('BEGIN IMMEDIATE')
+        local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            local.depth = 0
+            conn.execute('ROLLBACK')
+            raise
+        local.depth = 0
+        conn.execute('COMMIT')
@@ -0,0 +1,424 @@
+"""Versioned schema migrations driven by ``PRAGMA user_version``."""
+
+import json
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+
+def _add_column_if_not_exists(conn: sqlite3.Connection, table_name: str, column_name: str, column_definition: str):
+    """Add a column to a table if it doesn't already exist."""
+    cursor = conn.execute(f"PRAGMA table_info({table_name})")
+    columns = [column[1] for column in cursor.fetchall()]
+
+    if column_name not in columns:
+        conn.execute(f'ALTER TABLE {table_name} ADD COLUMN {column_name} {column_definition}')
+
+
+def _create_initial_schema(conn: sqlite3.Connection):
+    """Create the base tables, upgrading databases created before versioning."""
+    # Time entries table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS time_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project TEXT NOT NULL,
+            sub_project TEXT,
+            tags TEXT,
+            start_time TIMESTAMP NOT NULL,
+            end_time TIMESTAMP,
+            duration INTEGER,
+            directory TEXT NOT NULL,
+            status TEXT DEFAULT 'active',
+            paused_duration INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Unversioned databases may predate these columns
+    _add_column_if_not_exists(conn, 'time_entries', 'status', "TEXT DEFAULT 'active'")
+    _add_column_if_not_exists(conn, 'time_entries', 'paused_duration', 'INTEGER DEFAULT 0')
+    _add_column_if_not_exists(conn, 'time_entries', 'expected_duration', 'INTEGER')
+
+    # Directory mappings table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS directory_mappings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            directory_path TEXT UNIQUE NOT NULL,
+            project_name TEXT NOT NULL,
+            auto_detected BOOLEAN DEFAULT TRUE,
+            detection_method TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _add_time_entry_indexes(conn: sqlite3.Connection):
+    """Index the columns that reports and status lookups filter on."""
+    # Date ranges are served by half-open start_time range predicates
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_time_entries_start_time ON time_entries (start_time)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_time_entries_project ON time_entries (project, sub_project)')
+
+    # At most one entry is active or paused at a time, so these partial
+    # indexes stay tiny and make status lookups independent of history size.
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_time_entries_active
+        ON time_entries (start_time) WHERE status = 'active'
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_time_entries_paused
+        ON time_entries (start_time) WHERE status = 'paused'
+    ''')
+
+
+def _create_entry_tags(conn: sqlite3.Connection):
+    """Move tags from the JSON column into a normalized entry_tags table."""
+    # The primary key serves entry -> tags lookups in tag order, the
+    # secondary index serves tag -> entries filtering.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS entry_tags (
+            entry_id INTEGER NOT NULL REFERENCES time_entries (id),
+            position INTEGER NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (entry_id, position)
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_entry_tags_tag ON entry_tags (tag, entry_id)')
+
+    cursor = conn.execute("SELECT id, tags FROM time_entries WHERE tags IS NOT NULL AND tags != ''")
+    while True:
+        rows = cursor.fetchmany(1000)
+        if not rows:
+            break
+
+        tag_rows = []
+        for entry_id, tags_json in rows:
+            try:
+                tags = json.loads(tags_json)
+            except ValueError:
+                continue
+            if isinstance(tags, list):
+                # Older versions stored repeated tags; keep the first of each
+                tag_rows.extend(
+                    (entry_id, position, tag)
+                    for position, tag in enumerate(dict.fromkeys(str(tag) for tag in tags))
+                )
+        conn.executemany(
+            'INSERT OR IGNORE INTO entry_tags (entry_id, position, tag) VALUES (?, ?, ?)',
+            tag_rows,
+        )
+
+    # entry_tags is now the only source of truth; drop the stale copies
+    conn.execute('UPDATE time_entries SET tags = NULL WHERE tags IS NOT NULL')
+
+
+def _rebuild_table(conn: sqlite3.Connection, table_name: str, create_sql: str, copy_sql: str):
+    """Rebuild a table with a new definition, keeping its AUTOINCREMENT counter.
+
+    ``create_sql`` must create ``<table_name>_new``; ``copy_sql`` fills it from
+    the old table. Indexes on the old table are dropped with it and must be
+    recreated by the caller.
+    """
+    new_table = f'{table_name}_new'
+    row = conn.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table_name,)).fetchone()
+
+    conn.execute(f'DROP TABLE IF EXISTS {new_table}')
+    conn.execute(create_sql)
+    conn.execute(copy_sql)
+    conn.execute(f'DROP TABLE {table_name}')
+    conn.execute(f'ALTER TABLE {new_table} RENAME TO {table_name}')
+
+    if row is not None:
+        conn.execute('UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?', (row[0], table_name))
+
+
+def _create_time_entry_indexes(conn: sqlite3.Connection):
+    """Create the current set of time_entries indexes."""
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_time_entries_start_time ON time_entries (start_time)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_time_entries_project ON time_entries (project_id, sub_project_id)')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_time_entries_active
+        ON time_entries (start_time) WHERE status = 'active'
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_time_entries_paused
+        ON time_entries (start_time) WHERE status = 'paused'
+    ''')
+
+
+def _intern_project_names(conn: sqlite3.Connection):
+    """Replace project/sub_project text with keys into a projects dictionary."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL
+        )
+    ''')
+    conn.execute('''
+        INSERT OR IGNORE INTO projects (name)
+        SELECT project FROM time_entries
+        UNION
+        SELECT sub_project FROM time_entries WHERE sub_project IS NOT NULL AND sub_project != ''
+    ''')
+
+    # The legacy tags column has been empty since entry_tags; drop it too
+    _rebuild_table(conn, 'time_entries', '''
+        CREATE TABLE time_entries_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL REFERENCES projects (id),
+            sub_project_id INTEGER REFERENCES projects (id),
+            start_time TIMESTAMP NOT NULL,
+            end_time TIMESTAMP,
+            duration INTEGER,
+            directory TEXT NOT NULL,
+            status TEXT DEFAULT 'active',
+            paused_duration INTEGER DEFAULT 0,
+            expected_duration INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''', '''
+        INSERT INTO time_entries_new
+            (id, project_id, sub_project_id, start_time, end_time, duration, directory,
+             status, paused_duration, expected_duration, created_at)
+        SELECT e.id, p.id, sp.id, e.start_time, e.end_time, e.duration, e.directory,
+               e.status, e.paused_duration, e.expected_duration, e.created_at
+        FROM time_entries e
+        JOIN projects p ON p.name = e.project
+        LEFT JOIN projects sp ON sp.name = e.sub_project
+    ''')
+    _create_time_entry_indexes(conn)
+
+
+def _iso_to_epoch(value) -> Optional[int]:
+    """Convert a stored ISO local timestamp to epoch seconds (SQL function)."""
+    if value is None or isinstance(value, int):
+        return value
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def _store_epoch_timestamps(conn: sqlite3.Connection):
+    """Store start/end/created times as integer epoch seconds instead of ISO text."""
+    conn.create_function('iso_to_epoch', 1, _iso_to_epoch)
+
+    # start_time/end_time were naive local ISO strings; created_at was
+    # SQLite's CURRENT_TIMESTAMP, i.e. UTC text, which strftime reads as UTC.
+    _rebuild_table(conn, 'time_entries', '''
+        CREATE TABLE time_entries_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL REFERENCES projects (id),
+            sub_project_id INTEGER REFERENCES projects (id),
+            start_time INTEGER NOT NULL,
+            end_time INTEGER,
+            duration INTEGER,
+            directory TEXT NOT NULL,
+            status TEXT DEFAULT 'active',
+            paused_duration INTEGER DEFAULT 0,
+            expected_duration INTEGER,
+            created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+        )
+    ''', '''
+        INSERT INTO time_entries_new
+            (id, project_id, sub_project_id, start_time, end_time, duration, directory,
+             status, paused_duration, expected_duration, created_at)
+        SELECT id, project_id, sub_project_id, iso_to_epoch(start_time), iso_to_epoch(end_time),
+               duration, directory, status, paused_duration, expected_duration,
+               CAST(strftime('%s', created_at) AS INTEGER)
+        FROM time_entries
+    ''')
+    _create_time_entry_indexes(conn)
+
+
+def _create_daily_rollups(conn: sqlite3.Connection):
+    """Create and populate the per-day rollup of completed entries."""
+    # sub_project_id 0 means "no sub-project" and tag '' means "all entries",
+    # so every key column can be part of the primary key.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_rollups (
+            day TEXT NOT NULL,
+            project_id INTEGER NOT NULL,
+            sub_project_id INTEGER NOT NULL DEFAULT 0,
+            tag TEXT NOT NULL DEFAULT '',
+            entries INTEGER NOT NULL,
+            duration INTEGER NOT NULL,
+            PRIMARY KEY (day, project_id, sub_project_id, tag)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_daily_rollups_tag ON daily_rollups (tag, day)')
+
+    conn.execute('DELETE FROM daily_rollups')
+    conn.execute('''
+        INSERT INTO daily_rollups (day, project_id, sub_project_id, tag, entries, duration)
+        SELECT date(start_time, 'unixepoch', 'localtime') AS day, project_id,
+               COALESCE(sub_project_id, 0) AS sub_key, '', COUNT(*), COALESCE(SUM(duration), 0)
+        FROM time_entries
+        WHERE end_time IS NOT NULL
+        GROUP BY day, project_id, sub_key
+    ''')
+    conn.execute('''
+        INSERT INTO daily_rollups (day, project_id, sub_project_id, tag, entries, duration)
+        SELECT date(e.start_time, 'unixepoch', 'localtime') AS day, e.project_id,
+               COALESCE(e.sub_project_id, 0) AS sub_key, t.tag, COUNT(*), COALESCE(SUM(e.duration), 0)
+        FROM time_entries e
+        JOIN (SELECT DISTINCT entry_id, tag FROM entry_tags) t ON t.entry_id = e.id
+        WHERE e.end_time IS NOT NULL
+        GROUP BY day, e.project_id, sub_key, t.tag
+    ''')
+
+
+def _add_change_tracking(conn: sqlite3.Connection):
+    """Track a change sequence on time entries and keep tombstones for deletions."""
+    # Key/value store for database-wide counters; 'change_seq' is the last
+    # sequence number handed out
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value
+        ) WITHOUT ROWID
+    ''')
+
+    # Existing entries count as changed once, at sequence 1
+    _add_column_if_not_exists(conn, 'time_entries', 'change_seq', 'INTEGER')
+    conn.execute('UPDATE time_entries SET change_seq = 1 WHERE change_seq IS NULL')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_time_entries_change_seq ON time_entries (change_seq)')
+    conn.execute('''
+        INSERT OR IGNORE INTO meta (key, value)
+        SELECT 'change_seq', EXISTS (SELECT 1 FROM time_entries)
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS entry_tombstones (
+            entry_id INTEGER PRIMARY KEY,
+            change_seq INTEGER NOT NULL,
+            deleted_at INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_entry_tombstones_change_seq ON entry_tombstones (change_seq)')
+
+
+def _add_sync_identity(conn: sqlite3.Connection):
+    """Give rows stable identities and modification times for syncing databases."""
+    conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('database_id', lower(hex(randomblob(16))))")
+
+    # Entries get a globally unique ID that survives being copied between
+    # databases, and the time of their last change for conflict resolution
+    _add_column_if_not_exists(conn, 'time_entries', 'uid', 'TEXT')
+    _add_column_if_not_exists(conn, 'time_entries', 'updated_at', 'INTEGER')
+    conn.execute('UPDATE time_entries SET uid = lower(hex(randomblob(16))) WHERE uid IS NULL')
+    conn.execute('UPDATE time_entries SET updated_at = COALESCE(end_time, start_time) WHERE updated_at IS NULL')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_time_entries_uid ON time_entries (uid)')
+
+    # Tombstones are keyed by uid, as a synced deletion may name an entry
+    # that never existed locally
+    _rebuild_table(conn, 'entry_tombstones', '''
+        CREATE TABLE entry_tombstones_new (
+            uid TEXT PRIMARY KEY,
+            entry_id INTEGER,
+            change_seq INTEGER NOT NULL,
+            deleted_at INTEGER NOT NULL
+        )
+    ''', '''
+        INSERT INTO entry_tombstones_new (uid, entry_id, change_seq, deleted_at)
+        SELECT 'deleted-' || entry_id, entry_id, change_seq, deleted_at FROM entry_tombstones
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_entry_tombstones_change_seq ON entry_tombstones (change_seq)')
+
+    # Directory mappings are keyed by path and tracked like entries
+    _add_column_if_not_exists(conn, 'directory_mappings', 'change_seq', 'INTEGER')
+    _add_column_if_not_exists(conn, 'directory_mappings', 'updated_at', 'INTEGER')
+    conn.execute('''
+        UPDATE directory_mappings
+        SET change_seq = 1, updated_at = COALESCE(CAST(strftime('%s', created_at) AS INTEGER), 0)
+        WHERE change_seq IS NULL
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_directory_mappings_change_seq ON directory_mappings (change_seq)')
+    conn.execute('''
+        UPDATE meta SET value = MAX(value, 1)
+        WHERE key = 'change_seq' AND EXISTS (SELECT 1 FROM directory_mappings)
+    ''')
+
+    # Per-peer watermarks: the last local sequence sent to the peer and the
+    # last peer sequence received from it
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sync_peers (
+            peer_id TEXT PRIMARY KEY,
+            sent_seq INTEGER NOT NULL DEFAULT 0,
+            received_seq INTEGER NOT NULL DEFAULT 0,
+            synced_at INTEGER
+        )
+    ''')
+
+
+def _use_millisecond_versions(conn: sqlite3.Connection):
+    """Store row versions (updated_at) in milliseconds, and version tombstones too."""
+    conn.execute('UPDATE time_entries SET updated_at = updated_at * 1000')
+    conn.execute('UPDATE directory_mappings SET updated_at = updated_at * 1000')
+    _add_column_if_not_exists(conn, 'entry_tombstones', 'updated_at', 'INTEGER')
+    conn.execute('UPDATE entry_tombstones SET updated_at = deleted_at * 1000')
+
+
+def _dedupe_entry_tags(conn: sqlite3.Connection):
+    """Drop repeated tags on an entry and make (tag, entry) unique."""
+    # Databases migrated before the tag backfill deduplicated may hold the
+    # same tag twice for one entry, double-counting it in tag reports
+    conn.execute('''
+        DELETE FROM entry_tags
+        WHERE EXISTS (
+            SELECT 1 FROM entry_tags earlier
+            WHERE earlier.entry_id = entry_tags.entry_id
+              AND earlier.tag = entry_tags.tag
+              AND earlier.position < entry_tags.position
+        )
+    ''')
+    # The unique index replaces the plain tag -> entries index
+    conn.execute('DROP INDEX IF EXISTS idx_entry_tags_tag')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_entry_tags_tag ON entry_tags (tag, entry_id)')
+
+
+# Ordered (version, migration) pairs. Append new migrations with the next
+# version number; never renumber or edit a migration that has shipped.
+MIGRATIONS: List[Tuple[int, Callable[[sqlite3.Connection], None]]] = [
+    (1, _create_initial_schema),
+    (2, _add_time_entry_indexes),
+    (3, _create_entry_tags),
+    (4, _intern_project_names),
+    (5, _store_epoch_timestamps),
+    (6, _create_daily_rollups),
+    (7, _add_change_tracking),
+    (8, _add_sync_identity),
+    (9, _use_millisecond_versions),
+    (10, _dedupe_entry_tags),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version stored in the database header."""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations in order and return the resulting version.
+
+    The common case of an up-to-date database costs a single pragma read and
+    takes no lock beyond the shared read lock for that read.
+    """
+    current = get_schema_version(conn)
+    if current >= LATEST_VERSION:
+        return current
+
+    # Take the write lock up front and re-check, another process may have
+    # migrated the database while we were waiting for it.
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        current = get_schema_version(conn)
+        for version, migration in MIGRATIONS:
+            if version > current:
+                migration(conn)
+                conn.execute(f'PRAGMA user_version = {version}')
+                current = version
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+    return current
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
+
+from ..utils.date_utils import from_timestamp
+from .queries import split_tags
 
 @dataclass
 class TimeEntry:
@@ -35,6 +38,104 @@ class TimeEntry:
             return f"{self.project}:{self.sub_project}"
         return self.project
 
+_UNSET = object()
+
+class TimeEntryRow:
+    """Compact, read-only TimeEntry view over a raw query row for bulk reads.
+
+    Holds the row tuple as fetched and only parses tags, timestamps and
+    project names when they are first accessed, so callers that read just
+    ``duration`` and ``project`` never pay for the rest. Exposes the same
+    attributes and properties as TimeEntry.
+    """
+
+    __slots__ = ('_row', '_project_name', '_tags', '_start_time', '_end_time')
+
+    def __init__(self, row: Tuple, project_name: Callable[[Optional[int]], Optional[str]]):
+        # row: (id, project_id, sub_project_id, tags, start_time, end_time,
+        #       duration, directory, status, paused_duration, expected_duration)
+        self._row = row
+        self._project_name = project_name
+        self._tags = _UNSET
+        self._start_time = _UNSET
+        self._end_time = _UNSET
+
+    @property
+    def id(self) -> int:
+        return self._row[0]
+
+    @property
+    def project(self) -> str:
+        return self._project_name(self._row[1])
+
+    @property
+    def sub_project(self) -> Optional[str]:
+        return self._project_name(self._row[2])
+
+    @property
+    def tags(self) -> List[str]:
+        if self._tags is _UNSET:
+            self._tags = split_tags(self._row[3])
+        return self._tags
+
+    @property
+    def start_time(self) -> datetime:
+        if self._start_time is _UNSET:
+            self._start_time = from_timestamp(self._row[4])
+        return self._start_time
+
+    @property
+    def end_time(self) -> Optional[datetime]:
+        if self._end_time is _UNSET:
+            end_timestamp = self._row[5]
+            self._end_time = from_timestamp(end_timestamp) if end_timestamp is not None else None
+        return self._end_time
+
+    @property
+    def duration(self) -> Optional[int]:
+        return self._row[6]
+
+    @property
+    def directory(self) -> str:
+        return self._row[7]
+
+    @property
+    def status(self) -> str:
+        return self._row[8] or 'active'
+
+    @property
+    def paused_duration(self) -> int:
+        return self._row[9] or 0
+
+    @property
+    def expected_duration(self) -> Optional[int]:
+        return self._row[10]
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        return None
+
+    @property
+    def is_active(self) -> bool:
+        """Check if this entry is currently active (no end time)."""
+        return self._row[5] is None and self.status == 'active'
+
+    @property
+    def is_paused(self) -> bool:
+        """Check if this entry is currently paused."""
+        return self.status == 'paused'
+
+    @property
+    def project_display(self) -> str:
+        """Get formatted project display string."""
+        sub_project = self.sub_project
+        if sub_project:
+            return f"{self.project}:{sub_project}"
+        return self.project
+
+    def __repr__(self) -> str:
+        return f"TimeEntryRow(id={self.id!r}, project={self.project!r}, duration={self.duration!r})"
+
 @dataclass
 class DirectoryMapping:
     """Represents a directory-to-project mapping."""
@@ -51,4 +152,25 @@ class ReportSummary:
     total_entries: int
     total_duration: int
     projects: dict
-    daily_totals: dict
\ No newline at end of file
+    daily_totals: dict
+    sources: Optional[dict] = None  # per-database totals for multi-database reports
+
+@dataclass
+class PivotTable:
+    """Totals grouped by one or more report dimensions."""
+    dimensions: List[str]
+    values: List[List[str]]  # ordered distinct labels per dimension
+    rows: List[Tuple[Tuple[str, ...], int, int]]  # (labels, entries, duration)
+
+@dataclass
+class ComparisonReport:
+    """Totals for a date range side by side with a comparison range.
+    
+    Each totals dict holds current_entries, current_duration,
+    previous_entries and previous_duration.
+    """
+    current_range: Tuple[str, str]
+    previous_range: Tuple[str, str]
+    totals: dict
+    projects: dict
+    tags: dict
@@ -0,0 +1,95 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.date_utils import date_to_timestamp, next_day
+
+# Tags live one row per tag in entry_tags; reads fold them back into a single
+# column joined with the ASCII unit separator, in their original order.
+TAG_SEPARATOR = '\x1f'
+
+ENTRY_COLUMNS = '''id, project_id, sub_project_id,
+    (SELECT group_concat(tag, char(31)) FROM entry_tags WHERE entry_id = time_entries.id) AS tags,
+    start_time, end_time, duration, directory, status, paused_duration, expected_duration'''
+
+# Group-by expressions for pivot reports, all evaluated on local start time.
+# ISO weeks are labelled by the year and ordinal of their Thursday.
+_LOCAL_START = "start_time, 'unixepoch', 'localtime'"
+_ISO_THURSDAY = f"date({_LOCAL_START}, '-3 days', 'weekday 4')"
+
+PIVOT_DIMENSIONS = {
+    'project': 'project_id',
+    'sub_project': 'sub_project_id',
+    'tag': 'entry_tags.tag',
+    'directory': 'directory',
+    'weekday': f"(CAST(strftime('%w', {_LOCAL_START}) AS INTEGER) + 6) % 7",
+    'hour': f"CAST(strftime('%H', {_LOCAL_START}) AS INTEGER)",
+    'day': f"date({_LOCAL_START})",
+    'week': f"strftime('%Y', {_ISO_THURSDAY}) || '-W' || "
+            f"printf('%02d', (CAST(strftime('%j', {_ISO_THURSDAY}) AS INTEGER) - 1) / 7 + 1)",
+    'month': f"strftime('%Y-%m', {_LOCAL_START})",
+    'quarter': f"strftime('%Y', {_LOCAL_START}) || '-Q' || "
+               f"((CAST(strftime('%m', {_LOCAL_START}) AS INTEGER) + 2) / 3)",
+    'year': f"strftime('%Y', {_LOCAL_START})",
+}
+
+def split_tags(tags_str: Optional[str]) -> List[str]:
+    """Split a folded tags column back into a tag list."""
+    return tags_str.split(TAG_SEPARATOR) if tags_str else []
+
+def build_filter_clause(filters: Optional[Dict[str, Any]] = None) -> Tuple[str, List[Any]]:
+    """Build the WHERE clause and parameters for completed time entries.
+
+    Every predicate compares a bare column so the time_entries indexes can
+    serve it; date bounds become a half-open range of epoch seconds over
+    start_time.
+    """
+    clauses = ['end_time IS NOT NULL']
+    params: List[Any] = []
+
+    if filters:
+        # Names resolve through the unique projects.name index, the entry
+        # rows are then matched on integer keys
+        if filters.get('projects'):
+            project_placeholders = ','.join(['?' for _ in filters['projects']])
+            clauses.append(f'project_id IN (SELECT id FROM projects WHERE name IN ({project_placeholders}))')
+            params.extend(filters['projects'])
+
+        if filters.get('sub_projects'):
+            sub_project_placeholders = ','.join(['?' for _ in filters['sub_projects']])
+            clauses.append(f'sub_project_id IN (SELECT id FROM projects WHERE name IN ({sub_project_placeholders}))')
+            params.extend(filters['sub_projects'])
+
+        if filters.get('tags'):
+            # Entries carrying every requested tag: an intersection over the
+            # (tag, entry_id) index
+            tags = list(dict.fromkeys(filters['tags']))
+            tag_placeholders = ','.join(['?' for _ in tags])
+            clauses.append(
+                f'id IN (SELECT entry_id FROM entry_tags WHERE tag IN ({tag_placeholders}) '
+                'GROUP BY entry_id HAVING COUNT(DISTINCT tag) = ?)'
+            )
+            params.extend(tags)
+            params.append(len(tags))
+
+        if filters.get('from_date'):
+            clauses.append('start_time >= ?')
+            params.append(date_to_timestamp(filters['from_date']))
+
+        if filters.get('to_date'):
+            clauses.append('start_time < ?')
+            params.append(date_to_timestamp(next_day(filters['to_date'])))
+
+        if filters.get('where'):
+            # Imported here: the expression compiler builds on this module
+            from .query_language import compile_where
+            where_sql, where_params = compile_where(filters['where'])
+            clauses.append(f'({where_sql})')
+            params.extend(where_params)
+
+    return ' AND '.join(clauses), params
+
+_TABLE_NAMES = re.compile(r'(?<![.\w])(time_entries|entry_tags|projects|daily_rollups)\b')
+
+def qualify_tables(sql: str, schema: str) -> str:
+    """Prefix the timetrack table names in generated SQL with an attached schema name."""
+    return _TABLE_NAMES.sub(rf'{schema}.\1', sql)
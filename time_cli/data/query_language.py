@@ -0,0 +1,235 @@
+"""Filter expressions for ``report --where``, compiled to parameterized SQL.
+
+Grammar (keywords are case-insensitive)::
+
+    expr       := term ('or' term)*
+    term       := factor ('and' factor)*
+    factor     := 'not' factor | '(' expr ')' | comparison
+    comparison := FIELD OP VALUE | FIELD ['not'] 'in' '(' VALUE (',' VALUE)* ')'
+    OP         := ':' | '=' | '!=' | '<' | '<=' | '>' | '>='
+
+Fields are project, sub_project, tag, directory, duration, date, weekday
+and hour. Text values may be quoted and may use * and ? wildcards; ':'
+means equality. For example::
+
+    project:api and (tag:review or tag:oncall) and duration>45m and weekday in (sat,sun)
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+from ..core.duration import parse_duration_input
+from ..utils.date_utils import date_to_timestamp, next_day
+from .queries import PIVOT_DIMENSIONS
+
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+_FIELD_ALIASES = {
+    'project': 'project',
+    'sub_project': 'sub_project', 'subproject': 'sub_project', 'sub-project': 'sub_project',
+    'tag': 'tag', 'label': 'tag',
+    'directory': 'directory', 'dir': 'directory',
+    'duration': 'duration',
+    'date': 'date',
+    'weekday': 'weekday', 'day': 'weekday',
+    'hour': 'hour',
+}
+
+_TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<op><=|>=|!=|[:=<>(),])
+      | "(?P<dquoted>[^"]*)"
+      | '(?P<squoted>[^']*)'
+      | (?P<word>[^\s:=<>!(),"']+)
+    )''', re.VERBOSE)
+
+class QueryError(ValueError):
+    """Raised for an invalid --where expression."""
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    """Split an expression into (kind, text) tokens; kind is 'op', 'word' or 'string'."""
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_PATTERN.match(expression, position)
+        if not match:
+            raise QueryError(f"Unexpected character at position {position + 1}: {expression[position:].strip()[:10]!r}")
+        if match.group('op') is not None:
+            tokens.append(('op', match.group('op')))
+        elif match.group('word') is not None:
+            tokens.append(('word', match.group('word')))
+        else:
+            text = match.group('dquoted') if match.group('dquoted') is not None else match.group('squoted')
+            tokens.append(('string', text))
+        position = match.end()
+    return tokens
+
+class _Parser:
+    """Recursive-descent parser emitting SQL fragments and their parameters."""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.index = 0
+        self.params: List[Any] = []
+
+    def parse(self) -> str:
+        """Parse the whole token stream into one SQL condition."""
+        if not self.tokens:
+            raise QueryError("Empty --where expression")
+        sql = self._expr()
+        if self.index < len(self.tokens):
+            raise QueryError(f"Unexpected '{self.tokens[self.index][1]}'")
+        return sql
+
+    def _peek_keyword(self, *keywords: str) -> bool:
+        """Check whether the next token is one of the given bare keywords."""
+        if self.index >= len(self.tokens):
+            return False
+        kind, text = self.tokens[self.index]
+        return kind == 'word' and text.lower() in keywords
+
+    def _peek_op(self, *ops: str) -> bool:
+        """Check whether the next token is one of the given operators."""
+        return self.index < len(self.tokens) and self.tokens[self.index] in [('op', op) for op in ops]
+
+    def _next(self, description: str) -> Tuple[str, str]:
+        """Consume the next token, failing with what was expected at the end of input."""
+        if self.index >= len(self.tokens):
+            raise QueryError(f"Expected {description} at end of expression")
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def _expect_op(self, op: str):
+        """Consume a specific operator token."""
+        kind, text = self._next(f"'{op}'")
+        if (kind, text) != ('op', op):
+            raise QueryError(f"Expected '{op}' but found '{text}'")
+
+    def _expr(self) -> str:
+        parts = [self._term()]
+        while self._peek_keyword('or'):
+            self.index += 1
+            parts.append(self._term())
+        return parts[0] if len(parts) == 1 else '(' + ' OR '.join(parts) + ')'
+
+    def _term(self) -> str:
+        parts = [self._factor()]
+        while self._peek_keyword('and'):
+            self.index += 1
+            parts.append(self._factor())
+        return parts[0] if len(parts) == 1 else '(' + ' AND '.join(parts) + ')'
+
+    def _factor(self) -> str:
+        if self._peek_keyword('not'):
+            self.index += 1
+            return f'NOT {self._factor()}'
+        if self._peek_op('('):
+            self.index += 1
+            sql = self._expr()
+            self._expect_op(')')
+            return sql
+        return self._comparison()
+
+    def _comparison(self) -> str:
+        kind, text = self._next("a field name")
+        field = _FIELD_ALIASES.get(text.lower()) if kind == 'word' else None
+        if field is None:
+            raise QueryError(f"Unknown field '{text}' (choose from: {', '.join(sorted(set(_FIELD_ALIASES.values())))})")
+
+        negate = False
+        if self._peek_keyword('not'):
+            self.index += 1
+            negate = True
+            if not self._peek_keyword('in'):
+                raise QueryError(f"Expected 'in' after '{text} not'")
+        if self._peek_keyword('in'):
+            self.index += 1
+            values = self._value_list()
+            sql = '(' + ' OR '.join(self._predicate(field, '=', value) for value in values) + ')'
+            return f'NOT {sql}' if negate else sql
+
+        kind, op = self._next(f"an operator after '{text}'")
+        if kind != 'op' or op not in (':', '=', '!=', '<', '<=', '>', '>='):
+            raise QueryError(f"Expected an operator after '{text}' but found '{op}'")
+        value = self._value()
+        op = '=' if op == ':' else op
+        if op == '!=':
+            return f'NOT {self._predicate(field, "=", value)}'
+        return self._predicate(field, op, value)
+
+    def _value(self) -> str:
+        kind, text = self._next("a value")
+        if kind == 'op':
+            raise QueryError(f"Expected a value but found '{text}'")
+        return text
+
+    def _value_list(self) -> List[str]:
+        self._expect_op('(')
+        values = [self._value()]
+        while self._peek_op(','):
+            self.index += 1
+            values.append(self._value())
+        self._expect_op(')')
+        return values
+
+    def _predicate(self, field: str, op: str, value: str) -> str:
+        """Compile one field comparison, keeping indexed columns bare."""
+        if field in ('project', 'sub_project', 'tag', 'directory'):
+            if op != '=':
+                raise QueryError(f"'{field}' only supports ':', '=', '!=' and 'in'")
+            match = 'GLOB' if any(c in value for c in '*?[') else '='
+            self.params.append(value)
+            if field == 'tag':
+                return f'id IN (SELECT entry_id FROM entry_tags WHERE tag {match} ?)'
+            if field == 'directory':
+                return f'directory {match} ?'
+            if field == 'sub_project':
+                # Entries without a sub-project must compare false, not NULL,
+                # or NOT would drop them too
+                return f'(sub_project_id IS NOT NULL AND sub_project_id IN (SELECT id FROM projects WHERE name {match} ?))'
+            return f'project_id IN (SELECT id FROM projects WHERE name {match} ?)'
+
+        if field == 'duration':
+            try:
+                seconds = parse_duration_input(value)
+            except ValueError:
+                raise QueryError(f"Invalid duration '{value}' (use formats like 45m, 1h30m, 5400s)")
+            self.params.append(seconds)
+            return f'duration {op} ?'
+
+        if field == 'date':
+            try:
+                start = date_to_timestamp(value)
+                end = date_to_timestamp(next_day(value))
+            except ValueError:
+                raise QueryError(f"Invalid date '{value}' (use YYYY-MM-DD)")
+            # Whole local days become half-open ranges on start_time
+            if op == '=':
+                self.params.extend([start, end])
+                return '(start_time >= ? AND start_time < ?)'
+            bound = {'<': start, '<=': end, '>': end, '>=': start}[op]
+            self.params.append(bound)
+            return f"start_time {'<' if op in ('<', '<=') else '>='} ?"
+
+        if field == 'weekday':
+            day = value.lower()[:3]
+            if day not in WEEKDAYS:
+                raise QueryError(f"Invalid weekday '{value}' (use mon, tue, ... sun)")
+            self.params.append(WEEKDAYS.index(day))
+            return f"{PIVOT_DIMENSIONS['weekday']} {op} ?"
+
+        # hour
+        if not value.isdigit() or int(value) > 23:
+            raise QueryError(f"Invalid hour '{value}' (use 0-23)")
+        self.params.append(int(value))
+        return f"{PIVOT_DIMENSIONS['hour']} {op} ?"
+
+@lru_cache(maxsize=64)
+def compile_where(expression: str) -> Tuple[str, Tuple[Any, ...]]:
+    """Compile a --where expression to an SQL condition and its parameters."""
+    parser = _Parser(_tokenize(expression))
+    sql = parser.parse()
+    return sql, tuple(parser.params)
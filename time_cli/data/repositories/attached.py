@@ -0,0 +1,94 @@
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.request import pathname2url
+
+from ...config.settings import Settings
+from ..migrations import LATEST_VERSION
+from ..queries import qualify_tables
+from .rollups import RollupRepository
+from .time_entries import TimeEntryRepository
+
+# Reports need epoch timestamps, interned project names and daily rollups
+MIN_REPORT_VERSION = 6
+
+class AttachedDatabaseRepository:
+    """Aggregates report rows across timetrack databases attached read-only.
+
+    The databases are attached to one in-memory connection and aggregated
+    by a single UNION ALL statement, each branch running the same query a
+    local report would (from the daily rollup when the filters allow) with
+    its tables qualified by the attached schema. Project keys differ
+    between databases, so names are resolved per source afterwards.
+    """
+
+    def aggregate_with_filters(self, sources: Sequence[Tuple[int, Path]],
+                               filters: Optional[Dict[str, Any]] = None) -> List[Tuple]:
+        """Aggregate up to REPORT_ATTACH_LIMIT (source index, path) databases.
+
+        Returns (source index, day, project, sub_project, entries, duration)
+        rows, one per source, local start day and project/sub-project pair.
+        """
+        if len(sources) > Settings.REPORT_ATTACH_LIMIT:
+            raise ValueError(f"At most {Settings.REPORT_ATTACH_LIMIT} databases can be attached at once")
+
+        if RollupRepository.can_serve(filters):
+            query, query_params = RollupRepository.aggregate_query(filters)
+        else:
+            query, query_params = TimeEntryRepository.aggregate_query(filters)
+
+        conn = sqlite3.connect('file::memory:', uri=True, timeout=Settings.DB_TIMEOUT)
+        try:
+            selects = []
+            params: List[Any] = []
+            names: Dict[int, Dict[int, str]] = {}
+            for position, (source, path) in enumerate(sources):
+                schema = f'source{position}'
+                self._attach(conn, schema, path)
+                names[source] = dict(conn.execute(f'SELECT id, name FROM {schema}.projects'))
+                selects.append(f'SELECT {source}, * FROM ({qualify_tables(query, schema)})')
+                params.extend(query_params)
+
+            rows = conn.execute(' UNION ALL '.join(selects), params).fetchall()
+        finally:
+            conn.close()
+
+        return [
+            (source, day, names[source].get(project_id), names[source].get(sub_project_id), entries, duration)
+            for source, day, project_id, sub_project_id, entries, duration in rows
+        ]
+
+    @staticmethod
+    def _read_only_uri(path: Path) -> str:
+        """Build a read-only SQLite URI for a database file."""
+        return f'file:{pathname2url(str(path.resolve()))}?mode=ro'
+
+    @staticmethod
+    def _attach(conn: sqlite3.Connection, schema: str, path: Path):
+        """Attach a database read-only, rejecting schemas this version cannot report on."""
+        try:
+            conn.execute(f'ATTACH DATABASE ? AS {schema}', (AttachedDatabaseRepository._read_only_uri(path),))
+            version = conn.execute(f'PRAGMA {schema}.user_version').fetchone()[0]
+            # Databases from before versioned migrations have the tables
+            # but still report user_version 0
+            legacy = version == 0 and conn.execute(
+                f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'time_entries'"
+            ).fetchone() is not None
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"Cannot read {path}: {e}")
+
+        if legacy:
+            raise ValueError(
+                f"{path} uses the legacy unversioned timetrack schema; open it once with this version "
+                f"of timetrack (or run its migrations) before using it with --db"
+            )
+        if version == 0:
+            raise ValueError(f"{path} is not a timetrack database")
+        if version < MIN_REPORT_VERSION:
+            raise ValueError(
+                f"{path} uses schema version {version}; upgrade it with a current version of timetrack first"
+            )
+        if version > LATEST_VERSION:
+            raise ValueError(
+                f"{path} uses schema version {version}, newer than this timetrack supports ({LATEST_VERSION})"
+            )
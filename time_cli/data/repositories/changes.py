@@ -0,0 +1,106 @@
+import time
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from ..database import Database
+
+class ChangeRepository:
+    """Repository for the time entry change sequence and deletion tombstones.
+
+    Every write to an entry stamps it with a new value from a database-wide
+    counter kept in the meta table, and deleting an entry leaves a
+    tombstone stamped the same way. Writers call mark_entries() or
+    record_deletion() inside the write's transaction, so a change and its
+    sequence number become visible together. Readers can then fetch
+    everything changed after a sequence number through the change_seq
+    indexes, in O(changes) rather than O(history).
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def next_seq(self) -> int:
+        """Allocate the next change sequence number."""
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'change_seq'")
+            return conn.execute("SELECT value FROM meta WHERE key = 'change_seq'").fetchone()[0]
+
+    def current_seq(self) -> int:
+        """Get the last allocated change sequence number."""
+        with self.db.get_connection() as conn:
+            return conn.execute("SELECT value FROM meta WHERE key = 'change_seq'").fetchone()[0]
+
+    @staticmethod
+    def clock() -> int:
+        """Get the current time in milliseconds, the unit of row versions (updated_at)."""
+        return int(time.time() * 1000)
+
+    def mark_entries(self, entry_ids: Sequence[int], updated_at: Optional[int] = None):
+        """Stamp entries as changed, with version updated_at.
+
+        By default each entry's version moves to now, or one past its
+        previous version if that is later (e.g. stamped by a peer whose
+        clock runs ahead), so a row's new version always beats the one it
+        replaces when databases are synced.
+        """
+        if not entry_ids:
+            return
+        with self.db.transaction() as conn:
+            seq = self.next_seq()
+            placeholders = ','.join(['?' for _ in entry_ids])
+            if updated_at is None:
+                version_sql, version_params = 'MAX(?, COALESCE(updated_at, 0) + 1)', [self.clock()]
+            else:
+                version_sql, version_params = '?', [updated_at]
+            conn.execute(
+                f"UPDATE time_entries SET change_seq = ?, updated_at = {version_sql} WHERE id IN ({placeholders})",
+                [seq] + version_params + list(entry_ids)
+            )
+
+    def record_deletion(self, entry_id: Optional[int], uid: str, deleted_at: int, updated_at: int):
+        """Leave a tombstone for a deleted entry, with version updated_at."""
+        with self.db.transaction() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO entry_tombstones (uid, entry_id, change_seq, deleted_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (uid, entry_id, self.next_seq(), deleted_at, updated_at))
+
+    def iter_upserts(self, since: int, until: int, batch_size: int) -> Iterator[List[Tuple]]:
+        """Stream entries changed in (since, until], in change order, in batches.
+
+        Each row is (change_seq, id, uid, project_id, sub_project_id, tags,
+        start, end, directory, duration, status, paused_duration,
+        expected_duration), with tags and times formatted as for export.
+        """
+        return self._iter_batches('''
+            SELECT change_seq, id, uid, project_id, sub_project_id,
+                   (SELECT group_concat(tag, char(31)) FROM entry_tags WHERE entry_id = time_entries.id),
+                   datetime(start_time, 'unixepoch', 'localtime'),
+                   datetime(end_time, 'unixepoch', 'localtime'),
+                   directory, duration, status, paused_duration, expected_duration
+            FROM time_entries
+            WHERE change_seq > ? AND change_seq <= ?
+            ORDER BY change_seq
+        ''', (since, until), batch_size)
+
+    def iter_deletions(self, since: int, until: int, batch_size: int) -> Iterator[List[Tuple]]:
+        """Stream (change_seq, entry_id, uid, deleted_at) tombstones in (since, until], in batches."""
+        return self._iter_batches('''
+            SELECT change_seq, entry_id, uid, datetime(deleted_at, 'unixepoch', 'localtime')
+            FROM entry_tombstones
+            WHERE change_seq > ? AND change_seq <= ?
+            ORDER BY change_seq
+        ''', (since, until), batch_size)
+
+    def _iter_batches(self, query: str, params: Tuple, batch_size: int) -> Iterator[List[Tuple]]:
+        """Run a query and yield its rows in fixed-size batches."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
@@ -1,28 +1,46 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from pathlib import Path
 
 from ..database import Database
 from ..models import DirectoryMapping
+from .changes import ChangeRepository
 
 class DirectoryMappingRepository:
     """Repository for directory mapping operations."""
     
     def __init__(self, db: Database):
         self.db = db
+        self.changes = ChangeRepository(db)
     
     def create(self, directory_path: Path, project_name: str, 
                auto_detected: bool = True, detection_method: str = None) -> int:
         """Create a new directory mapping."""
-        with self.db.get_connection() as conn:
+        with self.db.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT OR REPLACE INTO directory_mappings 
-                (directory_path, project_name, auto_detected, detection_method)
-                VALUES (?, ?, ?, ?)
-            ''', (str(directory_path), project_name, auto_detected, detection_method))
-            conn.commit()
+                (directory_path, project_name, auto_detected, detection_method, change_seq, updated_at)
+                VALUES (?, ?, ?, ?, ?,
+                        MAX(?, COALESCE((SELECT updated_at FROM directory_mappings WHERE directory_path = ?), 0) + 1))
+            ''', (str(directory_path), project_name, auto_detected, detection_method,
+                  self.changes.next_seq(), self.changes.clock(), str(directory_path)))
             return cursor.lastrowid
     
+    def apply_synced(self, record: Tuple):
+        """Write a mapping received from another database, keeping its updated_at.
+        
+        record is (directory_path, updated_at, project_name, auto_detected,
+        detection_method, created_at).
+        """
+        directory_path, updated_at, project_name, auto_detected, detection_method, created_at = record
+        with self.db.transaction() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO directory_mappings
+                (directory_path, project_name, auto_detected, detection_method, created_at, change_seq, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (directory_path, project_name, auto_detected, detection_method, created_at,
+                  self.changes.next_seq(), updated_at))
+    
     def get_by_path(self, directory_path: Path) -> Optional[DirectoryMapping]:
         """Get directory mapping by path."""
         with self.db.get_connection() as conn:
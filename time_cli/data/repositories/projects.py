@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional
+
+from ..database import Database
+
+class ProjectRepository:
+    """Repository for the project/sub-project name dictionary.
+
+    Names are interned into the projects table and referenced by integer key
+    from time_entries. Lookups go through an in-process cache that is filled
+    from the (small) table on first use and refreshed on a miss.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._loaded = False
+
+    def _load(self):
+        """(Re)load the whole dictionary into the cache."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, name FROM projects")
+            self._names = dict(cursor.fetchall())
+        self._ids = {name: project_id for project_id, name in self._names.items()}
+        self._loaded = True
+
+    def invalidate(self):
+        """Drop the cache, e.g. after a rolled-back transaction may have interned names."""
+        self._ids = {}
+        self._names = {}
+        self._loaded = False
+
+    def get_id(self, name: Optional[str]) -> Optional[int]:
+        """Get the key for a project name, or None if it has never been used."""
+        if not name:
+            return None
+        if name not in self._ids:
+            self._load()
+        return self._ids.get(name)
+
+    def get_or_create_id(self, name: Optional[str]) -> Optional[int]:
+        """Get the key for a project name, interning it if needed."""
+        if not name:
+            return None
+
+        project_id = self._ids.get(name)
+        if project_id is not None:
+            return project_id
+
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT OR IGNORE INTO projects (name) VALUES (?)", (name,))
+            cursor.execute("SELECT id FROM projects WHERE name = ?", (name,))
+            project_id = cursor.fetchone()[0]
+
+        self._ids[name] = project_id
+        self._names[project_id] = name
+        return project_id
+
+    def get_name(self, project_id: Optional[int]) -> Optional[str]:
+        """Get the project name for a key."""
+        if project_id is None:
+            return None
+        if project_id not in self._names:
+            self._load()
+        return self._names.get(project_id)
+
+    def list_names(self) -> List[str]:
+        """List all interned names."""
+        if not self._loaded:
+            self._load()
+        return sorted(self._ids)
@@ -0,0 +1,182 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..database import Database
+from .changes import ChangeRepository
+
+# Rollup rows for sub_project_id use 0 for "no sub-project" (project keys
+# start at 1) and tag '' for "all entries regardless of tags", so every key
+# column is NOT NULL and can take part in the primary key.
+NO_SUB_PROJECT = 0
+ALL_TAGS = ''
+
+# Filter keys the rollup can answer exactly; anything else needs raw rows
+_ROLLUP_FILTER_KEYS = {'from_date', 'to_date', 'projects', 'sub_projects', 'tags'}
+
+class RollupRepository:
+    """Repository for the incrementally maintained daily_rollups table.
+
+    Holds per (day, project, sub-project, tag) entry counts and durations for
+    completed entries. Writers call remove_entries() before and
+    add_entries() after changing completed entries, inside the same
+    transaction, so the rollup always matches the raw rows. Report filters
+    select whole local days, so every day in a report range is served from
+    the rollup without touching time_entries.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def add_entries(self, entry_ids: Sequence[int]):
+        """Add completed entries' contributions to the rollup."""
+        if entry_ids:
+            self._apply(self._ids_condition(entry_ids), list(entry_ids), 1)
+
+    def remove_entries(self, entry_ids: Sequence[int]):
+        """Remove completed entries' contributions from the rollup."""
+        if entry_ids:
+            self._apply(self._ids_condition(entry_ids), list(entry_ids), -1)
+
+    def add_entry_range(self, first_id: int, last_id: int):
+        """Add the contributions of every entry with an ID in [first_id, last_id]."""
+        self._apply('e.id BETWEEN ? AND ?', [first_id, last_id], 1)
+
+    def rebuild(self) -> int:
+        """Recompute the whole rollup from time_entries and return its row count."""
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM daily_rollups")
+            self._apply('1', [], 1)
+            # Reports cached from a broken rollup must not survive the repair
+            ChangeRepository(self.db).next_seq()
+            return conn.execute("SELECT COUNT(*) FROM daily_rollups").fetchone()[0]
+
+    def verify(self) -> List[Tuple]:
+        """Compare the rollup with a fresh computation from time_entries.
+
+        Returns the (day, project_id, sub_project_id, tag, entries, duration)
+        rows that differ, prefixed with 'stored' or 'expected'; an empty list
+        means the rollup is consistent.
+        """
+        with self.db.transaction() as conn:
+            conn.execute("DROP TABLE IF EXISTS temp.expected_rollups")
+            conn.execute("CREATE TEMP TABLE expected_rollups AS SELECT * FROM daily_rollups WHERE 0")
+            conn.execute('''
+                CREATE UNIQUE INDEX temp.idx_expected_rollups
+                ON expected_rollups (day, project_id, sub_project_id, tag)
+            ''')
+            self._apply('1', [], 1, table='temp.expected_rollups')
+
+            cursor = conn.execute('''
+                SELECT 'stored', * FROM (
+                    SELECT * FROM daily_rollups EXCEPT SELECT * FROM temp.expected_rollups
+                )
+                UNION ALL
+                SELECT 'expected', * FROM (
+                    SELECT * FROM temp.expected_rollups EXCEPT SELECT * FROM daily_rollups
+                )
+                ORDER BY 2, 3, 4, 5
+            ''')
+            differences = cursor.fetchall()
+            conn.execute("DROP TABLE temp.expected_rollups")
+            return differences
+
+    @staticmethod
+    def can_serve(filters: Optional[Dict[str, Any]]) -> bool:
+        """Check whether a report filter can be answered from the rollup alone."""
+        if not filters:
+            return True
+        if any(value for key, value in filters.items() if key not in _ROLLUP_FILTER_KEYS):
+            return False
+        # Rows are keyed by a single tag; intersections need the raw entries
+        return len(set(filters.get('tags') or [])) <= 1
+
+    def aggregate_with_filters(self, filters: Optional[Dict[str, Any]] = None) -> List[Tuple[str, int, Optional[int], int, int]]:
+        """Aggregate from the rollup, in the same row shape as TimeEntryRepository.aggregate_with_filters."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(*self.aggregate_query(filters))
+            return cursor.fetchall()
+
+    @staticmethod
+    def aggregate_query(filters: Optional[Dict[str, Any]] = None) -> Tuple[str, List[Any]]:
+        """Build the SQL and parameters behind aggregate_with_filters."""
+        clauses = ['tag = ?']
+        tags = (filters or {}).get('tags') or []
+        params: List[Any] = [tags[0] if tags else ALL_TAGS]
+
+        if filters:
+            if filters.get('projects'):
+                placeholders = ','.join(['?' for _ in filters['projects']])
+                clauses.append(f'project_id IN (SELECT id FROM projects WHERE name IN ({placeholders}))')
+                params.extend(filters['projects'])
+
+            if filters.get('sub_projects'):
+                placeholders = ','.join(['?' for _ in filters['sub_projects']])
+                clauses.append(f'sub_project_id IN (SELECT id FROM projects WHERE name IN ({placeholders}))')
+                params.extend(filters['sub_projects'])
+
+            if filters.get('from_date'):
+                clauses.append('day >= ?')
+                params.append(filters['from_date'])
+
+            if filters.get('to_date'):
+                clauses.append('day <= ?')
+                params.append(filters['to_date'])
+
+        return f'''
+            SELECT day, project_id, NULLIF(sub_project_id, {NO_SUB_PROJECT}), SUM(entries), SUM(duration)
+            FROM daily_rollups
+            WHERE {' AND '.join(clauses)}
+            GROUP BY day, project_id, sub_project_id
+        ''', params
+
+    def _ids_condition(self, entry_ids: Sequence[int]) -> str:
+        """Build an ``e.id IN (...)`` condition for the given IDs."""
+        return f"e.id IN ({','.join(['?' for _ in entry_ids])})"
+
+    def _apply(self, condition: str, params: List[Any], sign: int, table: str = 'daily_rollups'):
+        """Add (sign=1) or subtract (sign=-1) the contributions of matching completed entries.
+
+        ``condition`` is a SQL predicate over ``time_entries e``.
+        """
+        with self.db.transaction() as conn:
+            # One row per entry under the "all tags" key...
+            conn.execute(f'''
+                INSERT INTO {table} (day, project_id, sub_project_id, tag, entries, duration)
+                SELECT date(e.start_time, 'unixepoch', 'localtime') AS day, e.project_id,
+                       COALESCE(e.sub_project_id, {NO_SUB_PROJECT}) AS sub_key, '{ALL_TAGS}',
+                       ? * COUNT(*), ? * COALESCE(SUM(e.duration), 0)
+                FROM time_entries e
+                WHERE e.end_time IS NOT NULL AND {condition}
+                GROUP BY day, e.project_id, sub_key
+                ON CONFLICT (day, project_id, sub_project_id, tag) DO UPDATE SET
+                    entries = entries + excluded.entries,
+                    duration = duration + excluded.duration
+            ''', [sign, sign] + params)
+
+            # ...and one per distinct tag it carries
+            conn.execute(f'''
+                INSERT INTO {table} (day, project_id, sub_project_id, tag, entries, duration)
+                SELECT date(e.start_time, 'unixepoch', 'localtime') AS day, e.project_id,
+                       COALESCE(e.sub_project_id, {NO_SUB_PROJECT}) AS sub_key, t.tag,
+                       ? * COUNT(*), ? * COALESCE(SUM(e.duration), 0)
+                FROM time_entries e
+                JOIN entry_tags t ON t.entry_id = e.id
+                WHERE e.end_time IS NOT NULL AND {condition}
+                  AND t.position = (
+                      SELECT MIN(position) FROM entry_tags WHERE entry_id = e.id AND tag = t.tag
+                  )
+                GROUP BY day, e.project_id, sub_key, t.tag
+                ON CONFLICT (day, project_id, sub_project_id, tag) DO UPDATE SET
+                    entries = entries + excluded.entries,
+                    duration = duration + excluded.duration
+            ''', [sign, sign] + params)
+
+            if sign < 0:
+                conn.execute(f'''
+                    DELETE FROM {table}
+                    WHERE entries <= 0 AND day IN (
+                        SELECT date(e.start_time, 'unixepoch', 'localtime')
+                        FROM time_entries e
+                        WHERE {condition}
+                    )
+                ''', params)
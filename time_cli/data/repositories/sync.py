@@ -0,0 +1,128 @@
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from ...utils.date_utils import to_timestamp
+from ..database import Database
+from ..queries import split_tags
+
+# Entries travel between databases as (uid, updated_at, project,
+# sub_project, tags, start_time, end_time, duration, directory, status,
+# paused_duration, expected_duration, created_at), times in epoch seconds
+# except the row version updated_at, in milliseconds
+_ENTRY_RECORD_SELECT = '''
+    SELECT e.id, e.uid, e.updated_at, p.name, sp.name,
+           (SELECT group_concat(tag, char(31)) FROM entry_tags WHERE entry_id = e.id),
+           e.start_time, e.end_time, e.duration, e.directory, e.status,
+           COALESCE(e.paused_duration, 0), e.expected_duration, e.created_at
+    FROM time_entries e
+    JOIN projects p ON p.id = e.project_id
+    LEFT JOIN projects sp ON sp.id = e.sub_project_id
+'''
+
+_MAPPING_RECORD_SELECT = '''
+    SELECT directory_path, updated_at, project_name, auto_detected, detection_method, created_at
+    FROM directory_mappings
+'''
+
+class SyncRepository:
+    """Repository for database identity, sync peer watermarks and sync records.
+
+    Rows are exchanged by their stable identity (an entry's uid, a
+    mapping's directory path) rather than local IDs, which differ between
+    databases.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def database_id(self) -> str:
+        """Get the random ID identifying this database to its sync peers."""
+        with self.db.get_connection() as conn:
+            return conn.execute("SELECT value FROM meta WHERE key = 'database_id'").fetchone()[0]
+
+    def reset_database_id(self) -> str:
+        """Give the database a new random ID and forget its sync peers.
+
+        A copied database file keeps the original's ID and watermarks, so it
+        must be re-keyed before it can sync with the original; it then
+        exchanges everything once with each peer, as on a first sync.
+        """
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE meta SET value = lower(hex(randomblob(16))) WHERE key = 'database_id'")
+            conn.execute("DELETE FROM sync_peers")
+            return conn.execute("SELECT value FROM meta WHERE key = 'database_id'").fetchone()[0]
+
+    def get_peer(self, peer_id: str) -> Tuple[int, int]:
+        """Get (sent_seq, received_seq) for a peer; (0, 0) if never synced."""
+        with self.db.get_connection() as conn:
+            row = conn.execute(
+                "SELECT sent_seq, received_seq FROM sync_peers WHERE peer_id = ?", (peer_id,)
+            ).fetchone()
+            return (row[0], row[1]) if row else (0, 0)
+
+    def set_peer(self, peer_id: str, sent_seq: int, received_seq: int):
+        """Store the watermarks reached with a peer."""
+        with self.db.transaction() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO sync_peers (peer_id, sent_seq, received_seq, synced_at)
+                VALUES (?, ?, ?, ?)
+            ''', (peer_id, sent_seq, received_seq, to_timestamp(datetime.now())))
+
+    def iter_entry_changes(self, since: int, until: int, batch_size: int) -> Iterator[List[Tuple]]:
+        """Stream entry records changed in (since, until], in batches."""
+        return self._iter_batches(
+            _ENTRY_RECORD_SELECT + ' WHERE e.change_seq > ? AND e.change_seq <= ? ORDER BY e.change_seq',
+            (since, until), batch_size, self._entry_record
+        )
+
+    def iter_deletion_changes(self, since: int, until: int, batch_size: int) -> Iterator[List[Tuple]]:
+        """Stream (uid, deleted_at, updated_at) tombstones recorded in (since, until], in batches."""
+        return self._iter_batches('''
+            SELECT uid, deleted_at, updated_at FROM entry_tombstones
+            WHERE change_seq > ? AND change_seq <= ?
+            ORDER BY change_seq
+        ''', (since, until), batch_size, tuple)
+
+    def iter_mapping_changes(self, since: int, until: int, batch_size: int) -> Iterator[List[Tuple]]:
+        """Stream directory mapping records changed in (since, until], in batches."""
+        return self._iter_batches(
+            _MAPPING_RECORD_SELECT + ' WHERE change_seq > ? AND change_seq <= ? ORDER BY change_seq',
+            (since, until), batch_size, tuple
+        )
+
+    def get_entry(self, uid: str) -> Optional[Tuple[int, Tuple]]:
+        """Get (local ID, record) for an entry by uid."""
+        with self.db.get_connection() as conn:
+            row = conn.execute(_ENTRY_RECORD_SELECT + ' WHERE e.uid = ?', (uid,)).fetchone()
+            return (row[0], self._entry_record(row)) if row else None
+
+    def get_deletion_version(self, uid: str) -> Optional[int]:
+        """Get the version (updated_at) of an entry's tombstone, if it has one."""
+        with self.db.get_connection() as conn:
+            row = conn.execute("SELECT updated_at FROM entry_tombstones WHERE uid = ?", (uid,)).fetchone()
+            return row[0] if row else None
+
+    def get_mapping(self, directory_path: str) -> Optional[Tuple]:
+        """Get the record for a directory mapping by path."""
+        with self.db.get_connection() as conn:
+            row = conn.execute(_MAPPING_RECORD_SELECT + ' WHERE directory_path = ?', (directory_path,)).fetchone()
+            return tuple(row) if row else None
+
+    @staticmethod
+    def _entry_record(row) -> Tuple:
+        """Convert an entry row to a sync record, dropping the local ID."""
+        return row[1:5] + (tuple(split_tags(row[5])),) + row[6:]
+
+    def _iter_batches(self, query: str, params: Tuple, batch_size: int, convert) -> Iterator[List[Tuple]]:
+        """Run a query and yield its converted rows in fixed-size batches."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield [convert(row) for row in rows]
+            finally:
+                cursor.close()
@@ -1,41 +1,100 @@
-import json
+import uuid
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 
 from ..database import Database
-from ..models import TimeEntry
+from ...config.settings import Settings
+from ...utils.date_utils import to_timestamp, from_timestamp, date_to_timestamp, next_day
+from ..models import TimeEntry, TimeEntryRow
+from ..queries import ENTRY_COLUMNS, PIVOT_DIMENSIONS, build_filter_clause, split_tags
+from .projects import ProjectRepository
+from .rollups import RollupRepository
+from .changes import ChangeRepository
 
 class TimeEntryRepository:
     """Repository for time entry operations."""
     
     def __init__(self, db: Database):
         self.db = db
+        self.projects = ProjectRepository(db)
+        self.rollups = RollupRepository(db)
+        self.changes = ChangeRepository(db)
     
     def create(self, project: str, sub_project: Optional[str], tags: List[str], directory: str, expected_duration: Optional[int] = None) -> int:
         """Create a new time entry and return its ID."""
-        with self.db.get_connection() as conn:
+        with self.db.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                INSERT INTO time_entries (project, sub_project, tags, start_time, directory, status, expected_duration)
+                INSERT INTO time_entries (uid, project_id, sub_project_id, start_time, directory, status, expected_duration)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', (
-                project,
-                sub_project,
-                json.dumps(tags) if tags else None,
-                datetime.now().isoformat(),
+                uuid.uuid4().hex,
+                self.projects.get_or_create_id(project),
+                self.projects.get_or_create_id(sub_project),
+                to_timestamp(datetime.now()),
                 directory,
                 'active',
                 expected_duration
             ))
-            conn.commit()
-            return cursor.lastrowid
+            entry_id = cursor.lastrowid
+            self._write_tags(conn, entry_id, tags)
+            self.changes.mark_entries([entry_id])
+            return entry_id
+    
+    def next_id(self, conn) -> int:
+        """Get the ID the next inserted entry would receive."""
+        cursor = conn.execute('''
+            SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'time_entries'), 0),
+                       COALESCE((SELECT MAX(id) FROM time_entries), 0)) + 1
+        ''')
+        return cursor.fetchone()[0]
+    
+    def insert_completed_batch(self, conn, first_id: int, rows: List[Tuple]) -> int:
+        """Insert completed entries with consecutive IDs from first_id; return the next free ID.
+        
+        rows are (project, sub_project, tags, start_time, end_time, duration,
+        directory, paused_duration) with datetime start and end times. Must
+        run inside a transaction; callers add the inserted ID range to the
+        rollup once all batches are written.
+        """
+        entry_rows = []
+        tag_rows = []
+        entry_id = first_id
+        change_seq = self.changes.next_seq()
+        updated_at = self.changes.clock()
+        for project, sub_project, tags, start_time, end_time, duration, directory, paused_duration in rows:
+            start_timestamp = to_timestamp(start_time)
+            entry_rows.append((
+                entry_id,
+                uuid.uuid4().hex,
+                self.projects.get_or_create_id(project),
+                self.projects.get_or_create_id(sub_project),
+                start_timestamp,
+                to_timestamp(end_time),
+                duration,
+                directory,
+                paused_duration,
+                start_timestamp,
+                change_seq,
+                updated_at
+            ))
+            tag_rows.extend((entry_id, position, tag) for position, tag in enumerate(dict.fromkeys(tags)))
+            entry_id += 1
+        
+        conn.executemany('''
+            INSERT INTO time_entries (id, uid, project_id, sub_project_id, start_time, end_time, duration,
+                                      directory, status, paused_duration, created_at, change_seq, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'completed', ?, ?, ?, ?)
+        ''', entry_rows)
+        conn.executemany("INSERT INTO entry_tags (entry_id, position, tag) VALUES (?, ?, ?)", tag_rows)
+        return entry_id
     
     def get_by_id(self, entry_id: int) -> Optional[TimeEntry]:
         """Get a time entry by ID."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT id, project, sub_project, tags, start_time, end_time, duration, directory, status, paused_duration, expected_duration FROM time_entries WHERE id = ?",
+                f"SELECT {ENTRY_COLUMNS} FROM time_entries WHERE id = ?",
                 (entry_id,),
             )
             row = cursor.fetchone()
@@ -48,8 +107,8 @@ class TimeEntryRepository:
         """Get the currently active time entry."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, project, sub_project, tags, start_time, end_time, duration, directory, status, paused_duration, expected_duration
+            cursor.execute(f'''
+                SELECT {ENTRY_COLUMNS}
                 FROM time_entries 
                 WHERE end_time IS NULL AND status = 'active'
                 ORDER BY start_time DESC 
@@ -65,8 +124,8 @@ class TimeEntryRepository:
         """Get the currently paused time entry."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, project, sub_project, tags, start_time, end_time, duration, directory, status, paused_duration, expected_duration
+            cursor.execute(f'''
+                SELECT {ENTRY_COLUMNS}
                 FROM time_entries 
                 WHERE status = 'paused'
                 ORDER BY start_time DESC 
@@ -80,72 +139,73 @@ class TimeEntryRepository:
     
     def stop_active(self) -> Optional[int]:
         """Stop the active timer and return total duration in seconds."""
-        active = self.get_active()
-        if not active:
-            return None
-            
-        end_time = datetime.now()
-        # Calculate time since last start (or resume)
-        current_session_duration = int((end_time - active.start_time).total_seconds())
-        
-        # Add any previous duration from before pauses (stored in duration field when paused)
-        previous_duration = active.duration or 0
-        total_duration = current_session_duration + previous_duration
-        
-        with self.db.get_connection() as conn:
+        with self.db.transaction() as conn:
+            active = self.get_active()
+            if not active:
+                return None
+
+            end_time = datetime.now()
+            # Calculate time since last start (or resume)
+            current_session_duration = int((end_time - active.start_time).total_seconds())
+
+            # Add any previous duration from before pauses (stored in duration field when paused)
+            previous_duration = active.duration or 0
+            total_duration = current_session_duration + previous_duration
+
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE time_entries 
                 SET end_time = ?, duration = ?, status = 'completed'
                 WHERE id = ?
-            ''', (end_time.isoformat(), total_duration, active.id))
-            conn.commit()
-        
+            ''', (to_timestamp(end_time), total_duration, active.id))
+            self.rollups.add_entries([active.id])
+            self.changes.mark_entries([active.id])
+
         return total_duration
     
     def pause_active(self) -> Optional[int]:
         """Pause the active timer and return elapsed duration in seconds."""
-        active = self.get_active()
-        if not active:
-            return None
-            
-        pause_time = datetime.now()
-        # Calculate time since last start (or resume)
-        current_session_duration = int((pause_time - active.start_time).total_seconds())
-        
-        # Add to any previous duration from before pauses
-        previous_duration = active.duration or 0
-        total_elapsed = current_session_duration + previous_duration
-        
-        with self.db.get_connection() as conn:
+        with self.db.transaction() as conn:
+            active = self.get_active()
+            if not active:
+                return None
+
+            pause_time = datetime.now()
+            # Calculate time since last start (or resume)
+            current_session_duration = int((pause_time - active.start_time).total_seconds())
+
+            # Add to any previous duration from before pauses
+            previous_duration = active.duration or 0
+            total_elapsed = current_session_duration + previous_duration
+
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE time_entries 
                 SET status = 'paused', duration = ? 
                 WHERE id = ?
             ''', (total_elapsed, active.id))
-            conn.commit()
-        
+            self.changes.mark_entries([active.id])
+
         return total_elapsed
     
     def resume_paused(self) -> Optional[int]:
         """Resume the paused timer and return the entry ID."""
-        paused = self.get_paused()
-        if not paused:
-            return None
-        
-        # Resume: reset start_time to now, keep accumulated duration, set status to active
-        resume_time = datetime.now()
-        
-        with self.db.get_connection() as conn:
+        with self.db.transaction() as conn:
+            paused = self.get_paused()
+            if not paused:
+                return None
+
+            # Resume: reset start_time to now, keep accumulated duration, set status to active
+            resume_time = datetime.now()
+
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE time_entries 
                 SET status = 'active', start_time = ?
                 WHERE id = ?
-            ''', (resume_time.isoformat(), paused.id))
-            conn.commit()
-        
+            ''', (to_timestamp(resume_time), paused.id))
+            self.changes.mark_entries([paused.id])
+
         return paused.id
     
     def update(self, entry_id: int, updates: Dict[str, Any]) -> bool:
@@ -153,85 +213,309 @@ class TimeEntryRepository:
         if not updates:
             return False
 
-        with self.db.get_connection() as conn:
+        with self.db.transaction() as conn:
             cursor = conn.cursor()
+            # Take the entry out of the rollup and add it back once updated
+            self.rollups.remove_entries([entry_id])
 
             set_clauses = []
             params = []
 
             for key, value in updates.items():
-                if key == "tags":
-                    set_clauses.append("tags = ?")
-                    params.append(json.dumps(value))
-                else:
+                if key in ("project", "sub_project"):
+                    # Names are stored as keys into the projects dictionary
+                    set_clauses.append(f"{key}_id = ?")
+                    params.append(self.projects.get_or_create_id(value))
+                elif isinstance(value, datetime):
+                    set_clauses.append(f"{key} = ?")
+                    params.append(to_timestamp(value))
+                elif key != "tags":
                     set_clauses.append(f"{key} = ?")
                     params.append(value)
 
-            if not set_clauses:
+            if set_clauses:
+                query = f"UPDATE time_entries SET {', '.join(set_clauses)} WHERE id = ?"
+                params.append(entry_id)
+                cursor.execute(query, tuple(params))
+                updated = cursor.rowcount > 0
+            else:
+                cursor.execute("SELECT 1 FROM time_entries WHERE id = ?", (entry_id,))
+                updated = cursor.fetchone() is not None
+
+            if updated and "tags" in updates:
+                self._write_tags(conn, entry_id, updates["tags"])
+            if updated:
+                self.changes.mark_entries([entry_id])
+            self.rollups.add_entries([entry_id])
+
+            return updated
+
+    def delete(self, entry_id: int) -> bool:
+        """Delete a time entry by ID."""
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            row = cursor.execute("SELECT uid, updated_at FROM time_entries WHERE id = ?", (entry_id,)).fetchone()
+            if row is None:
                 return False
+            uid, updated_at = row
+            self.rollups.remove_entries([entry_id])
+            cursor.execute("DELETE FROM entry_tags WHERE entry_id = ?", (entry_id,))
+            cursor.execute("DELETE FROM time_entries WHERE id = ?", (entry_id,))
+            # The deletion's version must beat the version it removes
+            self.changes.record_deletion(entry_id, uid, to_timestamp(datetime.now()),
+                                         max(self.changes.clock(), (updated_at or 0) + 1))
+            return True
+
+    def apply_synced(self, entry_id: Optional[int], record: Tuple):
+        """Write an entry received from another database, keeping its uid and updated_at.
 
-            query = f"UPDATE time_entries SET {', '.join(set_clauses)} WHERE id = ?"
-            params.append(entry_id)
+        record is (uid, updated_at, project, sub_project, tags, start_time,
+        end_time, duration, directory, status, paused_duration,
+        expected_duration, created_at) with epoch-second times and
+        updated_at in milliseconds; entry_id is
+        the local ID of the entry, or None to insert it under a new ID.
+        """
+        (uid, updated_at, project, sub_project, tags, start_time, end_time, duration,
+         directory, status, paused_duration, expected_duration, created_at) = record
 
-            cursor.execute(query, tuple(params))
-            conn.commit()
+        with self.db.transaction() as conn:
+            values = (
+                self.projects.get_or_create_id(project),
+                self.projects.get_or_create_id(sub_project),
+                start_time, end_time, duration, directory, status, paused_duration, expected_duration
+            )
+            if entry_id is None:
+                # A resurrected entry no longer needs its tombstone
+                conn.execute("DELETE FROM entry_tombstones WHERE uid = ?", (uid,))
+                cursor = conn.execute('''
+                    INSERT INTO time_entries (project_id, sub_project_id, start_time, end_time, duration, directory,
+                                              status, paused_duration, expected_duration, uid, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', values + (uid, created_at))
+                entry_id = cursor.lastrowid
+            else:
+                self.rollups.remove_entries([entry_id])
+                conn.execute('''
+                    UPDATE time_entries
+                    SET project_id = ?, sub_project_id = ?, start_time = ?, end_time = ?, duration = ?,
+                        directory = ?, status = ?, paused_duration = ?, expected_duration = ?
+                    WHERE id = ?
+                ''', values + (entry_id,))
+            self._write_tags(conn, entry_id, list(tags))
+            self.changes.mark_entries([entry_id], updated_at)
+            self.rollups.add_entries([entry_id])
 
-            return cursor.rowcount > 0
+    def apply_synced_deletion(self, entry_id: Optional[int], uid: str, deleted_at: int, updated_at: int):
+        """Delete an entry as another database did, or just record the tombstone."""
+        with self.db.transaction() as conn:
+            if entry_id is not None:
+                self.rollups.remove_entries([entry_id])
+                conn.execute("DELETE FROM entry_tags WHERE entry_id = ?", (entry_id,))
+                conn.execute("DELETE FROM time_entries WHERE id = ?", (entry_id,))
+            self.changes.record_deletion(entry_id, uid, deleted_at, updated_at)
     
-    def find_with_filters(self, filters: Optional[Dict[str, Any]] = None) -> List[TimeEntry]:
-        """Retrieve time entries with optional filtering."""
+    def iter_with_filters(self, filters: Optional[Dict[str, Any]] = None,
+                          batch_size: int = Settings.REPORT_FETCH_BATCH_SIZE) -> Iterator[TimeEntryRow]:
+        """Stream time entries matching the filters, fetching rows in fixed-size batches."""
+        where_clause, params = build_filter_clause(filters)
+        project_name = self.projects.get_name
+
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            
-            query = '''
-                SELECT id, project, sub_project, tags, start_time, end_time, duration, directory, status, paused_duration, expected_duration
+            cursor.execute(f'''
+                SELECT {ENTRY_COLUMNS}
                 FROM time_entries
-                WHERE end_time IS NOT NULL
-            '''
-            params = []
-            
-            if filters:
-                if filters.get('projects'):
-                    project_placeholders = ','.join(['?' for _ in filters['projects']])
-                    query += f' AND project IN ({project_placeholders})'
-                    params.extend(filters['projects'])
-                
-                if filters.get('sub_projects'):
-                    sub_project_placeholders = ','.join(['?' for _ in filters['sub_projects']])
-                    query += f' AND sub_project IN ({sub_project_placeholders})'
-                    params.extend(filters['sub_projects'])
-                
-                if filters.get('tags'):
-                    for tag in filters['tags']:
-                        query += ' AND (tags LIKE ? OR tags LIKE ? OR tags LIKE ?)'
-                        params.extend([f'["{tag}"]', f'"{tag}",', f',"{tag}"'])
-                
-                if filters.get('from_date'):
-                    query += ' AND DATE(start_time) >= ?'
-                    params.append(filters['from_date'])
-                
-                if filters.get('to_date'):
-                    query += ' AND DATE(start_time) <= ?'
-                    params.append(filters['to_date'])
-            
-            query += ' ORDER BY start_time DESC'
-            
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            return [self._row_to_model(row) for row in rows]
+                WHERE {where_clause}
+                ORDER BY start_time DESC
+            ''', params)
+
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield TimeEntryRow(row, project_name)
+            finally:
+                cursor.close()
+    
+    def find_with_filters(self, filters: Optional[Dict[str, Any]] = None) -> List[TimeEntryRow]:
+        """Retrieve time entries with optional filtering as lazily hydrated rows."""
+        return list(self.iter_with_filters(filters))
+    
+    def aggregate_with_filters(self, filters: Optional[Dict[str, Any]] = None) -> List[Tuple[str, int, Optional[int], int, int]]:
+        """Aggregate matching entries in SQL without hydrating them.
+        
+        Returns (day, project_id, sub_project_id, entries, duration) rows,
+        one per local start day and project/sub-project pair.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(*self.aggregate_query(filters))
+            return cursor.fetchall()
+    
+    @staticmethod
+    def aggregate_query(filters: Optional[Dict[str, Any]] = None) -> Tuple[str, List[Any]]:
+        """Build the SQL and parameters behind aggregate_with_filters."""
+        where_clause, params = build_filter_clause(filters)
+        return f'''
+            SELECT date(start_time, 'unixepoch', 'localtime') AS day, project_id, sub_project_id,
+                   COUNT(*), COALESCE(SUM(duration), 0)
+            FROM time_entries
+            WHERE {where_clause}
+            GROUP BY day, project_id, sub_project_id
+        ''', params
+    
+    def group_with_filters(self, filters: Optional[Dict[str, Any]], dimensions: List[str]) -> List[Tuple]:
+        """Group completed entries by pivot dimensions in one SQL pass.
+        
+        Returns (key_1, ..., key_n, entries, duration) rows. Grouping by tag
+        joins entry_tags, so an entry counts once under each of its tags and
+        untagged entries get a NULL tag.
+        """
+        where_clause, params = build_filter_clause(filters)
+        expressions = [PIVOT_DIMENSIONS[dimension] for dimension in dimensions]
+        join = 'LEFT JOIN entry_tags ON entry_tags.entry_id = time_entries.id' if 'tag' in dimensions else ''
+        positions = ', '.join(str(i + 1) for i in range(len(expressions)))
+        
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {', '.join(expressions)}, COUNT(*), COALESCE(SUM(duration), 0)
+                FROM time_entries {join}
+                WHERE {where_clause}
+                GROUP BY {positions}
+            ''', params)
+            return cursor.fetchall()
+    
+    def compare_with_filters(self, filters: Optional[Dict[str, Any]], current: Tuple[str, str],
+                             previous: Tuple[str, str]) -> List[Tuple]:
+        """Group completed entries in two date ranges in one query over their union.
+        
+        Date filters are replaced by the two inclusive ranges. Returns
+        (window, project_id, tag, tagged_entries, tagged_duration, entries,
+        duration) rows, with window 0 for current and 1 for previous. Tags
+        are left-joined, so tagged_* count an entry once per tag while
+        entries/duration count only its first tag row and sum to the
+        project totals.
+        """
+        base_filters = {key: value for key, value in (filters or {}).items()
+                        if key not in ('from_date', 'to_date')}
+        where_clause, params = build_filter_clause(base_filters)
+        current_start = date_to_timestamp(current[0])
+        params = [current_start] + params + [
+            current_start, date_to_timestamp(next_day(current[1])),
+            date_to_timestamp(previous[0]), date_to_timestamp(next_day(previous[1])),
+        ]
+        
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT CASE WHEN start_time >= ? THEN 0 ELSE 1 END, project_id, entry_tags.tag,
+                       COUNT(*), COALESCE(SUM(duration), 0),
+                       SUM(COALESCE(entry_tags.position, 0) = 0),
+                       COALESCE(SUM(CASE WHEN COALESCE(entry_tags.position, 0) = 0 THEN duration END), 0)
+                FROM time_entries
+                LEFT JOIN entry_tags ON entry_tags.entry_id = time_entries.id
+                WHERE {where_clause}
+                  AND ((start_time >= ? AND start_time < ?) OR (start_time >= ? AND start_time < ?))
+                GROUP BY 1, 2, 3
+            ''', params)
+            return cursor.fetchall()
+    
+    def get_date_bounds(self) -> Optional[Tuple[str, str]]:
+        """Get the first and last local start dates of all entries."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT date((SELECT MIN(start_time) FROM time_entries), 'unixepoch', 'localtime'),
+                       date((SELECT MAX(start_time) FROM time_entries), 'unixepoch', 'localtime')
+            ''')
+            first_day, last_day = cursor.fetchone()
+            if first_day is None:
+                return None
+            return first_day, last_day
+    
+    def iter_column_batches(self, filters: Optional[Dict[str, Any]] = None,
+                            batch_size: int = Settings.COLUMNAR_BATCH_SIZE) -> Iterator[List[Tuple[int, int, int, int]]]:
+        """Stream integer-coded columns of matching entries in batches.
+        
+        Each row is (local day number since 1970-01-01, project_id,
+        sub_project_id or 0, duration), ready to be loaded into arrays.
+        """
+        where_clause, params = build_filter_clause(filters)
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT CAST(strftime('%s', start_time, 'unixepoch', 'localtime') AS INTEGER) / 86400,
+                       project_id, COALESCE(sub_project_id, 0), COALESCE(duration, 0)
+                FROM time_entries
+                WHERE {where_clause}
+            ''', params)
+
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+    
+    def iter_export_batches(self, filters: Optional[Dict[str, Any]] = None,
+                            batch_size: int = Settings.EXPORT_BATCH_SIZE) -> Iterator[List[Tuple]]:
+        """Stream matching entries as raw export rows, oldest first, in batches.
+        
+        Each row is (id, project_id, sub_project_id, tags, start, end,
+        directory, duration, paused_duration) with tags folded as in
+        ENTRY_COLUMNS and times formatted by SQLite as local
+        'YYYY-MM-DD HH:MM:SS' strings.
+        """
+        where_clause, params = build_filter_clause(filters)
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT id, project_id, sub_project_id,
+                       (SELECT group_concat(tag, char(31)) FROM entry_tags WHERE entry_id = time_entries.id),
+                       datetime(start_time, 'unixepoch', 'localtime'),
+                       datetime(end_time, 'unixepoch', 'localtime'),
+                       directory, duration, paused_duration
+                FROM time_entries
+                WHERE {where_clause}
+                ORDER BY start_time, id
+            ''', params)
+
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+    
+    def _write_tags(self, conn, entry_id: int, tags: Optional[List[str]]):
+        """Replace the tags stored for an entry, preserving their order."""
+        conn.execute("DELETE FROM entry_tags WHERE entry_id = ?", (entry_id,))
+        if tags:
+            conn.executemany(
+                "INSERT INTO entry_tags (entry_id, position, tag) VALUES (?, ?, ?)",
+                [(entry_id, position, tag) for position, tag in enumerate(dict.fromkeys(tags))]
+            )
     
     def _row_to_model(self, row) -> TimeEntry:
         """Convert database row to TimeEntry model."""
-        entry_id, project, sub_project, tags_json, start_time_str, end_time_str, duration, directory, status, paused_duration, expected_duration = row
-        tags = json.loads(tags_json) if tags_json else []
-        start_time = datetime.fromisoformat(start_time_str)
-        end_time = datetime.fromisoformat(end_time_str) if end_time_str else None
+        entry_id, project_id, sub_project_id, tags_str, start_timestamp, end_timestamp, duration, directory, status, paused_duration, expected_duration = row
+        tags = split_tags(tags_str)
+        start_time = from_timestamp(start_timestamp)
+        end_time = from_timestamp(end_timestamp) if end_timestamp is not None else None
         
         return TimeEntry(
             id=entry_id,
-            project=project,
-            sub_project=sub_project,
+            project=self.projects.get_name(project_id),
+            sub_project=self.projects.get_name(sub_project_id),
             tags=tags,
             start_time=start_time,
             end_time=end_time,
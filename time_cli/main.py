@@ -9,6 +9,11 @@ from .commands.edit import edit
 from .commands.link import link
 from .commands.report import report
 from .commands.delete import delete
+from .commands.rollup import rollup
+from .commands.import_entries import import_entries
+from .commands.export import export
+from .commands.changes import changes
+from .commands.sync import sync
 
 @click.group()
 def cli():
@@ -25,6 +30,11 @@ cli.add_command(edit)
 cli.add_command(link)
 cli.add_command(report)
 cli.add_command(delete)
+cli.add_command(rollup)
+cli.add_command(import_entries)
+cli.add_command(export)
+cli.add_command(changes)
+cli.add_command(sync)
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file
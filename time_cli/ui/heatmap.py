@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from rich.text import Text
+
+from ..core.duration import format_duration, format_hours
+
+class HeatmapFormatter:
+    """Calendar heatmaps of daily tracked time, one block per year."""
+
+    CELL = "■"
+    EMPTY_STYLE = "grey23"
+    LEVEL_STYLES = ["#0e4429", "#006d32", "#26a641", "#39d353"]
+    WEEKDAY_LABELS = ["Mon", "", "Wed", "", "Fri", "", "Sun"]
+    MONTH_LABELS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+    @staticmethod
+    def level_thresholds(daily_totals: Dict[str, int]) -> List[int]:
+        """Get the lower bounds of each colour level from quartiles of the non-empty days."""
+        durations = sorted(duration for duration in daily_totals.values() if duration > 0)
+        if not durations:
+            return []
+        levels = len(HeatmapFormatter.LEVEL_STYLES)
+        return [durations[len(durations) * i // levels] for i in range(levels)]
+
+    @staticmethod
+    def create_year_grid(year: int, daily_totals: Dict[str, int], thresholds: List[int],
+                         first_day: Optional[date] = None, last_day: Optional[date] = None) -> Text:
+        """Create a weekday-by-week grid for one year, clipped to first_day..last_day."""
+        first_day = max(first_day or date(year, 1, 1), date(year, 1, 1))
+        last_day = min(last_day or date(year, 12, 31), date(year, 12, 31))
+        grid_start = first_day - timedelta(days=first_day.weekday())
+        weeks = (last_day - grid_start).days // 7 + 1
+
+        text = Text()
+
+        # Month labels over the week in which each month starts
+        month_row = [" "] * (weeks + 3)
+        for month in range(first_day.month, last_day.month + 1):
+            column = max((date(year, month, 1) - grid_start).days // 7, 0)
+            label = HeatmapFormatter.MONTH_LABELS[month - 1]
+            if all(c == " " for c in month_row[max(column - 1, 0):column + len(label)]):
+                month_row[column:column + len(label)] = list(label)
+        text.append(f"{year}  " + "".join(month_row).rstrip() + "\n", style="bold")
+
+        for weekday in range(7):
+            text.append(f"{HeatmapFormatter.WEEKDAY_LABELS[weekday]:<6}", style="dim")
+            for week in range(weeks):
+                day = grid_start + timedelta(days=week * 7 + weekday)
+                if day < first_day or day > last_day:
+                    text.append(" ")
+                    continue
+                duration = daily_totals.get(day.isoformat(), 0)
+                text.append(HeatmapFormatter.CELL, style=HeatmapFormatter._cell_style(duration, thresholds))
+            text.append("\n")
+
+        return text
+
+    @staticmethod
+    def create_legend(thresholds: List[int]) -> Text:
+        """Create the colour legend line."""
+        text = Text("      Less ", style="dim")
+        text.append(HeatmapFormatter.CELL, style=HeatmapFormatter.EMPTY_STYLE)
+        for style in HeatmapFormatter.LEVEL_STYLES[:len(thresholds)]:
+            text.append(HeatmapFormatter.CELL, style=style)
+        text.append(" More", style="dim")
+        if thresholds:
+            bounds = ", ".join(f"≥{format_hours(threshold)}" for threshold in thresholds)
+            text.append(f"  ({bounds})", style="dim")
+        return text
+
+    @staticmethod
+    def create_year_total(year: int, daily_totals: Dict[str, int]) -> Text:
+        """Create a one-line total for a year."""
+        prefix = f"{year}-"
+        days = [duration for day, duration in daily_totals.items() if day.startswith(prefix) and duration]
+        total = sum(days)
+        return Text(f"      {format_duration(total)} over {len(days)} days", style="green")
+
+    @staticmethod
+    def _cell_style(duration: int, thresholds: List[int]) -> str:
+        """Pick the colour for a day's duration."""
+        if duration <= 0 or not thresholds:
+            return HeatmapFormatter.EMPTY_STYLE
+        level = 0
+        for i, threshold in enumerate(thresholds):
+            if duration >= threshold:
+                level = i
+        return HeatmapFormatter.LEVEL_STYLES[level]
@@ -1,9 +1,19 @@
+from datetime import date
+from itertools import chain, islice
 from rich.console import Console
-from typing import List
+from rich.markup import escape
+from rich.tree import Tree
+from typing import Iterable, List, Optional
 
-from ..data.models import TimeEntry, ReportSummary
+from ..data.models import TimeEntry, ReportSummary, PivotTable, ComparisonReport
+from ..core.directory_tree import DirectoryNode
+from ..core.session_stats import SessionStats
+from ..core.sketch import DurationSketch
 from ..core.duration import format_duration
+from ..core.filters import SummaryBuilder
+from ..config.settings import Settings
 from .tables import TableFormatters
+from .heatmap import HeatmapFormatter
 
 class ReportRenderer:
     """Renders formatted reports using Rich."""
@@ -13,10 +23,57 @@ class ReportRenderer:
     
     def render_report(self, entries: List[TimeEntry], summary: ReportSummary, show_details: bool = True):
         """Render complete time tracking report."""
-        # Header
+        self._render_header()
+        self._render_summary(summary)
+        
+        # Detailed entries (optional)
+        if show_details and entries:
+            self.console.print("\n[bold cyan]Detailed Entries:[/bold cyan]")
+            entries_table = TableFormatters.create_detailed_entries_table(entries)
+            self.console.print(entries_table)
+    
+    def render_report_stream(self, entries: Iterable[TimeEntry]) -> bool:
+        """Render a detailed report in one pass over an entry stream.
+        
+        Detailed entries are printed in fixed-size chunks as they arrive while
+        the summary is accumulated alongside, then the summary is printed at
+        the end. Memory stays bounded by the chunk size rather than the number
+        of entries. Returns False if the stream was empty. Summary-only
+        reports go through render_report with a precomputed summary instead.
+        """
+        entries = iter(entries)
+        first = next(entries, None)
+        if first is None:
+            self.render_no_entries_message()
+            return False
+        
+        builder = SummaryBuilder()
+        entries = chain([first], entries)
+        self._render_header()
+        
+        self.console.print("\n[bold cyan]Detailed Entries:[/bold cyan]")
+        show_header = True
+        while True:
+            chunk = list(islice(entries, Settings.REPORT_FETCH_BATCH_SIZE))
+            if not chunk:
+                break
+            for entry in chunk:
+                builder.add(entry)
+            self.console.print(TableFormatters.create_detailed_entries_table(
+                chunk, show_header=show_header, fixed_widths=True
+            ))
+            show_header = False
+        
+        self._render_summary(builder.build())
+        return True
+    
+    def _render_header(self):
+        """Render the report title."""
         self.console.print("\n[bold blue]Time Tracking Report[/bold blue]", style="bold")
         self.console.print("=" * 50, style="dim")
-        
+    
+    def _render_summary(self, summary: ReportSummary):
+        """Render totals and the project and daily breakdowns."""
         # Summary
         self.console.print(f"\n[green]Total entries:[/green] {summary.total_entries}")
         self.console.print(f"[green]Total time:[/green] [bold]{format_duration(summary.total_duration)}[/bold]")
@@ -27,17 +84,107 @@ class ReportRenderer:
             project_table = TableFormatters.create_project_breakdown_table(summary)
             self.console.print(project_table)
         
+        # Per-database breakdown
+        if summary.sources:
+            self.console.print("\n[bold cyan]Database Breakdown:[/bold cyan]")
+            self.console.print(TableFormatters.create_source_breakdown_table(summary))
+        
         # Daily breakdown
         if TableFormatters.should_show_daily_breakdown(summary):
             self.console.print("\n[bold cyan]Daily Breakdown:[/bold cyan]")
             daily_table = TableFormatters.create_daily_breakdown_table(summary)
             self.console.print(daily_table)
+    
+    def render_pivot(self, pivot: PivotTable):
+        """Render a grouped report, as a matrix when grouped by two dimensions."""
+        self._render_header()
+        title = " by ".join(dimension.replace('_', ' ') for dimension in pivot.dimensions)
+        self.console.print(f"\n[bold cyan]Time by {title}:[/bold cyan]")
         
-        # Detailed entries (optional)
-        if show_details and entries:
-            self.console.print("\n[bold cyan]Detailed Entries:[/bold cyan]")
-            entries_table = TableFormatters.create_detailed_entries_table(entries)
-            self.console.print(entries_table)
+        if len(pivot.dimensions) == 2:
+            table = TableFormatters.create_pivot_matrix(pivot)
+        else:
+            table = TableFormatters.create_pivot_table(pivot)
+        self.console.print(table)
+        
+        if 'tag' in pivot.dimensions:
+            self.console.print("[dim]Entries with several tags are counted under each tag.[/dim]")
+    
+    def render_directory_tree(self, root: DirectoryNode):
+        """Render time per directory as a tree of subtree totals."""
+        self._render_header()
+        self.console.print("\n[bold cyan]Time by Directory:[/bold cyan]")
+        
+        tree = Tree(self._directory_label(root, "All directories"), guide_style="dim")
+        pending = [(tree, root)]
+        while pending:
+            branch, node = pending.pop()
+            shown = node.sorted_children()
+            for child in shown:
+                pending.append((branch.add(self._directory_label(child, child.name)), child))
+            
+            hidden = node.duration - node.own_duration - sum(child.duration for child in shown)
+            if shown and hidden > 0:
+                branch.add(f"[dim]… other subdirectories  {format_duration(hidden)}[/dim]")
+        self.console.print(tree)
+    
+    @staticmethod
+    def _directory_label(node: DirectoryNode, name: str) -> str:
+        """Format a directory tree node label."""
+        label = f"[cyan]{escape(name)}[/cyan]  [green]{format_duration(node.duration)}[/green]  [yellow]{node.entries}[/yellow]"
+        if node.own_duration and node.children:
+            label += f"  [dim](here: {format_duration(node.own_duration)})[/dim]"
+        return label
+    
+    def render_heatmap(self, summary: ReportSummary, from_date: Optional[str] = None,
+                       to_date: Optional[str] = None):
+        """Render daily totals as calendar heatmaps, one per year in the range."""
+        first_day = date.fromisoformat(from_date or min(summary.daily_totals))
+        last_day = date.fromisoformat(to_date or max(summary.daily_totals))
+        thresholds = HeatmapFormatter.level_thresholds(summary.daily_totals)
+        
+        self._render_header()
+        self.console.print(f"\n[green]Total time:[/green] [bold]{format_duration(summary.total_duration)}[/bold]")
+        for year in range(first_day.year, last_day.year + 1):
+            self.console.print()
+            self.console.print(HeatmapFormatter.create_year_grid(
+                year, summary.daily_totals, thresholds, first_day, last_day
+            ), end="")
+            self.console.print(HeatmapFormatter.create_year_total(year, summary.daily_totals))
+        self.console.print()
+        self.console.print(HeatmapFormatter.create_legend(thresholds))
+    
+    def render_session_stats(self, stats: SessionStats):
+        """Render session-length distributions overall, per project and per tag."""
+        self._render_header()
+        self.console.print(f"\n[green]Sessions:[/green] {stats.overall.count}")
+        self.console.print(f"[green]Shortest / longest:[/green] "
+                           f"{format_duration(stats.overall.min)} / {format_duration(stats.overall.max)}")
+        
+        self.console.print("\n[bold cyan]Session Lengths by Project:[/bold cyan]")
+        self.console.print(TableFormatters.create_session_stats_table("Project", stats.projects))
+        
+        if stats.tags:
+            self.console.print("[bold cyan]Session Lengths by Tag:[/bold cyan]")
+            self.console.print(TableFormatters.create_session_stats_table("Tag", stats.tags))
+        
+        buckets = " ".join(DurationSketch.HISTOGRAM_LABELS)
+        self.console.print(f"[dim]Histogram buckets: {buckets}. Percentiles are within 1%.[/dim]")
+    
+    def render_comparison(self, report: ComparisonReport):
+        """Render per-project and per-tag totals for two ranges side by side."""
+        self._render_header()
+        current_from, current_to = report.current_range
+        previous_from, previous_to = report.previous_range
+        self.console.print(f"\n[green]Comparing:[/green] {current_from} to {current_to} "
+                           f"with {previous_from} to {previous_to}")
+        
+        self.console.print("\n[bold cyan]Projects:[/bold cyan]")
+        self.console.print(TableFormatters.create_comparison_table("Project", report.projects, report))
+        
+        if report.tags:
+            self.console.print("[bold cyan]Tags:[/bold cyan]")
+            self.console.print(TableFormatters.create_comparison_table("Tag", report.tags, report))
     
     def render_no_entries_message(self):
         """Render message when no entries found."""
@@ -1,14 +1,25 @@
 from rich.table import Table
 from rich import box
-from typing import List
+from typing import Dict, List, Iterable
 
-from ..data.models import TimeEntry, ReportSummary
-from ..core.duration import format_duration
+from ..data.models import TimeEntry, ReportSummary, PivotTable, ComparisonReport
+from ..core.duration import format_duration, format_duration_short, format_hours
+from ..core.sketch import DurationSketch
 from ..config.settings import Settings
 
 class TableFormatters:
     """Rich table formatting for reports."""
     
+    DETAILED_ENTRY_COLUMN_WIDTHS = {
+        "ID": 6,
+        "Date & Time": 16,
+        "Project": 18,
+        "Tags": 18,
+        "Duration": 11,
+    }
+    
+    SPARK_CHARS = " ▁▂▃▄▅▆▇█"
+    
     @staticmethod
     def create_project_breakdown_table(summary: ReportSummary) -> Table:
         """Create project breakdown table."""
@@ -36,6 +47,22 @@ class TableFormatters:
         
         return table
     
+    @staticmethod
+    def create_source_breakdown_table(summary: ReportSummary) -> Table:
+        """Create per-database breakdown table for multi-database reports."""
+        table = Table(box=box.SIMPLE_HEAD)
+        table.add_column("Database", style="cyan", overflow="fold")
+        table.add_column("Duration", style="green", justify="right", no_wrap=True)
+        table.add_column("Entries", style="yellow", justify="center")
+        table.add_column("Share", style="magenta", justify="right")
+        
+        sorted_sources = sorted(summary.sources.items(), key=lambda x: x[1]['duration'], reverse=True)
+        for source, data in sorted_sources:
+            share = data['duration'] / summary.total_duration * 100 if summary.total_duration else 0
+            table.add_row(source, format_duration(data['duration']), str(data['entries']), f"{share:.1f}%")
+        
+        return table
+    
     @staticmethod
     def create_daily_breakdown_table(summary: ReportSummary) -> Table:
         """Create daily breakdown table."""
@@ -51,14 +78,20 @@ class TableFormatters:
         return table
     
     @staticmethod
-    def create_detailed_entries_table(entries: List[TimeEntry]) -> Table:
-        """Create detailed entries table."""
-        table = Table(box=box.SIMPLE_HEAD)
-        table.add_column("ID", style="cyan")
-        table.add_column("Date & Time", style="cyan")
-        table.add_column("Project", style="magenta")
-        table.add_column("Tags", style="yellow")
-        table.add_column("Duration", style="green", justify="right")
+    def create_detailed_entries_table(entries: Iterable[TimeEntry], show_header: bool = True,
+                                      fixed_widths: bool = False) -> Table:
+        """Create detailed entries table.
+        
+        With fixed_widths, columns have constant widths so that tables for
+        consecutive chunks of a streamed report line up as one table.
+        """
+        widths = TableFormatters.DETAILED_ENTRY_COLUMN_WIDTHS if fixed_widths else {}
+        table = Table(box=box.SIMPLE_HEAD, show_header=show_header, show_edge=not fixed_widths)
+        table.add_column("ID", style="cyan", width=widths.get("ID"))
+        table.add_column("Date & Time", style="cyan", width=widths.get("Date & Time"))
+        table.add_column("Project", style="magenta", width=widths.get("Project"), overflow="fold")
+        table.add_column("Tags", style="yellow", width=widths.get("Tags"), overflow="fold")
+        table.add_column("Duration", style="green", justify="right", width=widths.get("Duration"))
         
         for entry in entries:
             project_display = entry.project_display
@@ -70,6 +103,127 @@ class TableFormatters:
         
         return table
     
+    @staticmethod
+    def create_pivot_table(pivot: PivotTable) -> Table:
+        """Create a flat table with one row per combination of group keys."""
+        table = Table(box=box.SIMPLE_HEAD)
+        for dimension in pivot.dimensions:
+            table.add_column(dimension.replace('_', ' ').title(), style="cyan")
+        table.add_column("Duration", style="green", justify="right")
+        table.add_column("Entries", style="yellow", justify="center")
+        
+        for labels, entries, duration in pivot.rows:
+            table.add_row(*labels, format_duration(duration), str(entries))
+        
+        return table
+    
+    @staticmethod
+    def create_pivot_matrix(pivot: PivotTable) -> Table:
+        """Create a matrix of durations, in hours, for a two-dimension pivot."""
+        row_dimension, column_dimension = pivot.dimensions
+        row_labels, column_labels = pivot.values
+        cells = {labels: duration for labels, _, duration in pivot.rows}
+        
+        table = Table(box=box.SIMPLE_HEAD)
+        table.add_column(
+            f"{row_dimension.replace('_', ' ').title()} / {column_dimension.replace('_', ' ').title()}",
+            style="cyan", no_wrap=True
+        )
+        for label in column_labels:
+            table.add_column(label, justify="right", no_wrap=True)
+        table.add_column("Total", style="green", justify="right")
+        
+        column_totals = [0] * len(column_labels)
+        for row_label in row_labels:
+            row_total = 0
+            cells_display = []
+            for i, column_label in enumerate(column_labels):
+                duration = cells.get((row_label, column_label))
+                if duration is None:
+                    cells_display.append("")
+                    continue
+                row_total += duration
+                column_totals[i] += duration
+                cells_display.append(format_hours(duration))
+            table.add_row(row_label, *cells_display, format_hours(row_total))
+        
+        table.add_row(
+            "Total", *[format_hours(total) for total in column_totals],
+            format_hours(sum(column_totals)), style="bold"
+        )
+        return table
+    
+    @staticmethod
+    def create_session_stats_table(label: str, sketches: Dict[str, DurationSketch]) -> Table:
+        """Create a table of session-length distributions, busiest group first."""
+        table = Table(box=box.SIMPLE_HEAD)
+        table.add_column(label, style="cyan", no_wrap=True)
+        table.add_column("Count", style="yellow", justify="right", no_wrap=True)
+        table.add_column("Mean", style="green", justify="right", no_wrap=True)
+        table.add_column("p50", justify="right", no_wrap=True)
+        table.add_column("p90", justify="right", no_wrap=True)
+        table.add_column("p99", justify="right", no_wrap=True)
+        table.add_column("Histogram", style="blue", no_wrap=True)
+        
+        for name, sketch in sorted(sketches.items(), key=lambda item: (-item[1].total, item[0])):
+            p50, p90, p99 = sketch.quantiles([0.5, 0.9, 0.99])
+            table.add_row(
+                name, str(sketch.count), format_duration_short(int(round(sketch.mean))),
+                format_duration_short(p50), format_duration_short(p90), format_duration_short(p99),
+                TableFormatters.format_sparkline(sketch.histogram)
+            )
+        
+        return table
+    
+    @staticmethod
+    def format_sparkline(counts: List[int]) -> str:
+        """Format counts as a one-line bar chart."""
+        peak = max(counts) if counts else 0
+        if not peak:
+            return ""
+        levels = len(TableFormatters.SPARK_CHARS) - 1
+        # Any non-zero count shows at least the lowest bar
+        return "".join(
+            TableFormatters.SPARK_CHARS[-(-count * levels // peak)] for count in counts
+        )
+    
+    @staticmethod
+    def create_comparison_table(label: str, groups: Dict[str, dict], report: ComparisonReport) -> Table:
+        """Create a side-by-side table of current and previous totals with deltas."""
+        table = Table(box=box.SIMPLE_HEAD)
+        table.add_column(label, style="cyan", no_wrap=True)
+        table.add_column(f"{report.current_range[0]}..{report.current_range[1]}", justify="right", no_wrap=True)
+        table.add_column(f"{report.previous_range[0]}..{report.previous_range[1]}", justify="right", no_wrap=True)
+        table.add_column("Change", justify="right", no_wrap=True)
+        table.add_column("%", justify="right", no_wrap=True)
+        
+        sorted_groups = sorted(
+            groups.items(),
+            key=lambda x: (-max(x[1]['current_duration'], x[1]['previous_duration']), x[0])
+        )
+        for name, totals in sorted_groups:
+            table.add_row(name, *TableFormatters._comparison_cells(totals))
+        
+        table.add_row("Total", *TableFormatters._comparison_cells(report.totals), style="bold")
+        return table
+    
+    @staticmethod
+    def _comparison_cells(totals: dict) -> List[str]:
+        """Format current, previous, change and percentage change cells."""
+        current = totals['current_duration']
+        previous = totals['previous_duration']
+        delta = current - previous
+        
+        if delta > 0:
+            change = f"[green]+{format_duration_short(delta)}[/green]"
+        elif delta < 0:
+            change = f"[red]-{format_duration_short(-delta)}[/red]"
+        else:
+            change = "[dim]0s[/dim]"
+        percent = f"{delta * 100 / previous:+.0f}%" if previous else "[dim]new[/dim]" if current else ""
+        
+        return [format_duration_short(current), format_duration_short(previous), change, percent]
+    
     @staticmethod
     def should_show_daily_breakdown(summary: ReportSummary) -> bool:
         """Determine if daily breakdown should be shown."""
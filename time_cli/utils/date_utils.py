@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from typing import Tuple
+from typing import List, Tuple
 
 def get_date_range(period_type: str) -> Tuple[str, str]:
     """Get date range for different period types."""
@@ -16,4 +16,67 @@ def get_date_range(period_type: str) -> Tuple[str, str]:
         start_of_month = today.replace(day=1)
         return start_of_month.isoformat(), today.isoformat()
     
-    return None, None
\ No newline at end of file
+    return None, None
+
+def get_comparison_range(from_date: str, to_date: str, mode: str,
+                         period_type: str = None) -> Tuple[str, str]:
+    """Get the window to compare an inclusive YYYY-MM-DD range against.
+    
+    'previous' steps back by the period (a day, week or calendar month) when
+    the range came from --today/--week/--month, otherwise by the range's own
+    length. 'same-last-year' takes the same dates one year earlier.
+    """
+    start = datetime.strptime(from_date, '%Y-%m-%d').date()
+    end = datetime.strptime(to_date, '%Y-%m-%d').date()
+    
+    if mode == 'same-last-year':
+        return _shift_years(start, -1).isoformat(), _shift_years(end, -1).isoformat()
+    
+    if period_type == 'month':
+        previous_start = (start.replace(day=1) - timedelta(days=1)).replace(day=1)
+        month_end = start.replace(day=1) - timedelta(days=1)
+        previous_end = min(previous_start + (end - start), month_end)
+        return previous_start.isoformat(), previous_end.isoformat()
+    
+    step = timedelta(days=7) if period_type == 'week' else (end - start) + timedelta(days=1)
+    return (start - step).isoformat(), (end - step).isoformat()
+
+def _shift_years(day, years: int):
+    """Shift a date by whole years, mapping Feb 29 to Feb 28 when needed."""
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return day.replace(year=day.year + years, day=28)
+
+def next_day(date_str: str) -> str:
+    """Get the ISO date following a YYYY-MM-DD date string."""
+    return (datetime.strptime(date_str, '%Y-%m-%d').date() + timedelta(days=1)).isoformat()
+
+def to_timestamp(dt: datetime) -> int:
+    """Convert a naive local datetime to integer epoch seconds for storage."""
+    return int(dt.timestamp())
+
+def from_timestamp(timestamp: int) -> datetime:
+    """Convert stored epoch seconds back to a naive local datetime."""
+    return datetime.fromtimestamp(timestamp)
+
+def date_to_timestamp(date_str: str) -> int:
+    """Get the epoch seconds of local midnight at the start of a YYYY-MM-DD date."""
+    return to_timestamp(datetime.strptime(date_str, '%Y-%m-%d'))
+
+def month_partitions(from_date: str, to_date: str) -> List[Tuple[str, str]]:
+    """Split an inclusive YYYY-MM-DD range into inclusive calendar-month ranges."""
+    start = datetime.strptime(from_date, '%Y-%m-%d').date()
+    end = datetime.strptime(to_date, '%Y-%m-%d').date()
+    partitions = []
+    
+    while start <= end:
+        if start.month == 12:
+            next_month = start.replace(year=start.year + 1, month=1, day=1)
+        else:
+            next_month = start.replace(month=start.month + 1, day=1)
+        partition_end = min(end, next_month - timedelta(days=1))
+        partitions.append((start.isoformat(), partition_end.isoformat()))
+        start = next_month
+    
+    return partitions